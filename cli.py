@@ -0,0 +1,181 @@
+# standard library
+import argparse, contextlib, json, sys
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser for the non-interactive subcommands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Runs Game Library Tracker actions without any prompts.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="run without saving any changes",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    # sync
+    sync = subparsers.add_parser("sync", help="sync owned Steam games")
+    sync.add_argument(
+        "--delete-removed",
+        action="store_true",
+        help="delete games that are no longer owned",
+    )
+    sync.add_argument(
+        "--accept-renames",
+        action="store_true",
+        help="update game names that changed on Steam",
+    )
+    # enrich
+    enrich = subparsers.add_parser("enrich", help="update store data for games")
+    enrich.add_argument(
+        "--stale",
+        action="store_true",
+        help="only update data past its freshness TTL",
+    )
+    enrich.add_argument(
+        "--app-id",
+        type=int,
+        nargs="+",
+        dest="app_ids",
+        help="only update these app ID's",
+    )
+    # player counts
+    player_counts = subparsers.add_parser(
+        "player-counts", help="update current player counts"
+    )
+    player_counts.add_argument(
+        "--app-id",
+        type=int,
+        nargs="+",
+        dest="app_ids",
+        help="only update these app ID's",
+    )
+    # sales
+    sales = subparsers.add_parser("sales", help="find sales for favorite games")
+    sales.add_argument(
+        "--min-rating",
+        type=int,
+        default=8,
+        choices=range(1, 11),
+        metavar="1-10",
+        help="minimum rating of games to check (default: 8)",
+    )
+    # stats
+    stats = subparsers.add_parser("stats", help="show library statistics")
+    stats.add_argument(
+        "--json",
+        action="store_true",
+        help="print the statistics as JSON",
+    )
+    # backup
+    subparsers.add_parser("backup", help="back up the excel file")
+    # daemon
+    subparsers.add_parser(
+        "daemon", help="keep running and run each job on its interval"
+    )
+    return parser
+
+
+# each subcommand returns the exit code
+
+
+def sync(tracker, args) -> int:
+    if not tracker.internet_connected:
+        return 1
+    synced = tracker.sync_steam_games(
+        tracker.steam_key,
+        tracker.steam_id,
+        delete_removed=args.delete_removed,
+        accept_renames=args.accept_renames,
+    )
+    return 0 if synced else 1
+
+
+def enrich(tracker, args) -> int:
+    if not tracker.internet_connected:
+        return 1
+    if args.app_ids:
+        app_ids = args.app_ids
+    elif args.stale:
+        app_ids = tracker.get_stale_app_ids()
+    else:
+        app_ids = [int(app_id) for app_id in tracker.steam.row_idx]
+    update_type = "Stale" if args.stale else "Selected"
+    tracker.update_extra_game_info(app_ids, update_type, stale_only=args.stale)
+    return 0
+
+
+def player_counts(tracker, args) -> int:
+    if not tracker.internet_connected:
+        return 1
+    app_ids = args.app_ids or [int(app_id) for app_id in tracker.steam.row_idx]
+    tracker.bulk_update_player_count(app_ids, "Selected" if args.app_ids else "All")
+    if tracker.save_to_file:
+        tracker.save_excel(use_print=False, backup=False)
+    return 0
+
+
+def sales(tracker, args) -> int:
+    if not tracker.internet_connected:
+        return 1
+    tracker.sync_favorite_games_sales(args.min_rating)
+    return 0
+
+
+def stats(tracker, args) -> int:
+    # importing the workbook prints its styles, which would break the json output
+    with contextlib.redirect_stdout(sys.stderr):
+        dataframe = tracker.steam.create_dataframe(na_vals=["-", "NaN"])
+    if args.json:
+        print(json.dumps(tracker.get_statistics(dataframe), indent=2))
+    else:
+        tracker.output_statistics(dataframe)
+    return 0
+
+
+def backup(tracker, args) -> int:
+    try:
+        backed_up = tracker.backup.run()
+    except FileNotFoundError:
+        backed_up = False
+    if backed_up:
+        print("Backed Up Excel File")
+        return 0
+    print("Failed to back up Excel File")
+    return 1
+
+
+def daemon(tracker, args) -> int:
+    tracker.run_daemon()
+    return 0
+
+
+COMMANDS = {
+    "sync": sync,
+    "enrich": enrich,
+    "player-counts": player_counts,
+    "sales": sales,
+    "stats": stats,
+    "backup": backup,
+    "daemon": daemon,
+}
+
+
+def run(argv: list[str] | None = None) -> int:
+    """
+    Runs the subcommand in `argv` and returns the exit code.
+
+    Only the parts of the tracker the subcommand uses are set up.
+    """
+    from main import Tracker
+
+    args = create_parser().parse_args(argv)
+    tracker = Tracker(save=not args.dry_run, interactive=False)
+    return COMMANDS[args.command](tracker, args)
+
+
+if __name__ == "__main__":
+    sys.exit(run())
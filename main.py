@@ -1,105 +1,39 @@
 # standard library
+from __future__ import annotations
+from difflib import SequenceMatcher
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable
 import os, sys, math, traceback, time
 import datetime as dt
 
-# third-party imports
-import pandas as pd
-from difflib import SequenceMatcher
-from pick import pick
-from rich.console import Console
-from rich.prompt import IntPrompt
-from rich.progress import track, Progress
-from rich.table import Table
-from rich.theme import Theme
-
 # local imports
 from setup import Setup
 from utils.backup import Backup
 from utils.steam import Steam
 from utils.game_info import Game, GetGameInfo
-from utils.random_game import RandomGame
 from utils.game_skipper import GameSkipper
+from utils.enrichment import Enricher
+from utils.library_sync import OwnedGamesSnapshot, reconcile_app_ids
+from utils.freshness import FieldFreshness
+from utils.library_store import LibraryStore
+from utils.background_saver import BackgroundSaver
+from utils.workbook import LazyWorkbook
+from utils.scheduler import Scheduler
+from utils.local_files import LocalSteamFiles
+from utils.rate_limiter import rate_limiter
 from utils.date_updater import *
 from utils.utils import *
 from utils.logger import Logger
 
-# my package imports
-from easierexcel import Excel, Sheet
+# heavy third-party modules are imported in the actions that use them
+if TYPE_CHECKING:
+    import pandas as pd
+    from rich.console import Console
+    from easierexcel import Excel, Sheet
 
 
 class Tracker(GetGameInfo, Steam):
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
-
-    # config init
-    setup = Setup()
-    config_path, config_data, ignore_data, excel_options = setup.run()
-
-    # steam_data
-    steam_data = config_data.get("steam_data", False)
-    if not steam_data:
-        input("Steam Config not found.")
-        exit()
-    steam_key = steam_data.get("api_key", None)
-    steam_id = steam_data.get("steam_id", None)
-    steam_id_3 = steam_data.get("steam_id_3", None)
-    steam_folder = steam_data.get("steam_folder", None)
-    steam_library = steam_data.get("steam_library", None)
-    library_path = f"{steam_folder}/steamapps/libraryfolders.vdf"
-    local_config_path = f"{steam_folder}/userdata/{steam_id_3}/config/localconfig.vdf"
-    workshop_path = f"{steam_library}/steamapps/workshop/content"
-
-    # settings
-    excel_filename = config_data["settings"]["excel_filename"]
-    backup = Backup(excel_filename, redundancy=4)
-    logging = config_data["settings"]["logging"]
-
-    # misc
-    NAME_IGNORE_LIST = [string.lower() for string in ignore_data["name_ignore_list"]]
-    APP_ID_IGNORE_LIST = ignore_data["app_id_ignore_list"]
-    game_skipper = GameSkipper(NAME_IGNORE_LIST, APP_ID_IGNORE_LIST)
-
-    # logging setup
-    if logging:
-        Log = Logger()
-        # Improve logging
-        main_log_path = "logs/main.log"
-        main_log = Log.create_log(name="main", log_path=main_log_path)
-        friend_log = Log.create_log(name="friend", log_path="logs/friend.log")
-        error_log = Log.create_log(name="base_error", log_path="logs/error.log")
-
-    # rich console
-    custom_theme = Theme(
-        {
-            "primary": "bold deep_sky_blue1",
-            "secondary": "bold pale_turquoise1",
-            # error
-            "info": "dim cyan",
-            "warning": "bold magenta",
-            "danger": "bold red",
-            # color scale
-            "top_scale": "bold green1",
-            "high_scale": "bold medium_spring_green",
-            "mid_scale": "bold cyan1",
-            "bottom_scale": "bold grey58",
-        }
-    )
-    console = Console(theme=custom_theme)
-
-    # excel file setup
-    excel = Excel(excel_filename, use_logging=logging)
-    steam = Sheet(
-        excel_object=excel,
-        sheet_name="Steam",
-        column_name="App ID",
-        options=excel_options,
-    )
-    sales = Sheet(
-        excel_object=excel,
-        sheet_name="Sales",
-        column_name="Name",
-        options=excel_options,
-    )
 
     # sets play status choices for multiple functions
     PLAY_STATUS_CHOICES = (
@@ -143,18 +77,202 @@ class Tracker(GetGameInfo, Steam):
         release_col := "Release Year",
         app_id_col := "App ID",
     ]
+    # source that fetches each enriched column, "app_details" needs no extra request
+    ENRICHED_COLUMN_SOURCES = {
+        dev_col: "app_details",
+        pub_col: "app_details",
+        genre_col: "app_details",
+        release_col: "app_details",
+        price_col: "app_details",
+        discount_col: "app_details",
+        ea_col: "app_details",
+        store_link_col: "app_details",
+        steam_rev_per_col: "review",
+        steam_rev_total_col: "review",
+        user_tags_col: "user_tags",
+        time_to_beat_col: "time_to_beat",
+        steam_player_count_col: "player_count",
+    }
+    # minutes between each daemon job, overridden by "daemon_intervals" in the config
+    DAEMON_INTERVALS = {
+        "local_files": 1,
+        "owned_games_sync": 30,
+        "player_counts": 60,
+        "stale_enrichment": 6 * 60,
+        "friends_sync": 24 * 60,
+        "excel_backup": 14 * 24 * 60,
+    }
     APP_TITLE = "Game Library Tracker"
 
-    def __init__(self, save: bool) -> None:
+    # rich console styles
+    THEME_STYLES = {
+        "primary": "bold deep_sky_blue1",
+        "secondary": "bold pale_turquoise1",
+        # error
+        "info": "dim cyan",
+        "warning": "bold magenta",
+        "danger": "bold red",
+        # color scale
+        "top_scale": "bold green1",
+        "high_scale": "bold medium_spring_green",
+        "mid_scale": "bold cyan1",
+        "bottom_scale": "bold grey58",
+    }
+
+    def __init__(self, save: bool, interactive: bool = True) -> None:
         """
         Game Library Tracking Class.
+
+        Configs and logs are set up here instead of at import so importing this
+        module stays cheap. The library store, workbook and internet check are
+        only set up once an action needs them.
+
+        `interactive` set to False answers prompts with their defaults so the
+        tracker can run without a terminal.
         """
         self.save_to_file = save
+        self.interactive = interactive
+        os.chdir(self.script_dir)
+        self.load_config()
+        self.setup_logging()
         if not self.steam_id:
             self.update_steam_id()
-        self.internet_connected = check_internet_connection()
-        if not self.internet_connected:
+
+    def load_config(self) -> None:
+        """
+        Loads the configs and sets up everything that depends on them.
+        """
+        self.setup = Setup()
+        config_path, config_data, ignore_data, excel_options = self.setup.run()
+        self.config_path, self.config_data = config_path, config_data
+        self.excel_options = excel_options
+        # steam_data
+        steam_data = config_data.get("steam_data", False)
+        if not steam_data:
+            input("Steam Config not found.")
+            exit()
+        self.steam_key = steam_data.get("api_key", None)
+        self.steam_id = steam_data.get("steam_id", None)
+        self.steam_id_3 = steam_data.get("steam_id_3", None)
+        steam_folder = steam_data.get("steam_folder", None)
+        steam_library = steam_data.get("steam_library", None)
+        self.steam_folder, self.steam_library = steam_folder, steam_library
+        self.library_path = f"{steam_folder}/steamapps/libraryfolders.vdf"
+        self.local_config_path = (
+            f"{steam_folder}/userdata/{self.steam_id_3}/config/localconfig.vdf"
+        )
+        self.workshop_path = f"{steam_library}/steamapps/workshop/content"
+        # settings
+        settings = config_data["settings"]
+        self.excel_filename = settings["excel_filename"]
+        self.backup = Backup(self.excel_filename, redundancy=4)
+        self.logging = settings["logging"]
+        self.enrichment_workers = settings.get("enrichment_workers", 4)
+        self.daemon_intervals = {
+            **self.DAEMON_INTERVALS,
+            **config_data.get("daemon_intervals", {}),
+        }
+        rate_limiter.configure(config_data.get("rate_limits", {}))
+        # misc
+        name_ignore_list = [name.lower() for name in ignore_data["name_ignore_list"]]
+        self.game_skipper = GameSkipper(
+            name_ignore_list, ignore_data["app_id_ignore_list"]
+        )
+        self.owned_games_snapshot = OwnedGamesSnapshot()
+        field_ttl_days = config_data.get("field_ttl_days")
+        self.field_freshness = FieldFreshness(ttl_days=field_ttl_days)
+
+    def setup_logging(self) -> None:
+        """
+        Creates the loggers if logging is enabled.
+        """
+        if not self.logging:
+            return
+        self.Log = Logger()
+        # Improve logging
+        create_log = self.Log.create_log
+        self.main_log = create_log(name="main", log_path="logs/main.log")
+        self.friend_log = create_log(name="friend", log_path="logs/friend.log")
+        self.error_log = create_log(name="base_error", log_path="logs/error.log")
+
+    @cached_property
+    def workbook(self) -> LazyWorkbook:
+        """
+        The excel file, which is only parsed once a sheet is needed.
+        """
+        return LazyWorkbook(
+            self.excel_filename, use_logging=self.logging, options=self.excel_options
+        )
+
+    @cached_property
+    def library(self) -> LibraryStore:
+        """
+        Opens the library store and imports the steam sheet if the excel file
+        changed since it was last saved.
+
+        The library store is the primary store and the steam sheet is its
+        export view.
+        """
+        library = LibraryStore(
+            "configs/library.db",
+            self.EXCEL_COLUMNS,
+            key_column=self.app_id_col,
+            indexed_columns=(self.name_col, self.play_status_col),
+            date_columns=(
+                self.date_added_col,
+                self.date_updated_col,
+                self.last_played_col,
+            ),
+        )
+        if library.needs_import(self.excel_filename):
+            library.import_sheet(self.steam_sheet, self.excel_filename)
+        return library
+
+    @property
+    def steam(self) -> LibraryStore:
+        return self.library
+
+    @cached_property
+    def local_files(self) -> LocalSteamFiles:
+        """
+        Watches the local Steam files for installed and last played changes.
+        """
+        return LocalSteamFiles(self.library_path, self.local_config_path)
+
+    @cached_property
+    def internet_connected(self) -> bool:
+        connected = check_internet_connection()
+        if not connected:
             self.console.print("\nNo Internet Detected", style="warning")
+        return connected
+
+    def confirm(self, msg: str, default: bool = False) -> bool:
+        """
+        Asks `msg` as a yes or no question, returning `default` instead when
+        not interactive.
+        """
+        if not self.interactive:
+            return default
+        return is_response_yes(msg)
+
+    @cached_property
+    def console(self) -> Console:
+        from rich.console import Console
+        from rich.theme import Theme
+
+        return Console(theme=Theme(self.THEME_STYLES))
+
+    @property
+    def excel(self) -> Excel:
+        return self.workbook.excel
+
+    @property
+    def steam_sheet(self) -> Sheet:
+        return self.workbook.get_sheet("Steam", self.app_id_col)
+
+    @property
+    def sales(self) -> Sheet:
+        return self.workbook.get_sheet("Sales", self.name_col)
 
     def update_steam_id(self):
         """
@@ -185,6 +303,8 @@ class Tracker(GetGameInfo, Steam):
         Checks for changes to your friends list.
         Shows a table of new and removed friends Steam ID's and usernames.
         """
+        from rich.table import Table
+
         if not self.internet_connected:
             return
         # check last run
@@ -214,9 +334,11 @@ class Tracker(GetGameInfo, Steam):
         table.add_column("Type", justify="center")
         table.add_column("Username", justify="left", min_width=15)
         table.add_column("Steam ID", justify="left")
+        # usernames for every change are fetched together
+        usernames = self.get_steam_usernames(additions + removals, self.steam_key)
         # removals
         for steam_id in removals:
-            username = self.get_steam_username(steam_id, self.steam_key)
+            username = usernames.get(str(steam_id))
             row = [
                 "Removed",
                 username,
@@ -228,7 +350,7 @@ class Tracker(GetGameInfo, Steam):
             self.friend_log.info(msg)
         # additions
         for steam_id in additions:
-            username = self.get_steam_username(steam_id, self.steam_key)
+            username = usernames.get(str(steam_id))
             row = [
                 "Added",
                 username,
@@ -251,24 +373,160 @@ class Tracker(GetGameInfo, Steam):
         set_title = title or self.APP_TITLE
         os.system(f"title {set_title}")
 
-    def create_save_every_nth(self, save_on_nth: int = 20):
-        counter = 0
+    def save_excel(self, use_print: bool = True, backup: bool = True) -> None:
+        """
+        Patches the steam sheet with the rows changed in the library store,
+        saves the excel file and then commits the store.
+
+        The store is only committed after the workbook saved so both stay in sync.
+        """
+        if self.library.changes_made:
+            self.library.export_to_sheet(self.steam_sheet)
+        # an unloaded workbook has no changes to save
+        if self.workbook.loaded:
+            self.excel.save(use_print=use_print, backup=backup)
+        self.library.commit(self.excel_filename)
+
+    def open_excel(self) -> None:
+        """
+        Saves any changes and opens the excel file.
+        """
+        self.save_excel(use_print=False)
+        self.excel.open_excel(save=False)
+
+    def create_saver(
+        self, max_dirty: int = 20, max_interval: float = 60, backup: bool = False
+    ):
+        """
+        Creates a saver that saves the excel file in the background after
+        `max_dirty` changed games or `max_interval` seconds.
 
-        def save_every_nth():
-            nonlocal counter
-            counter += 1
-            if counter % save_on_nth == 0:
-                self.excel.save(use_print=False, backup=False)
-                counter = 0
+        `backup` backs up the excel file before the first save.
+        """
+        return BackgroundSaver(
+            lambda: self.save_excel(use_print=False, backup=backup),
+            max_dirty=max_dirty,
+            max_interval=max_interval,
+        )
 
-        return save_every_nth
+    def reload_if_edited(self) -> bool:
+        """
+        Imports the excel file again if it was edited outside of the tracker
+        and the library store has no unsaved changes.
+        """
+        if self.library.changes_made:
+            return False
+        if not self.library.needs_import(self.excel_filename):
+            return False
+        # the loaded workbook is out of date so it is parsed again
+        self.__dict__.pop("workbook", None)
+        self.library.import_sheet(self.steam_sheet, self.excel_filename)
+        return True
+
+    def sync_local_files(self) -> int:
+        """
+        Updates the installed status and last played time of games whose local
+        Steam files changed since the last check and returns the amount of
+        games updated.
+        """
+        changes = self.local_files.poll()
+        if not changes:
+            return 0
+        updates: dict[int, dict] = {}
+        for app_id in changes.installed:
+            updates.setdefault(app_id, {})[self.installed_col] = "Yes"
+        for app_id in changes.uninstalled:
+            updates.setdefault(app_id, {})[self.installed_col] = "No"
+        for app_id, last_played in changes.last_played.items():
+            last_played = dt.datetime.fromtimestamp(last_played)
+            updates.setdefault(app_id, {})[self.last_played_col] = last_played
+        total_updated = 0
+        for app_id, values in updates.items():
+            if str(app_id) not in self.steam.row_idx:
+                continue
+            if self.steam.update_row(app_id, values):
+                total_updated += 1
+        return total_updated
 
-    def set_play_status(self, app_id: int, new_status: str, cur_status: str = None):
+    def create_scheduler(self) -> Scheduler:
         """
-        Sets `app_id`'s Play Status cell to `new_status` if it the current status is unplayed.
+        Creates a scheduler with each daemon job set to run every
+        `daemon_intervals` minutes.
+
+        Job run times are kept in the `last_runs` section of the config so
+        the schedule carries over between runs.
         """
-        if cur_status == "Unplayed" and new_status != cur_status:
-            return self.steam.update_cell(app_id, self.play_status_col, new_status)
+
+        def sync_owned_games():
+            if not self.sync_steam_games(self.steam_key, self.steam_id):
+                raise ConnectionError("Failed to retrieve Steam Games")
+
+        def sample_player_counts():
+            app_ids = [int(app_id) for app_id in self.steam.row_idx]
+            self.bulk_update_player_count(app_ids, "All")
+
+        def enrich_stale_games():
+            app_ids = self.get_stale_app_ids()
+            if app_ids:
+                self.update_extra_game_info(app_ids, "Stale", stale_only=True)
+
+        def save_last_run(name):
+            # the rest of the config is left alone in case it was edited meanwhile
+            if self.save_to_file:
+                write_last_run(self.config_path, name, scheduler.last_runs[name])
+
+        def log_error(name, error):
+            msg = f"Daemon job {name} failed: {error!r}"
+            self.console.print(msg, style="warning")
+            if self.logging:
+                self.error_log.error(msg)
+
+        jobs = {
+            "local_files": self.sync_local_files,
+            "owned_games_sync": sync_owned_games,
+            "player_counts": sample_player_counts,
+            "stale_enrichment": enrich_stale_games,
+            "friends_sync": lambda: self.sync_friends_list(check_freq_days=0),
+            "excel_backup": lambda: self.auto_backup(check_freq_days=0),
+        }
+        scheduler = Scheduler(
+            self.config_data.setdefault("last_runs", {}),
+            on_run=save_last_run,
+            on_error=log_error,
+        )
+        for name, job in jobs.items():
+            interval_minutes = self.daemon_intervals.get(name)
+            # jobs without an interval are turned off
+            if interval_minutes:
+                scheduler.add(name, job, interval_minutes * 60)
+        return scheduler
+
+    def run_daemon(self, max_wait: float = 60) -> None:
+        """
+        Runs the scheduled jobs until interrupted while keeping the library,
+        app list and HTTP connections loaded between them.
+
+        Changes from each round of due jobs are saved together once the round
+        finishes.
+        """
+        scheduler = self.create_scheduler()
+
+        def between_jobs():
+            if self.library.changes_made and self.save_to_file:
+                self.save_excel(use_print=False, backup=False)
+            # checked again before the next round in case the connection changed
+            self.__dict__.pop("internet_connected", None)
+            self.reload_if_edited()
+
+        jobs = ", ".join(scheduler.jobs)
+        self.console.print(f"\nStarting Daemon: {jobs}", style="primary")
+        try:
+            scheduler.run_forever(max_wait=max_wait, idle=between_jobs)
+        except KeyboardInterrupt:
+            scheduler.stop()
+        finally:
+            if self.library.changes_made and self.save_to_file:
+                self.save_excel(use_print=False, backup=False)
 
     def set_date_updated(self, app_id):
         """
@@ -286,6 +544,8 @@ class Tracker(GetGameInfo, Steam):
         """
         Finds recent games by dates in `column` within `n_days`.
         """
+        import pandas as pd
+
         df[column] = pd.to_datetime(df[column])
         filtered_df = df[abs((df[column] - dt.datetime.now()).dt.days) <= n_days]
         return filtered_df.sort_values(
@@ -313,37 +573,118 @@ class Tracker(GetGameInfo, Steam):
             self.release_col: game.release_year or "-",
         }
 
-    def update_extra_game_info(self, app_ids: list[int], update_type: str):
+    def fetch_game_column_dict(
+        self, app_id: int, game_name: str = None, stale_only: bool = False
+    ) -> dict:
+        """
+        Gets new data from the internet for `app_id` as a dict of column names
+        and values.
+
+        If `stale_only` is True, only columns that are past their freshness TTL
+        are fetched and returned. App details are skipped when none of their
+        columns are due, in which case `game_name` is used for lookups that
+        need it.
+
+        Columns whose source failed to respond are left out so they keep their
+        current value and stay due, while a source that responded without data
+        for the game still returns its columns as "-".
+
+        Runs inside enrichment worker threads so it must not touch the sheet.
+        """
+        columns = self.ENRICHED_COLUMN_SOURCES.keys()
+        if stale_only:
+            due_columns = self.field_freshness.due_fields(app_id, columns)
+        else:
+            due_columns = set(columns)
+        if not due_columns:
+            return {}
+        sources = {self.ENRICHED_COLUMN_SOURCES[column] for column in due_columns}
+        if "app_details" in sources:
+            app_details = self.get_app_details(app_id)
+        else:
+            app_details = {"steam_appid": app_id, "name": game_name}
+        game = self.get_game_info(app_details, self.steam_key, sources)
+        if not game.app_id:
+            return {}
+        game_data = self.get_game_column_dict(game)
+        return {
+            column: game_data[column]
+            for column in due_columns
+            if self.ENRICHED_COLUMN_SOURCES[column] in game.fetched_sources
+        }
+
+    def get_stale_app_ids(self) -> list[int]:
+        """
+        Gets the app ID's of games with any enriched column past its TTL.
+        """
+        columns = self.ENRICHED_COLUMN_SOURCES.keys()
+        return [
+            int(app_id)
+            for app_id in self.steam.row_idx
+            if self.field_freshness.due_fields(int(app_id), columns)
+        ]
+
+    def update_extra_game_info(
+        self, app_ids: list[int], update_type: str, stale_only: bool = False
+    ):
         """
         Updates info that changes often enough that it needs to be updated manually.
+
+        `stale_only` only fetches columns that are past their freshness TTL.
+
+        Game data is fetched concurrently while the sheet is only written to
+        from this thread.
         """
-        save_every_nth = self.create_save_every_nth()
+        from rich.progress import track
+
+        app_ids = list(app_ids)
+        # names are read here since the workers must not touch the sheet
+        names = {
+            app_id: self.steam.get_cell(app_id, self.name_col) for app_id in app_ids
+        }
+
+        def fetch(app_id):
+            return self.fetch_game_column_dict(app_id, names.get(app_id), stale_only)
+
+        enricher = Enricher(fetch, self.enrichment_workers)
         print()
         cur_itr = 0
         desc = f"Syncing {update_type} Game Data"
-        for app_id in track(app_ids, description=desc):
-            game_row = self.steam.get_row(app_id)
-            # get new data from the internet
-            app_details = self.get_app_details(app_id)
-            game = self.get_game_info(app_details, self.steam_key)
-            game_data = self.get_game_column_dict(game)
-            # update data
-            for column, data in game_data.items():
-                if not data:
-                    continue
-                if column == self.time_to_beat_col and game_row[self.time_to_beat_col]:
-                    continue
-                if column == self.ea_col and game_row[self.ea_col]:
+        results = enricher.run(app_ids)
+        with self.create_saver() as saver:
+            for app_id, game_data, error in track(
+                results, total=len(app_ids), description=desc
+            ):
+                cur_itr += 1
+                if error:
+                    msg = f"Enrichment failed for {app_id}: {error!r}"
+                    if self.logging:
+                        self.error_log.warning(msg)
                     continue
-                self.steam.update_cell(app_id, column, data)
-            # saves data
-            if self.save_to_file:
-                save_every_nth()
-            # title progress percentage
-            cur_itr += 1
-            progress = cur_itr / len(app_ids) * 100
-            self.set_title(f"{progress:.1f}% - {self.APP_TITLE}")
+                game_row = self.steam.get_row(app_id)
+                # update data
+                updates = {}
+                for column, data in game_data.items():
+                    if not data:
+                        continue
+                    if column == self.time_to_beat_col and game_row[column]:
+                        continue
+                    if column == self.ea_col and game_row[column]:
+                        continue
+                    updates[column] = data
+                changed = self.steam.update_row(app_id, updates)
+                # only columns of sources that responded are returned so
+                # failed fetches stay due and are retried on the next run
+                self.field_freshness.mark_fetched(app_id, game_data)
+                # saves data in the background while fetching continues
+                if changed and self.save_to_file:
+                    saver.mark_dirty()
+                # title progress percentage
+                progress = cur_itr / len(app_ids) * 100
+                self.set_title(f"{progress:.1f}% - {self.APP_TITLE}")
         self.set_title()
+        if self.save_to_file:
+            self.field_freshness.save()
 
     def sync_game_data(self, df):
         """
@@ -352,21 +693,25 @@ class Tracker(GetGameInfo, Steam):
         app_ids, update_type = self.game_select(df, last_num=50)
         self.update_extra_game_info(app_ids, update_type)
 
-    def check_workshop_size(self):
+    def output_size_table(
+        self, title: str, description: str, get_entries: Callable[[], list[dict]]
+    ) -> None:
         """
-        Checks the directory size for each games workshop folder.
+        Shows a table of the name and size of each entry from `get_entries`
+        along with the total size.
         """
+        from rich.progress import Progress
+        from rich.table import Table
+
         print()
         total = 0
         with Progress(transient=True) as progress:
-            progress.add_task("Checking Workshop Size", total=None)
+            progress.add_task(f"Checking {description}", total=None)
 
-            app_list = self.get_app_list()
-            entry_list = self.workshop_size(self.workshop_path, app_list)
+            entry_list = get_entries()
 
-            table_title = f"Game Workshop Sizes"
             table = Table(
-                title=table_title,
+                title=title,
                 show_lines=True,
                 title_style="bold",
                 style="deep_sky_blue1",
@@ -385,7 +730,28 @@ class Tracker(GetGameInfo, Steam):
         # print table
         self.console.print(table, new_line_start=False)
         total_size, unit = convert_size(total)
-        self.console.print(f"[b]Total Workshop Size:[/] {total_size:,} {unit}")
+        self.console.print(f"[b]Total {description}:[/] {total_size:,} {unit}")
+
+    def check_workshop_size(self):
+        """
+        Checks the directory size for each games workshop folder.
+        """
+        app_list = lambda: self.get_app_index() or []
+        self.output_size_table(
+            "Game Workshop Sizes",
+            "Workshop Size",
+            lambda: self.workshop_size(self.workshop_path, app_list()),
+        )
+
+    def check_install_size(self):
+        """
+        Checks the install folder size for each installed game.
+        """
+        self.output_size_table(
+            "Game Install Sizes",
+            "Install Size",
+            lambda: self.install_size(self.library_path),
+        )
 
     def get_recently_played_app_ids(self, df: pd.DataFrame, n_days: int = 30) -> list:
         """
@@ -477,12 +843,14 @@ class Tracker(GetGameInfo, Steam):
             print("\nCancelled")
         finally:
             if self.save_to_file:
-                self.excel.save(use_print=False, backup=False)
+                self.save_excel(use_print=False, backup=False)
 
     def output_recently_played_games(self, df: pd.DataFrame, n_days: int = 7) -> None:
         """
         Creates a table with the recently played Games.
         """
+        from rich.table import Table
+
         recently_played_games = self.find_recent_games(df, "Date Updated", n_days)
         # creates table
         table_title = f"Recently Played Games\nWithin {n_days} Days"
@@ -541,6 +909,8 @@ class Tracker(GetGameInfo, Steam):
         """
         Creates a table with counts and percentage of each play status.
         """
+        from rich.table import Table
+
         table = Table(
             title="Play Status Stats",
             show_lines=True,
@@ -569,6 +939,8 @@ class Tracker(GetGameInfo, Steam):
         """
         Creates a table with counts and percentage of each play status.
         """
+        from rich.table import Table
+
         table = Table(
             title="Playtime Stats",
             show_lines=True,
@@ -605,6 +977,8 @@ class Tracker(GetGameInfo, Steam):
         """
         Outputs a table of review stats.
         """
+        from rich.table import Table
+
         table = Table(
             title="Rating Stats",
             show_lines=True,
@@ -675,6 +1049,44 @@ class Tracker(GetGameInfo, Steam):
         self.output_playtime_info(dataframe)
         self.output_review_info(dataframe)
 
+    def get_statistics(self, df: pd.DataFrame) -> dict:
+        """
+        Gets the library statistics shown by `output_statistics` as plain
+        numbers that can be saved as JSON.
+        """
+
+        def number(value, digits: int = 1) -> float | None:
+            return None if math.isnan(value) else round(float(value), digits)
+
+        df_filtered = df[df[self.play_status_col] != "Ignore"]
+        play_statuses = df_filtered[self.play_status_col].value_counts()
+        hours = df_filtered[self.hours_played_col].astype("float")
+        total_hours = hours.sum()
+        my_ratings = df_filtered[self.my_rating_col].astype("float")
+        steam_ratings = df_filtered[self.steam_rev_per_col].astype("float")
+        return {
+            "total_games": len(df_filtered),
+            "play_status": {
+                play_status: int(play_statuses.get(play_status, 0))
+                for play_status in self.PLAY_STATUS_CHOICES
+                if play_status != "Ignore"
+            },
+            "playtime": {
+                "total_hours": number(total_hours),
+                "total_days": number(total_hours / 24),
+                "linux_hours": number(df_filtered[self.linux_hours_col].sum()),
+                "average_hours": number(hours.mean()),
+                "median_hours": number(hours.median()),
+                "max_hours": number(hours.max()),
+            },
+            "ratings": {
+                "my_total": int(my_ratings.count()),
+                "my_average": number(my_ratings.mean()),
+                "steam_total": int(steam_ratings.count()),
+                "steam_average": number(steam_ratings.mean(), 3),
+            },
+        }
+
     @staticmethod
     def decide_play_status(play_status: str, minutes_played: float) -> str:
         """
@@ -694,23 +1106,35 @@ class Tracker(GetGameInfo, Steam):
                 play_status = "Unplayed"
         return play_status
 
-    def name_change_checker(self, name_changes: list[dict]) -> None:
+    def name_change_checker(
+        self, name_changes: list[dict], accept: bool = False
+    ) -> set[int]:
         """
         Checks the `name_changes` to see if they contain any
         name changes to possibly fulfill.
+
+        `accept` is used instead of asking when not interactive.
+
+        Returns the app ID's of the declined name changes.
         """
+        declined = set()
         for names_dict in name_changes:
             new_name = names_dict["new_name"]
             old_name = names_dict["old_name"]
+            app_id = names_dict["app_id"]
             msg = f'Do you want to update "{old_name}"\'s name to {new_name}?:\n'
-            if is_response_yes(msg):
-                app_id = names_dict["app_id"]
+            if self.confirm(msg, default=accept):
                 self.steam.update_cell(app_id, self.name_col, new_name)
+            else:
+                declined.add(app_id)
+        return declined
 
     def output_played_games_info(self, played_games: list[dict]) -> None:
         """
         Outputs a table of played game stats.
         """
+        from rich.table import Table
+
         total_games_played = len(played_games)
         table_title = f"Games Played: {len(played_games)}"
         if total_games_played > 1:
@@ -738,6 +1162,8 @@ class Tracker(GetGameInfo, Steam):
         """
         Outputs a table of added game stats.
         """
+        from rich.table import Table
+
         table = Table(
             title=f"Games Added: {len(added_games)}",
             show_lines=True,
@@ -758,91 +1184,111 @@ class Tracker(GetGameInfo, Steam):
         self.console.print(table, new_line_start=True)
 
     def sync_steam_games_with_sheet(
-        self, steam_games: list[dict], sheet_games: list[int]
+        self,
+        steam_games: list[dict],
+        sheet_games: set[int],
+        delete_removed: bool = False,
+        accept_renames: bool = False,
     ):
         """
         Checks for new games or game updates from `steam_games` based on `sheet_games`.
         """
+        from rich.progress import track
+
         self.total_session_playtime = 0
         added_games = []
         played_games = []
         name_changes = []
-        save_every_nth = self.create_save_every_nth()
         # game checking
         print()
         total_games = len(steam_games)
         desc = f"Syncing [bold]{total_games:,}[/bold] Steam Games"
-        installed_app_ids = self.get_installed_app_ids(self.library_path)
-        local_config = self.get_local_config_data(self.local_config_path)
-        for game in track(steam_games, description=desc):
-            game_name, app_id = game["name"], game["appid"]
-            game_config_data = local_config.get(str(app_id), {})
-            last_played = game_config_data.get("LastPlayed", None)
-            if last_played:
-                last_played = dt.datetime.fromtimestamp(int(last_played))
-            # ignore check
-            if self.game_skipper.skip_game(game_name, app_id):
-                continue
-            # name change check
-            cur_game_data = self.steam.get_row(app_id)
-            old_name = cur_game_data[self.name_col]
-            new_name = game_name
-            if old_name and old_name != new_name:
-                msg = f'Name Change: "{old_name}" to "{new_name}"'
-                self.main_log.info(msg)
-                name_changes.append(
-                    {
-                        "new_name": new_name,
-                        "old_name": old_name,
-                        "app_id": app_id,
-                    }
-                )
-            # sets play time earlier so it only needs to be set up once
-            minutes_played = game["playtime_forever"]
-            time_played = convert_time_passed(minutes=minutes_played)
-            linux_minutes_played = ""
-            if "playtime_linux_forever" in game.keys():
-                linux_minutes_played = game["playtime_linux_forever"]
-            # play status
-            cur_status = cur_game_data[self.play_status_col]
-            new_status = self.decide_play_status(cur_status, minutes_played)
-            installed = app_id in installed_app_ids
-            # updates or adds game
-            if app_id in sheet_games:
-                sheet_games.remove(app_id)
-                update_info = self.update_steam_game(
-                    app_id=app_id,
-                    game_name=game_name,
-                    minutes_played=minutes_played,
-                    linux_minutes_played=linux_minutes_played,
-                    new_status=new_status,
-                    cur_status=cur_status,
-                    time_played=time_played,
-                    last_played=last_played,
-                    installed=installed,
-                )
-                if update_info:
-                    played_games.append(update_info)
-            else:
-                added_info = self.add_steam_game(
-                    app_id=app_id,
-                    game_name=game_name,
-                    minutes_played=minutes_played,
-                    linux_minutes_played=linux_minutes_played,
-                    time_played=time_played,
-                    play_status=new_status,
-                    get_internet_info=len(added_games) <= 10,
-                    installed=installed,
-                )
-                added_games.append(added_info)
-        # saves each time the checks count is divisible by num
-        if self.save_to_file:
-            save_every_nth()
+        installed_app_ids = set(self.get_installed_app_ids(self.library_path))
+        owned_app_ids = {game["appid"] for game in steam_games}
+        added_app_ids, updated_app_ids, removed_app_ids = reconcile_app_ids(
+            owned_app_ids, sheet_games
+        )
+        # only games that changed since the last sync or are missing from the sheet are checked
+        snapshot_diff = self.owned_games_snapshot.diff(steam_games, installed_app_ids)
+        app_ids_to_check = added_app_ids | (updated_app_ids & snapshot_diff.changed)
+        app_ids_to_check -= self.game_skipper.skip_games(
+            (game["name"], game["appid"])
+            for game in steam_games
+            if game["appid"] in app_ids_to_check
+        )
+        changed_games = [
+            game for game in steam_games if game["appid"] in app_ids_to_check
+        ]
+        last_played_times = {}
+        if changed_games:
+            last_played_times = self.get_last_played_times(self.local_config_path)
+        # background saves clear the stores changes so they are counted instead
+        change_count = self.steam.change_count
+        # saves in the background every few changed games while syncing
+        with self.create_saver(backup=True) as saver:
+            for game in track(changed_games, description=desc):
+                game_name, app_id = game["name"], game["appid"]
+                last_played = last_played_times.get(app_id)
+                if last_played:
+                    last_played = dt.datetime.fromtimestamp(last_played)
+                # name change check
+                cur_game_data = self.steam.get_row(app_id)
+                old_name = cur_game_data[self.name_col]
+                new_name = game_name
+                if old_name and old_name != new_name:
+                    msg = f'Name Change: "{old_name}" to "{new_name}"'
+                    self.main_log.info(msg)
+                    name_changes.append(
+                        {
+                            "new_name": new_name,
+                            "old_name": old_name,
+                            "app_id": app_id,
+                        }
+                    )
+                # sets play time earlier so it only needs to be set up once
+                minutes_played = game["playtime_forever"]
+                time_played = convert_time_passed(minutes=minutes_played)
+                linux_minutes_played = ""
+                if "playtime_linux_forever" in game.keys():
+                    linux_minutes_played = game["playtime_linux_forever"]
+                # play status
+                cur_status = cur_game_data[self.play_status_col]
+                new_status = self.decide_play_status(cur_status, minutes_played)
+                installed = app_id in installed_app_ids
+                # updates or adds game
+                if app_id in updated_app_ids:
+                    update_info = self.update_steam_game(
+                        app_id=app_id,
+                        game_name=game_name,
+                        minutes_played=minutes_played,
+                        linux_minutes_played=linux_minutes_played,
+                        new_status=new_status,
+                        cur_status=cur_status,
+                        time_played=time_played,
+                        last_played=last_played,
+                        installed=installed,
+                    )
+                    if update_info:
+                        played_games.append(update_info)
+                else:
+                    added_info = self.add_steam_game(
+                        app_id=app_id,
+                        game_name=game_name,
+                        minutes_played=minutes_played,
+                        linux_minutes_played=linux_minutes_played,
+                        time_played=time_played,
+                        play_status=new_status,
+                        get_internet_info=len(added_games) <= 10,
+                        installed=installed,
+                    )
+                    added_games.append(added_info)
+                if self.save_to_file:
+                    saver.mark_dirty()
         # prints the total games updated and added
         if 0 < len(played_games) < 50:
             self.output_played_games_info(played_games)
         # game names changed
-        self.name_change_checker(name_changes)
+        declined_renames = self.name_change_checker(name_changes, accept_renames)
         # games added
         total_added_games = len(added_games)
         if 0 < total_added_games < 50:
@@ -851,37 +1297,61 @@ class Tracker(GetGameInfo, Steam):
                 print("Showing First 50 Games Added")
             self.output_added_games_info(added_games)
         # checks for removed games
-        total_removed_games = len(sheet_games)
+        total_removed_games = len(removed_app_ids)
         if total_removed_games:
             removed_game_names = [
-                self.steam.get_cell(app_id, self.name_col) for app_id in sheet_games
+                self.steam.get_cell(app_id, self.name_col)
+                for app_id in sorted(removed_app_ids)
             ]
             removed_games_names_str = list_to_sentence(removed_game_names)
-            if is_response_yes(
-                f"\nDo you want to delete all the following games?\n{removed_games_names_str}"
+            if self.confirm(
+                f"\nDo you want to delete all the following games?\n{removed_games_names_str}",
+                default=delete_removed,
             ):
-                for app_id in sheet_games:
+                for app_id in removed_app_ids:
                     self.steam.delete_row(str(app_id))
-        if self.excel.changes_made and self.save_to_file:
-            self.excel.save(use_print=False)
-        else:
+        if self.steam.change_count == change_count:
             print("\nNo Steam games were added or updated")
+        elif self.save_to_file:
+            self.save_excel(use_print=False)
+        if self.save_to_file:
+            # declined renames are kept as they were so they are asked again
+            self.owned_games_snapshot.update(
+                steam_games, installed_app_ids, keep=declined_renames
+            )
+            self.owned_games_snapshot.save()
 
-    def sync_steam_games(self, steam_key: int, steam_id: int) -> None:
+    def sync_steam_games(
+        self,
+        steam_key: int,
+        steam_id: int,
+        delete_removed: bool = False,
+        accept_renames: bool = False,
+    ) -> bool:
         """
         Gets games owned by the entered `steam_id`
         and runs excel update/add functions.
+
+        `delete_removed` and `accept_renames` answer the prompts for removed
+        and renamed games when not interactive.
+
+        Returns False if the owned games could not be retrieved while not
+        interactive.
         """
         if not self.internet_connected:
-            return
+            return False
         owned_games = self.get_owned_steam_games(steam_key, steam_id)
         if owned_games:
-            sheet_app_ids = [int(app_id) for app_id in self.steam.row_idx.keys()]
+            sheet_app_ids = {int(app_id) for app_id in self.steam.row_idx.keys()}
             if not sheet_app_ids:
                 print(f"\nStarting First Steam Sync")
-            self.sync_steam_games_with_sheet(owned_games, sheet_app_ids)
-            return
+            self.sync_steam_games_with_sheet(
+                owned_games, sheet_app_ids, delete_removed, accept_renames
+            )
+            return True
         print("\nFailed to retrieve Steam Games\nSteam Servers may be down")
+        if not self.interactive:
+            return False
         input()
         exit()
 
@@ -900,8 +1370,7 @@ class Tracker(GetGameInfo, Steam):
         """
         Updates the games playtime and play status if they changed.
         """
-        installed_value = "Yes" if installed else "No"
-        self.steam.update_cell(app_id, self.installed_col, installed_value)
+        updates = {self.installed_col: "Yes" if installed else "No"}
         prev_hours = self.steam.get_cell(app_id, self.hours_played_col)
         try:
             prev_hours = float(prev_hours)
@@ -909,31 +1378,34 @@ class Tracker(GetGameInfo, Steam):
             prev_hours = 0.0
         cur_hours = get_hours_played(minutes_played)
         if not cur_hours:
+            self.steam.update_row(app_id, updates)
             return
         if last_played:
-            self.steam.update_cell(app_id, self.last_played_col, last_played)
+            updates[self.last_played_col] = last_played
         # only updates if new play time occurred
-        if cur_hours > prev_hours:
-            hours_played = cur_hours - prev_hours
-            self.steam.update_cell(app_id, self.hours_played_col, cur_hours)
-            cur_linux_hours = get_hours_played(linux_minutes_played)
-            self.steam.update_cell(app_id, self.linux_hours_col, cur_linux_hours)
-            added_time = convert_time_passed(hours=hours_played)
-            self.steam.update_cell(app_id, self.last_play_time_col, added_time)
-            self.steam.update_cell(app_id, self.time_played_col, time_played)
-            self.set_date_updated(app_id)
-            self.set_play_status(app_id, new_status, cur_status)
-            self.steam.format_row(app_id)
-            self.total_session_playtime += hours_played
-            # updated game logging
-            msg = f"Playtime: {game_name} played for {added_time}"
-            if self.logging:
-                self.main_log.info(msg)
-            return {
-                "name": game_name,
-                "added_time_played": added_time,
-                "total_playtime": cur_hours,
-            }
+        if cur_hours <= prev_hours:
+            self.steam.update_row(app_id, updates)
+            return
+        hours_played = cur_hours - prev_hours
+        added_time = convert_time_passed(hours=hours_played)
+        updates[self.hours_played_col] = cur_hours
+        updates[self.linux_hours_col] = get_hours_played(linux_minutes_played)
+        updates[self.last_play_time_col] = added_time
+        updates[self.time_played_col] = time_played
+        updates[self.date_updated_col] = dt.datetime.now()
+        if cur_status == "Unplayed" and new_status != cur_status:
+            updates[self.play_status_col] = new_status
+        self.steam.update_row(app_id, updates)
+        self.total_session_playtime += hours_played
+        # updated game logging
+        msg = f"Playtime: {game_name} played for {added_time}"
+        if self.logging:
+            self.main_log.info(msg)
+        return {
+            "name": game_name,
+            "added_time_played": added_time,
+            "total_playtime": cur_hours,
+        }
 
     def add_steam_game(
         self,
@@ -979,9 +1451,8 @@ class Tracker(GetGameInfo, Steam):
             time_played_str = time_played or "no time"
             info = f"New Game: Added {game_name} with {time_played_str} played"
             self.main_log.info(info)
-        self.steam.format_row(app_id)
         if save_after_add and self.save_to_file:
-            self.excel.save(use_print=False, backup=False)
+            self.save_excel(use_print=False, backup=False)
         return {
             "name": game_name,
             "total_playtime": hours_played or 0,
@@ -991,8 +1462,10 @@ class Tracker(GetGameInfo, Steam):
         """
         Allows you to pick a play_status or installed status to have a random game chosen from.
         """
+        from utils.random_game import RandomGame
+
         Picker = RandomGame(
-            steam_sheet=Tracker.steam,
+            steam_sheet=self.steam,
             name_column=self.name_col,
             installed_column=self.installed_col,
             play_status_choices=self.PLAY_STATUS_CHOICES,
@@ -1000,24 +1473,50 @@ class Tracker(GetGameInfo, Steam):
         )
         Picker.random_game_picker()
 
-    def get_favorite_games(self, min_rating: int = 8) -> list[dict]:
+    def get_favorite_games(self, min_rating: int = 8) -> list[tuple[Game, int]]:
         """
-        gets favorite games from excel file as a list of dicts
+        Gets the games rated at least `min_rating` that are on sale along with
+        their rating.
+
+        Prices are checked in batches first so the full game info is only
+        fetched for games that are on sale.
         """
-        games = []
-        desc = "Finding Favorite Games"
-        for app_id in track(self.steam.row_idx.keys(), description=desc):
-            game_row = self.steam.get_row(app_id)
-            rating = game_row[self.my_rating_col]
-            if rating is None:
+        from rich.progress import track
+
+        ratings = {}
+        for app_id in self.steam.row_idx.keys():
+            rating = self.steam.get_cell(app_id, self.my_rating_col)
+            if rating is None or not app_id:
                 continue
-            if rating >= min_rating and app_id:
-                app_details = self.get_app_details(app_id)
-                game = self.get_game_info(app_details, self.steam_key)
-                if not game.on_sale:
-                    continue
-                games.append((game, rating))
-        return games
+            if rating >= min_rating:
+                ratings[int(app_id)] = rating
+        price_overviews = self.get_price_overviews(ratings)
+        on_sale_app_ids = [
+            app_id
+            for app_id, price_overview in price_overviews.items()
+            if price_overview and price_overview.get("discount_percent", 0) > 0
+        ]
+
+        def fetch(app_id):
+            app_details = self.get_app_details(app_id)
+            return self.get_game_info(app_details, self.steam_key)
+
+        games = {}
+        desc = "Finding Favorite Game Sales"
+        enricher = Enricher(fetch, self.enrichment_workers)
+        results = enricher.run(on_sale_app_ids)
+        for app_id, game, error in track(
+            results, total=len(on_sale_app_ids), description=desc
+        ):
+            if error:
+                msg = f"Sale check failed for {app_id}: {error!r}"
+                if self.logging:
+                    self.error_log.warning(msg)
+                continue
+            if game.on_sale:
+                games[app_id] = (game, ratings[app_id])
+        # keeps the library order instead of the order the fetches finished in
+        return [games[app_id] for app_id in on_sale_app_ids if app_id in games]
 
     def update_sales_sheet(self, games: list[tuple[Game, int]]) -> None:
         """
@@ -1056,21 +1555,25 @@ class Tracker(GetGameInfo, Steam):
         # formats all cells and saves
         self.sales.format_all_cells()
         if self.save_to_file:
-            self.excel.save(use_print=False, backup=False)
+            self.save_excel(use_print=False, backup=False)
 
-    def sync_favorite_games_sales(self):
+    def sync_favorite_games_sales(self, min_rating: int = None):
         """
         Gets sale information for games that are at a minimun rating or higher.
-        Rating is set up using an IntPrompt.ask after running.
+        Rating is set up using an IntPrompt.ask after running if `min_rating`
+        is not given.
         """
+        from rich.prompt import IntPrompt
+
         # sets minimum rating to and defaults to 8 if response is blank or invalid
-        min_rating = IntPrompt.ask(
-            "\nWhat is the minimum rating for this search? (1-10)",
-            choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "10"],
-            default=8,
-            show_choices=False,
-            show_default=True,
-        )
+        if min_rating is None:
+            min_rating = IntPrompt.ask(
+                "\nWhat is the minimum rating for this search? (1-10)",
+                choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "10"],
+                default=8,
+                show_choices=False,
+                show_default=True,
+            )
         print(f"Minimum Rating set to {min_rating}\n")
         # get new game sales
         games = self.get_favorite_games(min_rating)
@@ -1154,19 +1657,41 @@ class Tracker(GetGameInfo, Steam):
             return {}
 
     def bulk_update_player_count(self, app_ids: list[int], update_type: str) -> list:
+        """
+        Updates the player count of each of `app_ids` and returns the counts
+        in the same order.
+
+        Counts are fetched concurrently while the sheet is only written to
+        from this thread.
+        """
+        from rich.progress import track
+
+        app_ids = list(app_ids)
+
+        def fetch(app_id):
+            return self.get_player_count(app_id, self.steam_key)
+
         print()  # forced new line due to how track() works
-        player_counts = []
+        player_counts = {}
         desc = f"Updating {update_type} Player Count(s)"
-        for app_id in track(app_ids, description=desc):
-            player_count = self.get_player_count(app_id, self.steam_key)
-            player_counts.append(player_count)
+        enricher = Enricher(fetch, self.enrichment_workers)
+        results = enricher.run(app_ids)
+        for app_id, player_count, error in track(
+            results, total=len(app_ids), description=desc
+        ):
+            if error:
+                msg = f"Player count failed for {app_id}: {error!r}"
+                if self.logging:
+                    self.error_log.warning(msg)
+                player_count = None
+            player_counts[app_id] = player_count
             self.steam.update_cell(
                 app_id,
                 self.steam_player_count_col,
                 player_count,
             )
-            api_sleeper("steam_player_count")
-        return player_counts
+        # keeps the order of app_ids instead of the order the fetches finished in
+        return [player_counts[app_id] for app_id in app_ids]
 
     def game_select(self, df: pd.DataFrame, last_num: int = 15):
         """
@@ -1204,13 +1729,15 @@ class Tracker(GetGameInfo, Steam):
         """
         app_ids, update_type = self.game_select(df, last_num=15)
         self.bulk_update_player_count(app_ids, update_type)
-        self.excel.save(use_print=False, backup=False)
+        self.save_excel(use_print=False, backup=False)
 
     def update_add_dates(self):
         """
         Updates Games "Added Date".
         """
-        app_list = self.get_app_list()
+        from rich.progress import Progress
+
+        app_list = self.get_app_index()
 
         self.console.print("\nStarting Added Date Updater")
         with Progress(transient=True) as progress:
@@ -1228,7 +1755,7 @@ class Tracker(GetGameInfo, Steam):
             msg = f"\n{len(dates_to_update)} games Added dates were updated"
             self.console.print(msg)
 
-        self.excel.save(use_print=False, backup=False)
+        self.save_excel(use_print=False, backup=False)
 
     def pick_game_to_update(self, games: list) -> None:
         """
@@ -1287,13 +1814,14 @@ class Tracker(GetGameInfo, Steam):
         Gives a choice of actions for the current game library.
         """
         choices = [
-            ("Exit and Open the Excel File", self.excel.open_excel),
+            ("Exit and Open the Excel File", self.open_excel),
             ("Random Game Explorer", self.start_random_game_picker),
             ("Player Counts Sync", lambda: self.sync_player_counts(df)),
             ("Favorite Games Sales Sync", self.sync_favorite_games_sales),
             ("Game Data Sync", lambda: self.sync_game_data(df)),
             ("Statistics Display", lambda: self.output_statistics(df)),
             ("Workshop Storage Check", self.check_workshop_size),
+            ("Install Storage Check", self.check_install_size),
             ("Steam Friends List Sync", lambda: self.sync_friends_list(0)),
             ("Update Library Add Dates", lambda: self.update_add_dates()),
             ("Backup Excel File", lambda: self.backup.run()),
@@ -1309,10 +1837,14 @@ class Tracker(GetGameInfo, Steam):
         """
         Created to fix steam ID's in case they get messed up.
         """
-        app_list = self.get_app_list()
+        name_index = self.get_app_index().name_index
         for app_id in self.steam.row_idx:
             name = self.steam.get_cell(app_id, self.name_col)
-            correct_app_id = self.get_app_id(name, app_list)
+            match = name_index.find(name)
+            correct_app_id = match.app_id if match else None
+            if match and match.ambiguous:
+                print(f"{name} matches multiple App ID's: {match.candidates}")
+                continue
             if app_id and correct_app_id:
                 if int(app_id) != int(correct_app_id):
                     print(name, app_id, correct_app_id)
@@ -1321,7 +1853,7 @@ class Tracker(GetGameInfo, Steam):
             else:
                 print(name, app_id, correct_app_id)
                 self.steam.update_cell(app_id, self.app_id_col, "")
-        self.excel.save(use_print=False, backup=False)
+        self.save_excel(use_print=False, backup=False)
 
     def main(self) -> None:
         try:
@@ -1352,5 +1884,9 @@ class Tracker(GetGameInfo, Steam):
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import cli
+
+        sys.exit(cli.run())
     App = Tracker(save=True)
     App.main()
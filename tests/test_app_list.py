@@ -0,0 +1,166 @@
+import time
+import pytest
+
+# local imports
+from utils.app_list import (
+    AppList,
+    AppListCache,
+    NameIndex,
+    normalize_name,
+    clean_name,
+    get_name_index,
+)
+
+
+APPS = [
+    {"appid": 620, "name": "Portal 2"},
+    {"appid": 1145360, "name": "Hades"},
+    {"appid": 2379780, "name": "Balatro"},
+    {"appid": 1, "name": "Pokémon ™ – Test"},
+    {"appid": 9999, "name": "hades"},
+]
+
+
+class TestNormalizeName:
+
+    def test_success(self):
+        assert normalize_name("  Portal   2 ") == "portal 2"
+        assert normalize_name("HADES") == "hades"
+
+
+class TestCleanName:
+
+    def test_success(self):
+        assert clean_name("Pokémon ™ – Test") == "pokemon - test"
+        assert clean_name("DOOM®") == "doom"
+
+
+class TestNameIndex:
+    name_index = NameIndex.from_apps(APPS)
+
+    def test_exact(self):
+        match = self.name_index.find("Portal 2")
+        assert match.app_id == 620
+        assert match.match_type == "exact"
+        assert not match.ambiguous
+
+    def test_casefold(self):
+        match = self.name_index.find("PORTAL 2")
+        assert match.app_id == 620
+        assert match.match_type == "casefold"
+
+    def test_cleaned(self):
+        match = self.name_index.find("Pokemon - Test")
+        assert match.app_id == 1
+        assert match.match_type == "cleaned"
+
+    def test_ambiguous(self):
+        match = self.name_index.find("HADES")
+        assert match.ambiguous
+        assert match.candidates == [1145360, 9999]
+        assert not self.name_index.find("Hades").ambiguous
+
+    def test_ambiguous_names(self):
+        apps = [*APPS, {"appid": 5, "name": "Balatro"}]
+        name_index = NameIndex.from_apps(apps)
+        assert name_index.ambiguous_names() == {"Balatro": [2379780, 5]}
+
+    def test_not_found(self):
+        assert self.name_index.find("Not Real") is None
+        assert self.name_index.resolve("Not Real") is None
+        assert self.name_index.resolve(None) is None
+
+    def test_get_name_index(self):
+        app_list = AppList(APPS)
+        assert get_name_index(app_list) is app_list.name_index
+        assert get_name_index(self.name_index) is self.name_index
+        assert get_name_index(APPS).resolve("Balatro") == 2379780
+
+
+class TestAppList:
+    app_list = AppList(APPS)
+
+    def test_get_name(self):
+        assert self.app_list.get_name(620) == "Portal 2"
+        assert self.app_list.get_name("2379780") == "Balatro"
+        assert self.app_list.get_name(12) is None
+
+    def test_get_app_id(self):
+        assert self.app_list.get_app_id("Portal 2") == 620
+        assert self.app_list.get_app_id("portal  2") == 620
+        assert self.app_list.get_app_id("Not Real") is None
+
+    def test_exact_match_first(self):
+        assert self.app_list.get_app_id("Hades") == 1145360
+        assert self.app_list.get_app_id("hades") == 9999
+
+    def test_first_duplicate_wins(self):
+        assert self.app_list.get_app_id("HADES") == 1145360
+
+    def test_len(self):
+        assert len(self.app_list) == 5
+
+
+class TestAppListCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = AppListCache(tmp_path / "app_list.cache")
+        cache.save(APPS)
+        new_cache = AppListCache(tmp_path / "app_list.cache")
+        app_list = new_cache.load()
+        assert app_list.apps == APPS
+        assert app_list.get_app_id("balatro") == 2379780
+
+    def test_missing(self, tmp_path):
+        cache = AppListCache(tmp_path / "app_list.cache")
+        assert cache.load() is None
+
+    def test_expired(self, tmp_path, mocker):
+        cache = AppListCache(tmp_path / "app_list.cache", ttl_days=1)
+        cache.save(APPS)
+        two_days_later = time.time() + 2 * 24 * 60 * 60
+        mocker.patch("utils.app_list.time.time", return_value=two_days_later)
+        assert cache.load() is None
+        assert AppListCache(tmp_path / "app_list.cache", ttl_days=1).load() is None
+
+    def test_corrupt_file(self, tmp_path):
+        path = tmp_path / "app_list.cache"
+        path.write_bytes(b"not a cache file at all")
+        assert AppListCache(path).load() is None
+
+    def test_name_index_saved(self, tmp_path, mocker):
+        cache = AppListCache(tmp_path / "app_list.cache")
+        cache.save(APPS)
+        built = NameIndex.from_apps(APPS)
+        from_apps = mocker.patch.object(NameIndex, "from_apps")
+        name_index = AppListCache(tmp_path / "app_list.cache").load().name_index
+        from_apps.assert_not_called()
+        assert name_index.ids == built.ids
+        assert name_index.duplicates == built.duplicates
+        assert name_index.find("HADES").candidates == [1145360, 9999]
+
+    def test_old_format(self, tmp_path):
+        path = tmp_path / "app_list.cache"
+        cache = AppListCache(path)
+        cache.save(APPS)
+        path.write_bytes(b"SLTAPPS1" + path.read_bytes()[8:])
+        assert AppListCache(path).load() is None
+
+    def test_smaller_than_json(self, tmp_path):
+        apps = [{"appid": i, "name": f"Game Number {i}"} for i in range(10_000)]
+        cache = AppListCache(tmp_path / "app_list.cache")
+        cache.save(apps)
+        json_size = len(str(apps))
+        # still smaller than the app list alone with all three name lookups saved
+        assert cache.path.stat().st_size < json_size / 2
+
+    def test_clear(self, tmp_path):
+        cache = AppListCache(tmp_path / "app_list.cache")
+        cache.save(APPS)
+        cache.clear()
+        assert not cache.path.exists()
+        assert cache.load() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,75 @@
+import threading, time
+import pytest
+
+# local imports
+from utils.background_saver import BackgroundSaver
+
+
+class TestBackgroundSaver:
+
+    def test_saves_after_max_dirty(self):
+        saved = threading.Event()
+        with BackgroundSaver(saved.set, max_dirty=3, max_interval=60) as saver:
+            saver.mark_dirty()
+            saver.mark_dirty()
+            assert not saved.wait(0.05)
+            saver.mark_dirty()
+            assert saved.wait(1)
+
+    def test_saves_after_max_interval(self):
+        saved = threading.Event()
+        with BackgroundSaver(saved.set, max_dirty=100, max_interval=0.05) as saver:
+            saver.mark_dirty()
+            assert saved.wait(1)
+
+    def test_mark_dirty_during_save(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_save():
+            started.set()
+            release.wait(1)
+
+        saver = BackgroundSaver(slow_save, max_dirty=1, max_interval=60)
+        saver.start()
+        saver.mark_dirty()
+        assert started.wait(1)
+        start = time.perf_counter()
+        saver.mark_dirty()
+        assert time.perf_counter() - start < 0.05
+        release.set()
+        saver.close()
+        assert saver.saves == 2
+        assert saver.dirty == 0
+
+    def test_final_flush_on_exit(self):
+        saves = []
+        with pytest.raises(KeyboardInterrupt):
+            with BackgroundSaver(lambda: saves.append(1), max_dirty=100) as saver:
+                saver.mark_dirty()
+                raise KeyboardInterrupt
+        assert saves == [1]
+
+    def test_nothing_to_save(self):
+        saves = []
+        with BackgroundSaver(lambda: saves.append(1)):
+            pass
+        assert saves == []
+
+    def test_failed_save_is_retried(self):
+        calls = []
+
+        def failing_save():
+            calls.append(1)
+            if len(calls) == 1:
+                raise PermissionError
+
+        saver = BackgroundSaver(failing_save, max_dirty=100)
+        saver.mark_dirty()
+        assert not saver.flush()
+        assert saver.dirty == 1
+        assert saver.flush()
+        assert saver.dirty == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
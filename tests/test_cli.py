@@ -0,0 +1,114 @@
+import json
+import pytest
+
+# local imports
+import cli
+
+
+@pytest.fixture
+def tracker(mocker):
+    tracker = mocker.patch("main.Tracker").return_value
+    tracker.internet_connected = True
+    tracker.save_to_file = True
+    tracker.steam.row_idx = {"620": 2, "730": 3}
+    return tracker
+
+
+class TestParser:
+
+    def test_subcommand_required(self):
+        with pytest.raises(SystemExit):
+            cli.create_parser().parse_args([])
+
+    def test_sync_flags(self):
+        args = cli.create_parser().parse_args(["sync", "--delete-removed"])
+        assert args.command == "sync"
+        assert args.delete_removed
+        assert not args.accept_renames
+        assert not args.dry_run
+
+    def test_app_ids(self):
+        args = cli.create_parser().parse_args(["enrich", "--app-id", "620", "730"])
+        assert args.app_ids == [620, 730]
+
+    def test_min_rating_range(self):
+        with pytest.raises(SystemExit):
+            cli.create_parser().parse_args(["sales", "--min-rating", "11"])
+
+
+class TestRun:
+
+    def test_dry_run(self, mocker):
+        tracker_class = mocker.patch("main.Tracker")
+        cli.run(["--dry-run", "backup"])
+        tracker_class.assert_called_once_with(save=False, interactive=False)
+
+    def test_sync(self, tracker):
+        assert cli.run(["sync", "--accept-renames"]) == 0
+        tracker.sync_steam_games.assert_called_once_with(
+            tracker.steam_key,
+            tracker.steam_id,
+            delete_removed=False,
+            accept_renames=True,
+        )
+
+    def test_sync_failed(self, tracker):
+        tracker.sync_steam_games.return_value = False
+        assert cli.run(["sync"]) == 1
+
+    def test_no_internet(self, tracker):
+        tracker.internet_connected = False
+        assert cli.run(["sync"]) == 1
+        tracker.sync_steam_games.assert_not_called()
+
+    def test_enrich_stale(self, tracker):
+        tracker.get_stale_app_ids.return_value = [620]
+        assert cli.run(["enrich", "--stale"]) == 0
+        tracker.update_extra_game_info.assert_called_once_with(
+            [620], "Stale", stale_only=True
+        )
+
+    def test_enrich_all(self, tracker):
+        cli.run(["enrich"])
+        tracker.get_stale_app_ids.assert_not_called()
+        tracker.update_extra_game_info.assert_called_once_with(
+            [620, 730], "Selected", stale_only=False
+        )
+
+    def test_player_counts(self, tracker):
+        cli.run(["player-counts", "--app-id", "620"])
+        tracker.bulk_update_player_count.assert_called_once_with([620], "Selected")
+        tracker.save_excel.assert_called_once()
+
+    def test_sales(self, tracker):
+        cli.run(["sales", "--min-rating", "9"])
+        tracker.sync_favorite_games_sales.assert_called_once_with(9)
+
+    def test_stats_json(self, tracker, capsys):
+        tracker.get_statistics.return_value = {"total_games": 2}
+        assert cli.run(["stats", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"total_games": 2}
+        tracker.output_statistics.assert_not_called()
+
+    def test_stats_json_after_import(self, tracker, capsys):
+        # easierexcel prints the workbook styles when the sheet is imported
+        tracker.steam.create_dataframe.side_effect = lambda **_: print(
+            ["Normal", "Comma", "full_date_format"]
+        )
+        tracker.get_statistics.return_value = {"total_games": 2}
+        assert cli.run(["stats", "--json"]) == 0
+        captured = capsys.readouterr()
+        assert json.loads(captured.out) == {"total_games": 2}
+        assert "full_date_format" in captured.err
+
+    def test_daemon(self, tracker):
+        assert cli.run(["daemon"]) == 0
+        tracker.run_daemon.assert_called_once()
+
+    def test_backup_missing_file(self, tracker):
+        tracker.backup.run.side_effect = FileNotFoundError
+        assert cli.run(["backup"]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
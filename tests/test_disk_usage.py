@@ -0,0 +1,66 @@
+import os
+import pytest
+
+# local imports
+from utils.disk_usage import DiskUsage
+
+
+def write(path, size: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"0" * size)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "workshop" / "620"
+    write(folder / "a.bin", 100)
+    write(folder / "items" / "b.bin", 50)
+    write(folder / "items" / "deep" / "c.bin", 25)
+    return folder
+
+
+class TestDiskUsage:
+
+    def test_dir_size(self, tmp_path, folder):
+        disk_usage = DiskUsage(tmp_path / "disk_usage.cache")
+        assert disk_usage.dir_size(folder) == 175
+
+    def test_missing(self, tmp_path):
+        disk_usage = DiskUsage(tmp_path / "disk_usage.cache")
+        assert disk_usage.dir_size(tmp_path / "missing") == 0
+
+    def test_unchanged_directories_not_listed(self, tmp_path, folder, mocker):
+        disk_usage = DiskUsage(tmp_path / "disk_usage.cache")
+        disk_usage.dir_size(folder)
+        scandir = mocker.patch("utils.disk_usage.os.scandir", side_effect=os.scandir)
+        assert disk_usage.dir_size(folder) == 175
+        scandir.assert_not_called()
+
+    def test_changed_directory_listed_again(self, tmp_path, folder):
+        disk_usage = DiskUsage(tmp_path / "disk_usage.cache")
+        disk_usage.dir_size(folder)
+        deep = folder / "items" / "deep"
+        write(deep / "d.bin", 10)
+        # keeps the modified time different even on coarse filesystem clocks
+        stat = deep.stat()
+        os.utime(deep, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert disk_usage.dir_size(folder) == 185
+
+    def test_folder_sizes_saves_cache(self, tmp_path, folder):
+        cache_path = tmp_path / "disk_usage.cache"
+        other = tmp_path / "workshop" / "730"
+        write(other / "a.bin", 10)
+        sizes = DiskUsage(cache_path, workers=2).folder_sizes([folder, other])
+        assert sizes == {str(folder): 175, str(other): 10}
+        assert cache_path.exists()
+        cached = DiskUsage(cache_path)
+        assert str(folder) in cached.load()
+        assert cached.dir_size(folder) == 175
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            DiskUsage(workers=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
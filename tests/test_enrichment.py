@@ -0,0 +1,63 @@
+import threading, time
+import pytest
+
+# local imports
+from utils.enrichment import Enricher
+
+
+class TestRun:
+
+    def test_success(self):
+        enricher = Enricher(lambda app_id: app_id * 2, workers=3)
+        results = {app_id: result for app_id, result, _ in enricher.run(range(20))}
+        assert results == {app_id: app_id * 2 for app_id in range(20)}
+
+    def test_error(self):
+        def fetch(app_id):
+            if app_id == 2:
+                raise ValueError("Test error")
+            return app_id
+
+        enricher = Enricher(fetch, workers=2)
+        errors = {app_id: error for app_id, _, error in enricher.run([1, 2, 3])}
+        assert errors[1] is None
+        assert errors[3] is None
+        assert isinstance(errors[2], ValueError)
+
+    def test_runs_concurrently(self):
+        active, max_active = 0, 0
+        lock = threading.Lock()
+
+        def fetch(app_id):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return app_id
+
+        enricher = Enricher(fetch, workers=4)
+        list(enricher.run(range(16)))
+        assert max_active == 4
+
+    def test_stop_early(self):
+        started = []
+
+        def fetch(app_id):
+            started.append(app_id)
+            return app_id
+
+        enricher = Enricher(fetch, workers=2)
+        for app_id, _, _ in enricher.run(range(1000)):
+            break
+        assert len(started) < 1000
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            Enricher(lambda app_id: app_id, workers=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
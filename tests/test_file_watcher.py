@@ -0,0 +1,78 @@
+import os
+import pytest
+
+# local imports
+from utils.file_watcher import FileWatcher
+
+
+def touch(path, text: str = "data"):
+    path.write_text(text)
+    # keeps the modified time different even on coarse filesystem clocks
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+class TestFileWatcher:
+
+    def test_first_check_reports_existing(self, tmp_path, use_inotify):
+        file = tmp_path / "localconfig.vdf"
+        touch(file)
+        watcher = FileWatcher([file], use_inotify=use_inotify)
+        assert watcher.changes() == ({file}, set())
+        assert watcher.changes() == (set(), set())
+        watcher.close()
+
+    def test_changed_file(self, tmp_path, use_inotify):
+        file = tmp_path / "localconfig.vdf"
+        other = tmp_path / "libraryfolders.vdf"
+        touch(file)
+        touch(other)
+        watcher = FileWatcher([file, other], use_inotify=use_inotify)
+        watcher.changes()
+        touch(file, "new data")
+        assert watcher.changes() == ({file}, set())
+        watcher.close()
+
+    def test_pattern_added_and_removed(self, tmp_path, use_inotify):
+        manifest = tmp_path / "appmanifest_620.acf"
+        touch(manifest)
+        watcher = FileWatcher(
+            patterns=[(tmp_path, "appmanifest_*.acf")], use_inotify=use_inotify
+        )
+        assert watcher.changes() == ({manifest}, set())
+        new_manifest = tmp_path / "appmanifest_730.acf"
+        touch(new_manifest)
+        manifest.unlink()
+        assert watcher.changes() == ({new_manifest}, {manifest})
+        watcher.close()
+
+    def test_unrelated_file_ignored(self, tmp_path, use_inotify):
+        file = tmp_path / "localconfig.vdf"
+        touch(file)
+        watcher = FileWatcher([file], use_inotify=use_inotify)
+        watcher.changes()
+        touch(tmp_path / "other.txt")
+        assert watcher.changes() == (set(), set())
+        watcher.close()
+
+    def test_pattern_added_later(self, tmp_path, use_inotify):
+        file = tmp_path / "libraryfolders.vdf"
+        touch(file)
+        steamapps = tmp_path / "steamapps"
+        steamapps.mkdir()
+        manifest = steamapps / "appmanifest_620.acf"
+        touch(manifest)
+        watcher = FileWatcher([file], use_inotify=use_inotify)
+        watcher.changes()
+        watcher.add_pattern(steamapps, "appmanifest_*.acf")
+        assert watcher.changes() == ({manifest}, set())
+        watcher.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,49 @@
+import time
+import pytest
+
+# local imports
+from utils.freshness import FieldFreshness
+
+
+DAY = 24 * 60 * 60
+
+
+class TestFieldFreshness:
+
+    @pytest.fixture
+    def freshness(self, tmp_path):
+        return FieldFreshness(tmp_path / "field_timestamps.json")
+
+    def test_never_fetched_is_due(self, freshness):
+        assert freshness.is_due(620, "Price")
+
+    def test_fresh_until_ttl(self, freshness):
+        now = time.time()
+        freshness.mark_fetched(620, ["Price", "Developers"], when=now - 2 * DAY)
+        assert freshness.is_due(620, "Price", now)
+        assert not freshness.is_due(620, "Developers", now)
+
+    def test_unknown_column_always_due(self, freshness):
+        freshness.mark_fetched(620, ["Name"])
+        assert freshness.is_due(620, "Name")
+
+    def test_due_fields(self, freshness):
+        freshness.mark_fetched(620, ["User Tags"])
+        columns = ["User Tags", "Player Count"]
+        assert freshness.due_fields(620, columns) == {"Player Count"}
+        assert freshness.due_fields(1145360, columns) == set(columns)
+
+    def test_ttl_override(self, tmp_path):
+        freshness = FieldFreshness(tmp_path / "ts.json", ttl_days={"Player Count": 7})
+        assert freshness.ttl_days["Player Count"] == 7
+        assert freshness.ttl_days["Price"] == FieldFreshness.DEFAULT_TTL_DAYS["Price"]
+
+    def test_save_and_load(self, freshness):
+        freshness.mark_fetched(620, ["User Tags"])
+        freshness.save()
+        loaded = FieldFreshness(freshness.path)
+        assert not loaded.is_due(620, "User Tags")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -21,7 +21,7 @@ class TestGame:
             categories=["Category 1"],
             user_tags=["Tag 1"],
         )
-        assert len(vars(game)) == 20
+        assert len(vars(game)) == 21
         assert game.app_id == APP_ID
         assert game.name == NAME
         assert game.developer == "Dev"
@@ -78,7 +78,7 @@ class TestGame:
         game = Game()
         assert not Game()
         # total attributes
-        assert len(vars(game)) == 20
+        assert len(vars(game)) == 21
         # required values
         assert game.name == ""
         assert game.app_id == 0
@@ -173,7 +173,7 @@ class TestGetTimeToBeat:
         """
         Gets the time to beat for Hades as long as it is upper case.
         """
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         hltb_object = [self.hltb(10, 30)]
         mocker.patch(self.func_path, side_effect=[None, hltb_object])
 
@@ -184,7 +184,7 @@ class TestGetTimeToBeat:
         """
         Makes sure get_time_to_beat returns '-' for a non existing game.
         """
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         mocker.patch(self.func_path, return_value=None)
 
         test = self.test.get_time_to_beat("Fake game is fake")
@@ -195,7 +195,7 @@ class TestGetAppDetails:
 
     @pytest.fixture
     def mock_response(self, mocker):
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         with open("tests/data/game_app_details.json", "r", encoding="utf-8") as file:
             data = json.load(file)
         mock_response = mocker.Mock()
@@ -205,15 +205,15 @@ class TestGetAppDetails:
 
     def test_success(self, mock_response, mocker):
         App = GetGameInfo()
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        mocker.patch("requests.Session.get", return_value=mock_response)
         assert App.get_app_details(2379780)
 
     def test_request_error(self, mock_response, mocker):
         App = GetGameInfo()
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         mock_response.ok = False
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
         assert App.get_app_details(2379780) == {}
 
 
@@ -266,6 +266,23 @@ class TestGetGameInfo:
             "Family Sharing",
         ]
 
+    def test_limited_sources(self, mocker):
+        App = GetGameInfo()
+        review = mocker.patch("utils.steam.Steam.get_steam_review")
+        tags = mocker.patch("utils.steam.Steam.get_steam_user_tags")
+        ttb = mocker.patch("utils.game_info.GetGameInfo.get_time_to_beat")
+        mocker.patch("utils.steam.Steam.get_player_count", return_value=600)
+        app_details = {"steam_appid": 2379780, "name": "Balatro"}
+
+        game = App.get_game_info(app_details, "key", sources={"player_count"})
+        assert game.player_count == 600
+        assert game.steam_review_percent is None
+        assert game.user_tags == []
+        assert game.fetched_sources == {"app_details", "player_count"}
+        review.assert_not_called()
+        tags.assert_not_called()
+        ttb.assert_not_called()
+
     def test_not_enough_data(self):
         api_key, _ = get_steam_key_and_id()
         App = GetGameInfo()
@@ -0,0 +1,100 @@
+from contextlib import nullcontext
+import threading, time
+import pytest
+
+# local imports
+from utils.http_client import HttpClient
+from utils.steam import Steam
+from utils.game_info import GetGameInfo
+
+
+class TestGetSession:
+
+    def test_one_session_per_host(self):
+        client = HttpClient()
+        api_1 = client.get_session("https://api.steampowered.com/ISteamApps/")
+        api_2 = client.get_session("https://api.steampowered.com/ISteamUser/")
+        store = client.get_session("https://store.steampowered.com/app/620/")
+        assert api_1 is api_2
+        assert api_1 is not store
+        assert len(client.sessions) == 2
+
+    def test_default_headers(self):
+        client = HttpClient(headers={"User-Agent": "Test"})
+        session = client.get_session("https://store.steampowered.com/")
+        assert "gzip" in session.headers["Accept-Encoding"]
+        assert session.headers["User-Agent"] == "Test"
+
+    def test_pool_size(self):
+        client = HttpClient(pool_maxsize=32)
+        session = client.get_session("https://store.steampowered.com/")
+        adapter = session.get_adapter("https://store.steampowered.com/")
+        assert adapter._pool_maxsize == 32
+
+
+class TestGet:
+
+    def test_default_timeout(self, mocker):
+        client = HttpClient(timeout=3)
+        get = mocker.patch("requests.Session.get")
+        client.get("https://api.steampowered.com/", {"key": "value"})
+        get.assert_called_once_with(
+            "https://api.steampowered.com/", params={"key": "value"}, timeout=3
+        )
+
+    def test_given_timeout(self, mocker):
+        client = HttpClient(timeout=3)
+        get = mocker.patch("requests.Session.get")
+        client.get("https://api.steampowered.com/", timeout=10)
+        assert get.call_args.kwargs["timeout"] == 10
+
+
+class TestHostLimit:
+
+    def test_limits_requests_in_flight(self, mocker):
+        client = HttpClient(host_limits={"store.steampowered.com": 2})
+        active, max_active = 0, 0
+        lock = threading.Lock()
+
+        def fake_get(*args, **kwargs):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        mocker.patch("requests.Session.get", side_effect=fake_get)
+        url = "https://store.steampowered.com/app/620/"
+        threads = [threading.Thread(target=client.get, args=(url,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert max_active == 2
+
+    def test_unlimited_host(self):
+        client = HttpClient()
+        limit = client.host_limit("https://example.com/")
+        assert isinstance(limit, nullcontext)
+
+
+class TestClose:
+
+    def test_success(self):
+        client = HttpClient()
+        client.get_session("https://api.steampowered.com/")
+        client.close()
+        assert client.sessions == {}
+
+
+class TestSharedClient:
+
+    def test_shared_between_classes(self):
+        assert Steam().http is GetGameInfo().http
+        assert Steam.http is GetGameInfo.http
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,49 @@
+import json
+import pytest
+
+# local imports
+from utils.json_cache import JsonCache
+from utils.disk_usage import DiskUsage
+from utils.freshness import FieldFreshness
+from utils.library_sync import OwnedGamesSnapshot
+from utils.persona_cache import PersonaCache
+
+
+class TestJsonCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return JsonCache(tmp_path / "cache.json")
+
+    def test_missing_file(self, cache):
+        assert cache.load() == {}
+
+    def test_loaded_once(self, cache):
+        cache.path.write_text('{"a": 1}')
+        assert cache.load() == {"a": 1}
+        cache.path.write_text('{"a": 2}')
+        assert cache.load() == {"a": 1}
+
+    def test_only_saves_changes(self, cache):
+        cache.load()["a"] = 1
+        cache.save()
+        assert not cache.path.exists()
+        cache.changed = True
+        cache.save()
+        assert json.loads(cache.path.read_text()) == {"a": 1}
+        assert not cache.changed
+        assert not cache.path.with_suffix(".tmp").exists()
+
+    @pytest.mark.parametrize(
+        "cache_class",
+        [JsonCache, DiskUsage, FieldFreshness, OwnedGamesSnapshot, PersonaCache],
+    )
+    @pytest.mark.parametrize("contents", ["{not json", "[1, 2]"])
+    def test_corrupt_file(self, tmp_path, cache_class, contents):
+        path = tmp_path / "cache.json"
+        path.write_text(contents)
+        assert cache_class(path).load() == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,227 @@
+import datetime as dt
+import openpyxl
+import pytest
+
+# local imports
+from utils.library_store import LibraryStore
+from easierexcel import Excel, Sheet
+
+
+COLUMNS = ["Name", "Play Status", "Hours Played", "Date Updated", "App ID"]
+ROWS = [
+    ["Portal 2", "Finished", 10.5, dt.datetime(2024, 1, 2), 620],
+    ["Hades", "Played", 30.0, dt.datetime(2024, 3, 4), 1145360],
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LibraryStore(
+        tmp_path / "library.db",
+        COLUMNS,
+        key_column="App ID",
+        indexed_columns=("Name", "Play Status"),
+        date_columns=("Date Updated",),
+    )
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    path = tmp_path / "library.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Steam"
+    worksheet.append(COLUMNS)
+    for row in ROWS:
+        worksheet.append(row)
+    workbook.save(path)
+    excel = Excel(path, use_logging=False, log_file=str(tmp_path / "excel.log"))
+    return Sheet(excel_object=excel, sheet_name="Steam", column_name="App ID")
+
+
+class TestImportSheet:
+
+    def test_success(self, store, sheet):
+        assert store.import_sheet(sheet, sheet.excel.file_path) == 2
+        assert list(store.row_idx) == ["620", "1145360"]
+        row = store.get_row(620)
+        assert row["Name"] == "Portal 2"
+        assert row["Date Updated"] == dt.datetime(2024, 1, 2)
+        assert not store.changes_made
+
+    def test_needs_import(self, store, sheet):
+        path = sheet.excel.file_path
+        assert store.needs_import(path)
+        store.import_sheet(sheet, path)
+        assert not store.needs_import(path)
+        path.write_bytes(path.read_bytes() + b"0")
+        assert store.needs_import(path)
+
+    def test_keeps_pending_changes(self, store, sheet):
+        path = sheet.excel.file_path
+        store.import_sheet(sheet, path)
+        store.update_row(620, {"Play Status": "Played"})
+        store.add_new_line({"Name": "Balatro", "App ID": 2379780})
+        store.delete_row(1145360)
+        store.commit(path)
+        # the workbook was edited before the changes were exported
+        sheet.update_cell(620, "Hours Played", 12.0)
+        store.import_sheet(sheet, path)
+        assert list(store.row_idx) == ["620", "2379780"]
+        row = store.get_row(620)
+        assert row["Play Status"] == "Played"
+        assert row["Hours Played"] == 12.0
+        assert store.dirty_rows == {"620": {"Play Status"}, "2379780": None}
+        assert store.deleted_keys == {"1145360"}
+
+
+class TestRowApi:
+
+    def test_missing_row(self, store):
+        assert store.get_row(1) == {column: None for column in COLUMNS}
+        assert store.get_cell(1, "Name") is None
+        assert store.update_cell(1, "Name", "Test") is False
+
+    def test_update_cell(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        assert store.update_cell(620, "Hours Played", 12.0)
+        assert store.get_cell("620", "Hours Played") == 12.0
+        assert store.update_cell(620, "Hours Played", 12.0) is False
+        assert store.update_cell(620, "Name", "Other", replace=False) is False
+
+    def test_add_new_line_requires_key(self, store):
+        with pytest.raises(ValueError):
+            store.add_new_line({"Name": "Portal 2"})
+
+    def test_delete_row(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        assert store.delete_row("620")
+        assert "620" not in store.row_idx
+        assert store.delete_row("620") is None
+
+    def test_hyperlink_target(self, store):
+        link = '=HYPERLINK("https://store.steampowered.com/app/620/","Store")'
+        store.add_new_line({"Name": link, "App ID": 620})
+        assert store.get_cell(620, "Name") == "https://store.steampowered.com/app/620/"
+
+    def test_find_rows(self, store):
+        store.add_new_line({"Name": "Portal 2", "Play Status": "Played", "App ID": 1})
+        store.add_new_line({"Name": "Hades", "Play Status": "Played", "App ID": 2})
+        store.add_new_line({"Name": "Balatro", "Play Status": "Unplayed", "App ID": 3})
+        rows = store.find_rows("Play Status", "Played")
+        assert [row["Name"] for row in rows] == ["Portal 2", "Hades"]
+
+    def test_create_dataframe(self, store):
+        store.add_new_line({"Name": "Portal 2", "Hours Played": "-", "App ID": 620})
+        store.add_new_line({"Name": "Hades", "Hours Played": 30.0, "App ID": 1145360})
+        df = store.create_dataframe(na_vals=["-"])
+        assert list(df.columns) == COLUMNS
+        assert df["Hours Played"].sum() == 30.0
+
+
+class TestUpdateRow:
+
+    def test_returns_changed_columns(self, store):
+        store.add_new_line({"Name": "Portal 2", "Hours Played": 1.0, "App ID": 620})
+        store.dirty_rows.clear()
+        values = {"Name": "Portal 2", "Hours Played": 2.0, "Play Status": "Played"}
+        assert store.update_row(620, values) == {"Hours Played", "Play Status"}
+        assert store.dirty_rows == {"620": {"Hours Played", "Play Status"}}
+        assert store.get_row(620)["Play Status"] == "Played"
+
+    def test_no_replace(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        values = {"Name": "Other", "Play Status": "Played"}
+        assert store.update_row(620, values, replace=False) == {"Play Status"}
+        assert store.get_cell(620, "Name") == "Portal 2"
+
+    def test_unknown_columns_and_rows(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        assert store.update_row(620, {"Missing": 1}) == set()
+        assert store.update_row(1, {"Name": "Test"}) == set()
+
+    def test_changing_key_moves_row(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 1})
+        store.update_row(1, {"App ID": 620})
+        assert "1" not in store.row_idx
+        assert store.get_cell(620, "Name") == "Portal 2"
+
+    def test_change_count(self, store):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        store.dirty_rows.clear()
+        store.update_row(620, {"Name": "Portal 2"})
+        assert store.change_count == 1
+        store.update_row(620, {"Play Status": "Played"})
+        store.delete_row(620)
+        assert store.change_count == 3
+
+
+class TestCommit:
+
+    def test_uncommitted_changes_are_discarded(self, store, tmp_path):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        store.close()
+        reopened = LibraryStore(tmp_path / "library.db", COLUMNS, key_column="App ID")
+        assert reopened.row_idx == {}
+        reopened.close()
+
+    def test_committed_changes_persist(self, store, tmp_path):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        store.commit()
+        store.close()
+        reopened = LibraryStore(tmp_path / "library.db", COLUMNS, key_column="App ID")
+        assert reopened.get_cell(620, "Name") == "Portal 2"
+        reopened.close()
+
+    def test_pending_export_survives_restart(self, store, tmp_path):
+        store.add_new_line({"Name": "Portal 2", "App ID": 620})
+        store.commit()
+        store.close()
+        reopened = LibraryStore(tmp_path / "library.db", COLUMNS, key_column="App ID")
+        assert reopened.dirty_rows == {"620": None}
+        reopened.close()
+
+    def test_new_columns_are_added(self, store, tmp_path):
+        store.close()
+        columns = [*COLUMNS, "User Tags"]
+        reopened = LibraryStore(tmp_path / "library.db", columns, key_column="App ID")
+        reopened.add_new_line({"User Tags": "Puzzle", "App ID": 620})
+        assert reopened.get_cell(620, "User Tags") == "Puzzle"
+        reopened.close()
+
+
+class TestExportToSheet:
+
+    def test_patches_changed_rows(self, store, sheet):
+        store.import_sheet(sheet)
+        store.update_cell(620, "Hours Played", 11.0)
+        store.add_new_line({"Name": "Balatro", "Play Status": "Unplayed", "App ID": 3})
+        store.delete_row(1145360)
+        assert store.export_to_sheet(sheet) == 2
+        assert sheet.get_cell(620, "Hours Played") == 11.0
+        assert sheet.get_cell(3, "Name") == "Balatro"
+        assert "1145360" not in sheet.row_idx
+        assert not store.changes_made
+
+    def test_only_writes_changed_columns(self, store, sheet, mocker):
+        store.import_sheet(sheet)
+        store.update_row(620, {"Hours Played": 11.0, "Play Status": "Played"})
+        update_cell = mocker.spy(sheet, "update_cell")
+        format_row = mocker.spy(sheet, "format_row")
+        store.export_to_sheet(sheet)
+        columns = {call.args[1] for call in update_cell.call_args_list}
+        assert columns == {"Hours Played", "Play Status"}
+        format_row.assert_called_once_with("620")
+
+    def test_changed_key(self, store, sheet):
+        store.import_sheet(sheet)
+        store.update_row(620, {"App ID": 400})
+        store.export_to_sheet(sheet)
+        assert "400" in sheet.row_idx
+        assert "620" not in sheet.row_idx
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,215 @@
+import time
+import pytest
+
+# local imports
+from main import Tracker
+from utils.library_sync import OwnedGamesSnapshot, SnapshotDiff, reconcile_app_ids
+
+
+OWNED_GAMES = [
+    {"appid": 620, "name": "Portal 2", "playtime_forever": 600},
+    {"appid": 1145360, "name": "Hades", "playtime_forever": 30},
+    {"appid": 2379780, "name": "Balatro", "playtime_forever": 0},
+]
+
+
+class TestSnapshotDiff:
+
+    def test_empty(self):
+        assert not SnapshotDiff()
+
+    def test_changed(self):
+        diff = SnapshotDiff(added={1}, renamed={2}, played={3}, installed={4})
+        assert diff.changed == {1, 2, 3, 4}
+        assert diff
+
+
+class TestOwnedGamesSnapshot:
+
+    @pytest.fixture
+    def snapshot(self, tmp_path):
+        return OwnedGamesSnapshot(tmp_path / "owned_games_snapshot.json")
+
+    def test_first_sync_adds_everything(self, snapshot):
+        diff = snapshot.diff(OWNED_GAMES)
+        assert diff.added == {620, 1145360, 2379780}
+        assert not diff.removed
+
+    def test_no_changes(self, snapshot):
+        snapshot.update(OWNED_GAMES, {620})
+        diff = snapshot.diff(OWNED_GAMES, {620})
+        assert not diff
+
+    def test_changes(self, snapshot):
+        snapshot.update(OWNED_GAMES)
+        owned_games = [
+            {"appid": 620, "name": "Portal 2", "playtime_forever": 660},
+            {"appid": 1145360, "name": "Hades I", "playtime_forever": 30},
+            {"appid": 4000, "name": "Garry's Mod", "playtime_forever": 0},
+        ]
+        diff = snapshot.diff(owned_games, {4000})
+        assert diff.added == {4000}
+        assert diff.removed == {2379780}
+        assert diff.renamed == {1145360}
+        assert diff.played == {620}
+        assert diff.installed == set()
+
+    def test_linux_playtime(self, snapshot):
+        snapshot.update(OWNED_GAMES)
+        owned_games = [{**OWNED_GAMES[0], "playtime_linux_forever": 60}]
+        diff = snapshot.diff(owned_games + OWNED_GAMES[1:])
+        assert diff.played == {620}
+
+    def test_installed(self, snapshot):
+        snapshot.update(OWNED_GAMES, {620})
+        diff = snapshot.diff(OWNED_GAMES, {2379780})
+        assert diff.installed == {620, 2379780}
+
+    def test_keep_entries(self, snapshot):
+        snapshot.update(OWNED_GAMES)
+        renamed = [{**OWNED_GAMES[0], "name": "Portal 2: Remastered"}, OWNED_GAMES[1]]
+        new_game = {"appid": 4000, "name": "Garry's Mod", "playtime_forever": 0}
+        snapshot.update(renamed + [new_game], keep={620, 4000})
+        diff = snapshot.diff(renamed + [new_game])
+        assert diff.renamed == {620}
+        assert diff.added == {4000}
+
+    def test_save_and_load(self, snapshot):
+        snapshot.update(OWNED_GAMES, {620})
+        snapshot.save()
+        loaded = OwnedGamesSnapshot(snapshot.path)
+        assert not loaded.diff(OWNED_GAMES, {620})
+
+
+class TestReconcileAppIds:
+
+    def test_success(self):
+        added, updated, removed = reconcile_app_ids([1, 2, 3], [2, 3, 4])
+        assert added == {1}
+        assert updated == {2, 3}
+        assert removed == {4}
+
+    def test_empty_sheet(self):
+        added, updated, removed = reconcile_app_ids([1, 2], [])
+        assert added == {1, 2}
+        assert not updated
+        assert not removed
+
+
+class StubSheet:
+
+    def __init__(self, app_ids: set[int]) -> None:
+        """
+        In memory stand-in for the library store that counts the rows the sync
+        reads and writes.
+        """
+        self.rows = {
+            str(app_id): {
+                "App ID": app_id,
+                "Name": f"Game {app_id}",
+                "Hours Played": round(app_id / 60, 1),
+                "Play Status": "Played",
+            }
+            for app_id in app_ids
+        }
+        self.row_idx = dict.fromkeys(self.rows)
+        self.change_count = 0
+        self.rows_read = 0
+
+    def get_row(self, row_value) -> dict:
+        self.rows_read += 1
+        empty_row = dict.fromkeys(Tracker.EXCEL_COLUMNS)
+        return self.rows.get(str(row_value), empty_row)
+
+    def get_cell(self, row_value, column_value):
+        return self.rows.get(str(row_value), {}).get(column_value)
+
+    def update_row(self, row_val, values: dict, replace: bool = True) -> set[str]:
+        row = self.rows[str(row_val)]
+        changed = {
+            column for column, value in values.items() if row.get(column) != value
+        }
+        row.update(values)
+        self.change_count += bool(changed)
+        return changed
+
+    def add_new_line(self, cell_dict: dict) -> bool:
+        row_key = str(cell_dict["App ID"])
+        self.rows[row_key] = dict(cell_dict)
+        self.row_idx[row_key] = None
+        self.change_count += 1
+        return True
+
+    def delete_row(self, col_val):
+        self.rows.pop(str(col_val), None)
+        self.row_idx.pop(str(col_val), None)
+        self.change_count += 1
+        return True
+
+
+class TestSyncScaling:
+    """
+    Runs the owned games sync on synthetic libraries to show it only reads
+    the rows of games that changed and scales linearly with library size.
+    """
+
+    trackerObj = Tracker(save=False)
+
+    @staticmethod
+    def create_library(total_games: int) -> tuple[list[dict], set[int]]:
+        owned_games = [
+            {"appid": app_id, "name": f"Game {app_id}", "playtime_forever": app_id}
+            for app_id in range(total_games)
+        ]
+        # 10% of the sheet was removed and 10% of the owned games are new
+        offset = total_games // 10
+        sheet_app_ids = set(range(offset, total_games + offset))
+        return owned_games, sheet_app_ids
+
+    def run_sync(self, total_games: int, mocker, tmp_path) -> float:
+        """
+        Syncs a synthetic library of `total_games`, checks which rows were
+        read and returns the seconds the sync took.
+        """
+        owned_games, sheet_app_ids = self.create_library(total_games)
+        snapshot = OwnedGamesSnapshot(tmp_path / f"snapshot_{total_games}.json")
+        snapshot.update(owned_games)
+        # 1% of games were played since the last sync
+        for game in owned_games[::100]:
+            game["playtime_forever"] += 60
+        sheet = StubSheet(sheet_app_ids)
+        tracker = self.trackerObj
+        mocker.patch.object(tracker, "owned_games_snapshot", snapshot)
+        mocker.patch.object(tracker, "library", sheet, create=True)
+        mocker.patch.object(tracker, "get_installed_app_ids", return_value=[])
+        mocker.patch.object(tracker, "get_last_played_times", return_value={})
+        mocker.patch.object(tracker, "get_app_details", return_value=None)
+        mocker.patch("main.is_response_yes", return_value=False)
+        start = time.perf_counter()
+        tracker.sync_steam_games_with_sheet(owned_games, sheet_app_ids)
+        seconds = time.perf_counter() - start
+        added = total_games // 10
+        played = sum(
+            1 for game in owned_games[::100] if game["appid"] in sheet_app_ids
+        )
+        assert sheet.rows_read == added + played
+        assert len(sheet.rows) == total_games + added
+        return seconds
+
+    def test_only_changed_games_are_read(self, mocker, tmp_path):
+        self.run_sync(20_000, mocker, tmp_path)
+
+    def test_linear_scaling(self, mocker, tmp_path, capsys):
+        small = self.run_sync(5_000, mocker, tmp_path)
+        large = self.run_sync(50_000, mocker, tmp_path)
+        # 10x the games should take about 10x as long where O(n^2) would be 100x,
+        # only printed since wall clock ratios are too noisy to assert on
+        with capsys.disabled():
+            print(
+                f"\nsync of 5k games: {small:.3f}s, 50k games: {large:.3f}s, "
+                f"ratio {large / small:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
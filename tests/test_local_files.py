@@ -0,0 +1,216 @@
+import os
+import pytest
+
+# local imports
+from utils.local_files import (
+    LocalSteamFiles,
+    ParseCache,
+    get_installed_app_ids,
+    get_installed_apps,
+    manifest_app_id,
+    parse_app_manifest,
+)
+
+LIBRARY_FOLDER = """	"{index}"
+	{{
+		"path"		"{path}"
+		"apps"
+		{{
+{apps}
+		}}
+	}}
+"""
+
+
+LOCAL_CONFIG_VDF = """"UserLocalConfigStore"
+{{
+	"Software"
+	{{
+		"valve"
+		{{
+			"Steam"
+			{{
+				"apps"
+				{{
+{apps}
+				}}
+			}}
+		}}
+	}}
+}}
+"""
+
+
+def write(path, text: str):
+    path.write_text(text, encoding="utf-8")
+    # keeps the modified time different even on coarse filesystem clocks
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+MANIFEST_ACF = """"AppState"
+{{
+	"appid"		"{app_id}"
+	"name"		"Game {app_id}"
+	"StateFlags"		"{state_flags}"
+	"installdir"		"Game {app_id}"
+	"LastUpdated"		"1700000000"
+	"SizeOnDisk"		"{size}"
+	"InstalledDepots"
+	{{
+		"{app_id}1"
+		{{
+			"size"		"{size}"
+		}}
+	}}
+}}
+"""
+
+
+def write_library(path, libraries: dict[str, list[int]]):
+    folders = []
+    for index, (library_path, app_ids) in enumerate(libraries.items()):
+        apps = "\n".join(f'\t\t\t"{app_id}"\t\t"100"' for app_id in app_ids)
+        folders.append(LIBRARY_FOLDER.format(index=index, path=library_path, apps=apps))
+    write(path, '"libraryfolders"\n{\n' + "".join(folders) + "}\n")
+
+
+def write_manifest(steamapps, app_id, state_flags=4, size=1024):
+    path = steamapps / f"appmanifest_{app_id}.acf"
+    text = MANIFEST_ACF.format(app_id=app_id, state_flags=state_flags, size=size)
+    write(path, text)
+    return path
+
+
+def write_local_config(path, last_played):
+    apps = "\n".join(
+        f'"{app_id}"\n{{\n"LastPlayed"\t\t"{played}"\n}}'
+        for app_id, played in last_played.items()
+    )
+    write(path, LOCAL_CONFIG_VDF.format(apps=apps))
+
+
+class TestParseCache:
+
+    def test_parses_only_changed(self, tmp_path):
+        path = tmp_path / "file.vdf"
+        write(path, "one")
+        parses = []
+
+        def parse(path):
+            parses.append(path)
+            return path.read_text()
+
+        cache = ParseCache()
+        assert cache.get(path, parse) == "one"
+        assert cache.get(path, parse) == "one"
+        assert len(parses) == 1
+        write(path, "two")
+        assert cache.get(path, parse) == "two"
+        assert len(parses) == 2
+
+
+class TestManifestAppId:
+
+    def test_success(self, tmp_path):
+        assert manifest_app_id(tmp_path / "appmanifest_620.acf") == 620
+
+    def test_invalid(self, tmp_path):
+        assert manifest_app_id(tmp_path / "appmanifest_temp.acf") is None
+
+
+class TestLocalSteamFiles:
+
+    @pytest.fixture
+    def paths(self, tmp_path):
+        steamapps = tmp_path / "steamapps"
+        steamapps.mkdir()
+        library_vdf = steamapps / "libraryfolders.vdf"
+        local_config = tmp_path / "localconfig.vdf"
+        write_library(library_vdf, {tmp_path.as_posix(): [620, 730]})
+        write_local_config(local_config, {620: 1700000000})
+        return library_vdf, local_config, steamapps
+
+    def test_first_poll(self, paths):
+        library_vdf, local_config, _ = paths
+        local_files = LocalSteamFiles(library_vdf, local_config, use_inotify=False)
+        changes = local_files.poll()
+        assert changes.installed == {620, 730}
+        assert changes.uninstalled == set()
+        assert changes.last_played == {620: 1700000000}
+        assert not local_files.poll()
+
+    def test_last_played_delta(self, paths):
+        library_vdf, local_config, _ = paths
+        local_files = LocalSteamFiles(library_vdf, local_config, use_inotify=False)
+        local_files.poll()
+        write_local_config(local_config, {620: 1700000000, 730: 1700005000})
+        changes = local_files.poll()
+        assert changes.last_played == {730: 1700005000}
+        assert not changes.installed
+
+    def test_library_change(self, paths):
+        library_vdf, local_config, _ = paths
+        local_files = LocalSteamFiles(library_vdf, local_config, use_inotify=False)
+        local_files.poll()
+        write_library(library_vdf, {library_vdf.parent.parent.as_posix(): [620, 440]})
+        changes = local_files.poll()
+        assert changes.installed == {440}
+        assert changes.uninstalled == {730}
+        assert not changes.last_played
+
+    def test_manifests(self, paths):
+        library_vdf, local_config, steamapps = paths
+        local_files = LocalSteamFiles(library_vdf, local_config, use_inotify=False)
+        local_files.poll()
+        manifest = write_manifest(steamapps, 440, state_flags=1026)
+        assert not local_files.poll()
+        write_manifest(steamapps, 440)
+        assert local_files.poll().installed == {440}
+        manifest.unlink()
+        assert local_files.poll().uninstalled == {440}
+
+
+class TestInstalledApps:
+
+    @pytest.fixture
+    def libraries(self, tmp_path):
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        for library in (first, second):
+            (library / "steamapps").mkdir(parents=True)
+        write_manifest(first / "steamapps", 620, size=2048)
+        write_manifest(second / "steamapps", 730, state_flags=1026)
+        library_vdf = tmp_path / "libraryfolders.vdf"
+        write_library(library_vdf, {first.as_posix(): [620], second.as_posix(): []})
+        return library_vdf, first
+
+    def test_parse_app_manifest(self, tmp_path):
+        path = write_manifest(tmp_path, 620, size=2048)
+        installed_app = parse_app_manifest(path)
+        assert installed_app.app_id == 620
+        assert installed_app.name == "Game 620"
+        assert installed_app.size_on_disk == 2048
+        assert installed_app.last_updated == 1700000000
+        assert installed_app.install_dir == tmp_path / "common" / "Game 620"
+        assert installed_app.fully_installed
+
+    def test_get_installed_apps(self, libraries):
+        library_vdf, _ = libraries
+        installed_apps = get_installed_apps(library_vdf)
+        assert set(installed_apps) == {620, 730}
+        assert installed_apps[620].size_on_disk == 2048
+        assert not installed_apps[730].fully_installed
+
+    def test_get_installed_app_ids(self, libraries):
+        library_vdf, _ = libraries
+        assert get_installed_app_ids(library_vdf) == [620]
+
+    def test_no_manifests_falls_back(self, tmp_path):
+        library_vdf = tmp_path / "libraryfolders.vdf"
+        write_library(library_vdf, {(tmp_path / "missing").as_posix(): [620, 730]})
+        assert get_installed_app_ids(library_vdf) == [620, 730]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,8 +1,13 @@
+import json
 import pytest
 
 # local imports
 from main import Tracker
 from utils.game_info import Game
+from utils.library_sync import OwnedGamesSnapshot
+from utils.freshness import FieldFreshness
+from utils.local_files import LocalChanges
+from utils.library_store import LibraryStore
 
 
 class TestAppIdsToNames:
@@ -12,7 +17,7 @@ class TestAppIdsToNames:
         """
         Tests average uses.
         """
-        mocker.patch("easierexcel.Sheet.get_cell", return_value="Test")
+        mocker.patch("utils.library_store.LibraryStore.get_cell", return_value="Test")
 
         app_ids = [12345, 456789]
         names = ["Test", "Test"]
@@ -44,6 +49,345 @@ class TestGetGameColumnDict:
         }
 
 
+class TestFetchGameColumnDict:
+
+    trackerObj = Tracker(save=False)
+
+    @pytest.fixture
+    def tracker(self, mocker, tmp_path):
+        freshness = FieldFreshness(tmp_path / "field_timestamps.json")
+        mocker.patch.object(self.trackerObj, "field_freshness", freshness)
+        return self.trackerObj
+
+    def test_only_fetches_due_columns(self, tracker, mocker):
+        stale = Tracker.ENRICHED_COLUMN_SOURCES.keys() - {"Player Count"}
+        tracker.field_freshness.mark_fetched(620, stale)
+        app_details = mocker.patch.object(tracker, "get_app_details")
+        game = Game(
+            app_id=620,
+            name="Portal 2",
+            player_count=1200,
+            fetched_sources={"app_details", "player_count"},
+        )
+        get_game_info = mocker.patch.object(tracker, "get_game_info", return_value=game)
+        column_dict = tracker.fetch_game_column_dict(620, "Portal 2", stale_only=True)
+        assert column_dict == {"Player Count": 1200}
+        app_details.assert_not_called()
+        assert get_game_info.call_args.args[2] == {"player_count"}
+
+    def test_nothing_due(self, tracker, mocker):
+        tracker.field_freshness.mark_fetched(620, Tracker.ENRICHED_COLUMN_SOURCES)
+        get_game_info = mocker.patch.object(tracker, "get_game_info")
+        assert tracker.fetch_game_column_dict(620, "Portal 2", stale_only=True) == {}
+        get_game_info.assert_not_called()
+
+    def test_fresh_columns_fetched_by_default(self, tracker, mocker):
+        tracker.field_freshness.mark_fetched(620, Tracker.ENRICHED_COLUMN_SOURCES)
+        app_details = mocker.patch.object(tracker, "get_app_details")
+        sources = set(Tracker.ENRICHED_COLUMN_SOURCES.values())
+        game = Game(
+            app_id=620, name="Portal 2", player_count=1200, fetched_sources=sources
+        )
+        mocker.patch.object(tracker, "get_game_info", return_value=game)
+        column_dict = tracker.fetch_game_column_dict(620, "Portal 2")
+        assert column_dict.keys() == Tracker.ENRICHED_COLUMN_SOURCES.keys()
+        app_details.assert_called_once_with(620)
+
+    def test_failed_sources_left_out(self, tracker, mocker):
+        mocker.patch.object(tracker, "get_app_details")
+        game = Game(app_id=620, name="Portal 2", fetched_sources={"app_details"})
+        mocker.patch.object(tracker, "get_game_info", return_value=game)
+        column_dict = tracker.fetch_game_column_dict(620, "Portal 2")
+        assert "Player Count" not in column_dict
+        assert "User Tags" not in column_dict
+        assert column_dict["Discount"] == "-"
+
+
+class TestUpdateExtraGameInfo:
+
+    trackerObj = Tracker(save=False)
+
+    @pytest.fixture
+    def tracker(self, mocker, tmp_path):
+        freshness = FieldFreshness(tmp_path / "field_timestamps.json")
+        mocker.patch.object(self.trackerObj, "field_freshness", freshness)
+        library = mocker.Mock()
+        library.row_idx = {"620": 2}
+        row = {"Time To Beat in Hours": None, "Early Access": None}
+        library.get_row.return_value = row
+        library.update_row.return_value = set()
+        mocker.patch.object(self.trackerObj, "library", library, create=True)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        # a free game that is not on sale, has no tags and no time to beat
+        details = {"steam_appid": 620, "name": "Free Game"}
+        mocker.patch.object(self.trackerObj, "get_app_details", return_value=details)
+        review = {"total": None, "percent": None}
+        mocker.patch.object(self.trackerObj, "get_steam_review", return_value=review)
+        mocker.patch.object(self.trackerObj, "get_steam_user_tags", return_value=[])
+        mocker.patch.object(self.trackerObj, "get_time_to_beat", return_value="-")
+        return self.trackerObj
+
+    def test_empty_columns_are_fresh(self, tracker, mocker):
+        mocker.patch.object(tracker, "get_player_count", return_value=0)
+        tracker.update_extra_game_info([620], "Selected")
+        assert tracker.get_stale_app_ids() == []
+
+    def test_failed_columns_stay_due(self, tracker, mocker):
+        mocker.patch.object(tracker, "get_player_count", return_value=None)
+        mocker.patch.object(tracker, "get_steam_user_tags", return_value=None)
+        tracker.update_extra_game_info([620], "Selected")
+        columns = Tracker.ENRICHED_COLUMN_SOURCES
+        due = tracker.field_freshness.due_fields(620, columns)
+        assert due == {"User Tags", "Player Count"}
+
+
+class TestBulkUpdatePlayerCount:
+
+    trackerObj = Tracker(save=False)
+
+    def test_counts_in_order(self, mocker):
+        library = mocker.Mock()
+        mocker.patch.object(self.trackerObj, "library", library, create=True)
+        mocker.patch.object(self.trackerObj, "logging", False)
+        counts = {620: 1200, 730: RuntimeError("timeout"), 400: 35}
+
+        def get_player_count(app_id, steam_key):
+            if isinstance(counts[app_id], Exception):
+                raise counts[app_id]
+            return counts[app_id]
+
+        mocker.patch.object(
+            self.trackerObj, "get_player_count", side_effect=get_player_count
+        )
+        result = self.trackerObj.bulk_update_player_count([620, 730, 400], "All")
+        assert result == [1200, None, 35]
+        calls = library.update_cell.mock_calls
+        written = {call.args[0]: call.args[2] for call in calls}
+        assert written == {620: 1200, 730: None, 400: 35}
+
+
+class TestUpdateSteamGame:
+
+    trackerObj = Tracker(save=False)
+
+    def test_single_row_write(self, mocker):
+        mocker.patch("utils.library_store.LibraryStore.get_cell", return_value=1.0)
+        mocker.patch.object(self.trackerObj, "total_session_playtime", 0, create=True)
+        update_row = mocker.patch("utils.library_store.LibraryStore.update_row")
+        result = self.trackerObj.update_steam_game(
+            app_id=620,
+            game_name="Portal 2",
+            minutes_played=600,
+            linux_minutes_played=0,
+            new_status="Played",
+            cur_status="Unplayed",
+        )
+        assert result["total_playtime"] == 10.0
+        update_row.assert_called_once()
+        updates = update_row.call_args.args[1]
+        assert updates["Hours Played"] == 10.0
+        assert updates["Play Status"] == "Played"
+        assert updates["Installed"] == "No"
+
+    def test_no_new_playtime(self, mocker):
+        mocker.patch("utils.library_store.LibraryStore.get_cell", return_value=10.0)
+        update_row = mocker.patch("utils.library_store.LibraryStore.update_row")
+        result = self.trackerObj.update_steam_game(
+            app_id=620,
+            game_name="Portal 2",
+            minutes_played=600,
+            linux_minutes_played=0,
+            new_status="Played",
+            cur_status="Played",
+            installed=True,
+        )
+        assert result is None
+        update_row.assert_called_once_with(620, {"Installed": "Yes"})
+
+
+class TestSyncSteamGamesWithSheet:
+
+    trackerObj = Tracker(save=False)
+
+    @pytest.fixture
+    def tracker(self, mocker, tmp_path):
+        snapshot = OwnedGamesSnapshot(tmp_path / "owned_games_snapshot.json")
+        mocker.patch.object(self.trackerObj, "owned_games_snapshot", snapshot)
+        mocker.patch.object(self.trackerObj, "get_installed_app_ids", return_value=[])
+        mocker.patch.object(self.trackerObj, "get_last_played_times", return_value={})
+        empty_row = {column: None for column in Tracker.EXCEL_COLUMNS}
+        mocker.patch("utils.library_store.LibraryStore.get_row", return_value=empty_row)
+        mocker.patch("main.is_response_yes", return_value=False)
+        return self.trackerObj
+
+    def test_skips_unchanged_games(self, tracker, mocker):
+        steam_games = [
+            {"appid": 620, "name": "Portal 2", "playtime_forever": 600},
+            {"appid": 1145360, "name": "Hades", "playtime_forever": 30},
+        ]
+        tracker.owned_games_snapshot.update(steam_games)
+        steam_games[1] = {**steam_games[1], "playtime_forever": 90}
+        update = mocker.patch.object(tracker, "update_steam_game", return_value=None)
+        add = mocker.patch.object(tracker, "add_steam_game")
+        tracker.sync_steam_games_with_sheet(steam_games, [620, 1145360])
+        assert update.call_count == 1
+        assert update.call_args.kwargs["app_id"] == 1145360
+        add.assert_not_called()
+
+    def test_adds_games_missing_from_sheet(self, tracker, mocker):
+        steam_games = [{"appid": 620, "name": "Portal 2", "playtime_forever": 600}]
+        tracker.owned_games_snapshot.update(steam_games)
+        mocker.patch.object(tracker, "update_steam_game", return_value=None)
+        add = mocker.patch.object(tracker, "add_steam_game", return_value={})
+        mocker.patch.object(tracker, "output_added_games_info")
+        tracker.sync_steam_games_with_sheet(steam_games, [])
+        assert add.call_args.kwargs["app_id"] == 620
+
+    def test_changes_saved_in_background(self, tracker, mocker, tmp_path, capsys):
+        library = LibraryStore(
+            tmp_path / "library.db", Tracker.EXCEL_COLUMNS, key_column="App ID"
+        )
+        mocker.patch.object(tracker, "library", library, create=True)
+        mocker.patch.object(tracker, "save_to_file", True)
+        # saving exports the changes which clears the stores dirty rows
+        save_excel = mocker.patch.object(
+            tracker, "save_excel", side_effect=lambda **_: library.dirty_rows.clear()
+        )
+
+        def add_game(**kwargs):
+            library.add_new_line({"App ID": kwargs["app_id"], "Name": "Portal 2"})
+            return {"name": "Portal 2", "total_playtime": 10.0}
+
+        mocker.patch.object(tracker, "add_steam_game", side_effect=add_game)
+        mocker.patch.object(tracker, "output_added_games_info")
+        steam_games = [{"appid": 620, "name": "Portal 2", "playtime_forever": 600}]
+        tracker.sync_steam_games_with_sheet(steam_games, [])
+        assert "No Steam games were added" not in capsys.readouterr().out
+        # the first save backs up the excel file before overwriting it
+        assert save_excel.call_args_list[0].kwargs["backup"]
+        library.close()
+
+    def test_declined_rename_asked_again(self, tracker, mocker):
+        steam_games = [{"appid": 620, "name": "Portal 2", "playtime_forever": 600}]
+        tracker.owned_games_snapshot.update([{**steam_games[0], "name": "Portal"}])
+        row = {column: None for column in Tracker.EXCEL_COLUMNS}
+        row["Name"] = "Portal"
+        mocker.patch("utils.library_store.LibraryStore.get_row", return_value=row)
+        mocker.patch.object(tracker, "update_steam_game", return_value=None)
+        mocker.patch.object(tracker, "main_log", create=True)
+        mocker.patch.object(tracker, "save_to_file", True)
+        mocker.patch.object(tracker, "save_excel")
+        tracker.sync_steam_games_with_sheet(steam_games, [620])
+        assert tracker.owned_games_snapshot.diff(steam_games).renamed == {620}
+
+    def test_no_changes(self, tracker, mocker, capsys):
+        steam_games = [{"appid": 620, "name": "Portal 2", "playtime_forever": 600}]
+        tracker.owned_games_snapshot.update(steam_games)
+        save_excel = mocker.patch.object(tracker, "save_excel")
+        tracker.sync_steam_games_with_sheet(steam_games, [620])
+        assert "No Steam games were added" in capsys.readouterr().out
+        save_excel.assert_not_called()
+
+
+class TestSyncLocalFiles:
+
+    trackerObj = Tracker(save=False)
+
+    def test_pushes_deltas(self, mocker):
+        changes = LocalChanges(
+            installed={620}, uninstalled={730, 999}, last_played={620: 0}
+        )
+        local_files = mocker.Mock()
+        local_files.poll.return_value = changes
+        mocker.patch.object(self.trackerObj, "local_files", local_files, create=True)
+        library = mocker.Mock()
+        library.row_idx = {"620": 2, "730": 3}
+        library.update_row.return_value = {"Installed"}
+        mocker.patch.object(self.trackerObj, "library", library, create=True)
+        assert self.trackerObj.sync_local_files() == 2
+        updates = {
+            call.args[0]: call.args[1] for call in library.update_row.call_args_list
+        }
+        assert updates[620]["Installed"] == "Yes"
+        assert "Last Played" in updates[620]
+        assert updates[730] == {"Installed": "No"}
+
+    def test_no_changes(self, mocker):
+        local_files = mocker.Mock()
+        local_files.poll.return_value = LocalChanges()
+        mocker.patch.object(self.trackerObj, "local_files", local_files, create=True)
+        assert self.trackerObj.sync_local_files() == 0
+
+
+class TestGetFavoriteGames:
+
+    trackerObj = Tracker(save=False)
+
+    def test_only_sales_enriched(self, mocker):
+        library = mocker.Mock()
+        library.row_idx = {"620": 2, "730": 3, "440": 4}
+        ratings = {"620": 9, "730": 9, "440": 5}
+        library.get_cell.side_effect = lambda app_id, column: ratings[app_id]
+        mocker.patch.object(self.trackerObj, "library", library, create=True)
+        mocker.patch.object(
+            self.trackerObj,
+            "get_price_overviews",
+            return_value={620: {"discount_percent": 50}, 730: {"discount_percent": 0}},
+        )
+        get_app_details = mocker.patch.object(self.trackerObj, "get_app_details")
+        game = Game(app_id=620, name="Portal 2", discount=50)
+        mocker.patch.object(self.trackerObj, "get_game_info", return_value=game)
+        games = self.trackerObj.get_favorite_games(min_rating=8)
+        assert games == [(game, 9)]
+        get_app_details.assert_called_once_with(620)
+        self.trackerObj.get_price_overviews.assert_called_once_with({620: 9, 730: 9})
+
+
+class TestCreateScheduler:
+
+    trackerObj = Tracker(save=False)
+
+    def test_intervals(self, mocker):
+        mocker.patch.object(
+            self.trackerObj,
+            "daemon_intervals",
+            {"owned_games_sync": 30, "player_counts": 0},
+        )
+        mocker.patch.object(self.trackerObj, "config_data", {"last_runs": {}})
+        scheduler = self.trackerObj.create_scheduler()
+        assert list(scheduler.jobs) == ["owned_games_sync"]
+        assert scheduler.jobs["owned_games_sync"].interval == 30 * 60
+
+    def test_failed_sync_is_retried(self, mocker):
+        intervals = {"owned_games_sync": 1}
+        mocker.patch.object(self.trackerObj, "daemon_intervals", intervals)
+        mocker.patch.object(self.trackerObj, "config_data", {"last_runs": {}})
+        mocker.patch.object(self.trackerObj, "sync_steam_games", return_value=False)
+        mocker.patch.object(self.trackerObj, "logging", False)
+        scheduler = self.trackerObj.create_scheduler()
+        scheduler.on_error = mocker.Mock()
+        scheduler.run_pending()
+        assert "owned_games_sync" not in scheduler.last_runs
+        scheduler.on_error.assert_called_once()
+
+    def test_only_last_run_saved(self, mocker, tmp_path):
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({"settings": {"logging": False}}))
+        mocker.patch.object(self.trackerObj, "daemon_intervals", {"local_files": 1})
+        mocker.patch.object(self.trackerObj, "config_data", {"last_runs": {}})
+        mocker.patch.object(self.trackerObj, "config_path", str(config_path))
+        mocker.patch.object(self.trackerObj, "save_to_file", True)
+        # the config is edited while the daemon runs
+        edit = {"settings": {"logging": True}}
+        sync = lambda: config_path.write_text(json.dumps(edit))
+        mocker.patch.object(self.trackerObj, "sync_local_files", side_effect=sync)
+        scheduler = self.trackerObj.create_scheduler()
+        scheduler.run_pending()
+        saved = json.loads(config_path.read_text())
+        assert saved["settings"] == {"logging": True}
+        assert saved["last_runs"] == {"local_files": scheduler.last_runs["local_files"]}
+
+
 class TestPlayStatus:
 
     trackerObj = Tracker(save=False)
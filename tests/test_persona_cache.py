@@ -0,0 +1,39 @@
+import time
+import pytest
+
+# local imports
+from utils.persona_cache import PersonaCache
+
+
+class TestPersonaCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return PersonaCache(tmp_path / "persona_names.json", ttl_days=1)
+
+    def test_missing(self, cache):
+        assert cache.get("1") is None
+
+    def test_update_and_get(self, cache):
+        cache.update({"1": "user"})
+        assert cache.get("1") == "user"
+        assert cache.get(1) == "user"
+
+    def test_expired(self, cache):
+        cache.update({"1": "user"}, when=time.time() - 2 * 24 * 60 * 60)
+        assert cache.get("1") is None
+        assert cache.get_many(["1"]) == {}
+
+    def test_get_many(self, cache):
+        cache.update({"1": "first", "2": "second"})
+        assert cache.get_many(["1", "3"]) == {"1": "first"}
+
+    def test_save_and_load(self, cache, tmp_path):
+        cache.update({"1": "user"})
+        cache.save()
+        loaded = PersonaCache(tmp_path / "persona_names.json", ttl_days=1)
+        assert loaded.get("1") == "user"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
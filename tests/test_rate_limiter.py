@@ -0,0 +1,115 @@
+import asyncio, threading
+import pytest
+
+# local imports
+from utils.rate_limiter import TokenBucket, RateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+
+    def test_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == 0.5
+
+    def test_exact_deficit(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4, burst=1, clock=clock)
+        assert bucket.reserve() == 0
+        clock.now = 0.1
+        # only the remaining 0.15 seconds are owed
+        assert bucket.reserve() == pytest.approx(0.15)
+
+    def test_refill_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock)
+        bucket.reserve()
+        clock.now = 100
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 1
+
+    def test_threads_queue_up(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=1, clock=clock)
+        delays = []
+        lock = threading.Lock()
+
+        def reserve():
+            delay = bucket.reserve()
+            with lock:
+                delays.append(delay)
+
+        threads = [threading.Thread(target=reserve) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(delays) == pytest.approx([0, 0.1, 0.2, 0.3, 0.4])
+
+    def test_acquire_sleeps_deficit(self, mocker):
+        sleep = mocker.patch("time.sleep")
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=1, clock=clock)
+        bucket.acquire()
+        sleep.assert_not_called()
+        bucket.acquire()
+        sleep.assert_called_once_with(0.5)
+
+    def test_acquire_async(self):
+        bucket = TokenBucket(rate=1000, burst=1)
+
+        async def run():
+            return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+        delays = asyncio.run(run())
+        assert delays[0] == 0
+        assert all(delay > 0 for delay in delays[1:])
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestRateLimiter:
+
+    def test_configure(self):
+        limiter = RateLimiter({"steam_app_details": {"rate": 5, "burst": 2}})
+        bucket = limiter.get_bucket("steam_app_details")
+        assert bucket.rate == 5
+        assert bucket.burst == 2
+
+    def test_unknown_name_uses_default(self):
+        limiter = RateLimiter()
+        bucket = limiter.get_bucket("not_configured")
+        default = RateLimiter.DEFAULT_LIMITS["default"]
+        assert bucket.rate == default["rate"]
+        assert bucket.burst == default["burst"]
+
+    def test_same_bucket_per_name(self):
+        limiter = RateLimiter()
+        assert limiter.get_bucket("time_to_beat") is limiter.get_bucket("time_to_beat")
+        assert limiter.get_bucket("time_to_beat") is not limiter.get_bucket("default")
+
+    def test_reconfigure_replaces_bucket(self):
+        limiter = RateLimiter()
+        old_bucket = limiter.get_bucket("time_to_beat")
+        limiter.configure({"time_to_beat": {"rate": 8}})
+        new_bucket = limiter.get_bucket("time_to_beat")
+        assert new_bucket is not old_bucket
+        assert new_bucket.rate == 8
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
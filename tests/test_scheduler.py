@@ -0,0 +1,98 @@
+import pytest
+
+# local imports
+from utils.scheduler import Scheduler
+
+
+class FakeClock:
+
+    def __init__(self, now: float = 1000) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestScheduler:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_new_job_runs_first_check(self, clock):
+        calls = []
+        scheduler = Scheduler(clock=clock)
+        scheduler.add("sync", lambda: calls.append("sync"), 60)
+        assert scheduler.run_pending() == ["sync"]
+        assert calls == ["sync"]
+        assert scheduler.run_pending() == []
+
+    def test_runs_on_interval(self, clock):
+        scheduler = Scheduler(clock=clock)
+        job = scheduler.add("sync", lambda: None, 60)
+        scheduler.run_pending()
+        clock.now += 59
+        assert scheduler.run_pending() == []
+        assert scheduler.seconds_until_next() == 1
+        clock.now += 1
+        assert scheduler.run_pending() == ["sync"]
+        assert job.runs == 2
+
+    def test_resumes_from_last_runs(self, clock):
+        last_runs = {"backup": clock.now - 30}
+        scheduler = Scheduler(last_runs, clock=clock)
+        scheduler.add("backup", lambda: None, 60)
+        assert scheduler.run_pending() == []
+        clock.now += 30
+        assert scheduler.run_pending() == ["backup"]
+        assert last_runs["backup"] == clock.now
+
+    def test_overdue_jobs_run_oldest_first(self, clock):
+        order = []
+        last_runs = {"a": clock.now - 100, "b": clock.now - 500}
+        scheduler = Scheduler(last_runs, clock=clock)
+        scheduler.add("a", lambda: order.append("a"), 60)
+        scheduler.add("b", lambda: order.append("b"), 60)
+        scheduler.run_pending()
+        assert order == ["b", "a"]
+
+    def test_failed_job_is_retried(self, clock):
+        errors = []
+        last_runs = {}
+        scheduler = Scheduler(
+            last_runs,
+            on_error=lambda name, error: errors.append(name),
+            clock=clock,
+        )
+
+        def fail():
+            raise ConnectionError("Test error")
+
+        job = scheduler.add("sync", fail, 60)
+        assert scheduler.run_pending() == ["sync"]
+        assert errors == ["sync"]
+        assert isinstance(job.error, ConnectionError)
+        assert "sync" not in last_runs
+        clock.now += 60
+        assert scheduler.run_pending() == ["sync"]
+
+    def test_on_run(self, clock):
+        ran = []
+        scheduler = Scheduler(on_run=ran.append, clock=clock)
+        scheduler.add("sync", lambda: None, 60)
+        scheduler.run_pending()
+        assert ran == ["sync"]
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            Scheduler().add("sync", lambda: None, 0)
+
+    def test_run_forever_stops(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add("sync", scheduler.stop, 60)
+        scheduler.run_forever(max_wait=0)
+        assert scheduler.jobs["sync"].runs == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
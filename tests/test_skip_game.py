@@ -42,6 +42,45 @@ class TestSkipGame:
         # name return false
         assert not self.game_skipper.skip_game(game_name="This is a great game")
 
+    def test_keyword_needs_whole_word(self):
+        """
+        Keywords only match whole words.
+        """
+        assert not self.game_skipper.skip_game(game_name="Demon's Souls")
+        assert self.game_skipper.skip_game(game_name="Cool Game Demo")
+        assert self.game_skipper.skip_game(game_name="Directors' Commentary")
+
+    def test_string_app_ids(self):
+        """
+        App ID's given as strings are matched as ints.
+        """
+        game_skipper = GameSkipper([], ["12345", 54321])
+        assert game_skipper.skip_game(app_id=12345)
+        assert game_skipper.skip_game(app_id="54321")
+
+    def test_updated_name_ignore_list(self):
+        """
+        Setting a new name ignore list rebuilds the matcher.
+        """
+        game_skipper = GameSkipper(["Game One"])
+        assert game_skipper.skip_game(game_name="game one")
+        game_skipper.name_ignore_list = ["Game Two"]
+        assert not game_skipper.skip_game(game_name="game one")
+        assert game_skipper.skip_game(game_name="game two")
+
+    def test_skip_games(self):
+        """
+        Batch check returns the app ID's to skip.
+        """
+        games = [
+            ("Portal 2", 620),
+            ("Spotify", 1),
+            ("Hades Demo", 2),
+            ("Hades", 12345),
+        ]
+        game_skipper = GameSkipper(self.NAME_IGNORE_LIST, self.APP_ID_IGNORE_LIST)
+        assert game_skipper.skip_games(games) == {1, 2, 12345}
+
     def test_empty(self):
         """
         Empty args return False.
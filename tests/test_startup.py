@@ -0,0 +1,52 @@
+from pathlib import Path
+import subprocess, sys
+import pytest
+
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# modules that are only imported by the actions that use them
+HEAVY_MODULES = ("pandas", "bs4", "howlongtobeatpy", "rich", "openpyxl", "easierexcel")
+# cumulative microseconds allowed for `import main`
+IMPORT_BUDGET_US = 750_000
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def get_import_time(module: str) -> int:
+    """
+    Gets the cumulative import time of `module` in microseconds using
+    `python -X importtime`.
+    """
+    result = run_python("-X", "importtime", "-c", f"import {module}")
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} was not imported")
+
+
+class TestStartup:
+
+    def test_heavy_modules_are_lazy(self):
+        code = "import sys, main; print(','.join(sorted(sys.modules)))"
+        modules = set(run_python("-c", code).stdout.strip().split(","))
+        assert not modules & set(HEAVY_MODULES)
+
+    def test_import_budget(self):
+        # the fastest of a few runs avoids failing on a busy machine
+        import_time = min(get_import_time("main") for _ in range(3))
+        assert import_time < IMPORT_BUDGET_US
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
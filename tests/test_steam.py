@@ -2,6 +2,10 @@ import pytest, requests
 
 # local imports
 from utils.steam import Steam
+from utils.app_list import AppList, AppListCache, NameIndex
+from utils.disk_usage import DiskUsage
+from utils.local_files import InstalledApp
+from utils.persona_cache import PersonaCache
 from utils.utils import *
 
 
@@ -9,7 +13,7 @@ class TestGetOwnedSteamGames:
 
     @pytest.fixture
     def mock_response(self, mocker):
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         # Create a mock response object
         mock_response = mocker.Mock()
         # Set the JSON data for the response
@@ -30,7 +34,7 @@ class TestGetOwnedSteamGames:
 
     def test_success(self, mock_response, mocker):
         # Mock requests.get and return the mock response
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
         # Call the function you want to test
         result = self.steam.get_owned_steam_games(self.STEAM_KEY, self.STEAM_ID)
         # Assert that the function returns the expected result
@@ -41,7 +45,7 @@ class TestGetOwnedSteamGames:
 
     def test_request_error(self, mocker):
         test_exception = requests.RequestException("Test error")
-        mocker.patch("requests.get", side_effect=test_exception)
+        mocker.patch("requests.Session.get", side_effect=test_exception)
 
         result = self.steam.get_owned_steam_games(self.STEAM_KEY, 123456)
         assert result is None
@@ -61,6 +65,119 @@ class TestSteamReview:
         assert isinstance(review_dict["total"], int)
 
 
+class TestGetReviewSummary:
+
+    steam = Steam()
+
+    @pytest.fixture(autouse=True)
+    def no_wait(self, mocker):
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+
+    def mock_summary(self, mocker, summary):
+        data = {"success": 1, "query_summary": summary}
+        response = mocker.Mock(ok=True, **{"json.return_value": data})
+        return mocker.patch("requests.Session.get", return_value=response)
+
+    def test_success(self, mocker):
+        summary = {"total_positive": 950, "total_negative": 50, "total_reviews": 1000}
+        session_get = self.mock_summary(mocker, summary)
+        review = self.steam.get_review_summary(752590)
+        assert review == {"total": 1000, "percent": 0.95}
+        params = session_get.call_args.kwargs["params"]
+        assert params["num_per_page"] == 0
+        assert params["purchase_type"] == "steam"
+
+    def test_matches_store_page_percent(self, mocker):
+        summary = {"total_positive": 99_960, "total_reviews": 100_000}
+        self.mock_summary(mocker, summary)
+        assert self.steam.get_review_summary(752590)["percent"] == 1
+        summary = {"total_positive": 5, "total_reviews": 100}
+        self.mock_summary(mocker, summary)
+        assert self.steam.get_review_summary(752590)["percent"] == 0.05
+
+    def test_no_reviews(self, mocker):
+        summary = {"total_positive": 0, "total_negative": 0, "total_reviews": 0}
+        self.mock_summary(mocker, summary)
+        review = self.steam.get_review_summary(752590)
+        assert review == {"total": None, "percent": None}
+
+    def test_failed(self, mocker):
+        data = {"success": 2}
+        response = mocker.Mock(ok=True, **{"json.return_value": data})
+        mocker.patch("requests.Session.get", return_value=response)
+        assert self.steam.get_review_summary(752590) is None
+
+    def test_store_page_fallback(self, mocker):
+        mocker.patch.object(Steam, "get_review_summary", return_value=None)
+        page_data = {"review": {"total": 20, "percent": 0.8}}
+        scrape = mocker.patch.object(
+            Steam, "get_store_page_data", return_value=page_data
+        )
+        assert self.steam.get_steam_review(752590) == {"total": 20, "percent": 0.8}
+        scrape.assert_called_once_with(752590)
+
+    def test_summary_skips_store_page(self, mocker):
+        review = {"total": 1000, "percent": 0.95}
+        mocker.patch.object(Steam, "get_review_summary", return_value=review)
+        scrape = mocker.patch.object(Steam, "get_store_page_data")
+        assert self.steam.get_steam_review(752590) == review
+        scrape.assert_not_called()
+
+
+class TestGetStorePageData:
+
+    @pytest.fixture
+    def mock_response(self, mocker):
+        Steam.store_page_cache.clear()
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        with open("tests/data/store_page.html", "r", encoding="utf-8") as file:
+            html = file.read()
+        mock_response = mocker.Mock()
+        mock_response.ok = True
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content.side_effect = lambda size, **_: (
+            html[start : start + size] for start in range(0, len(html), size)
+        )
+        return mock_response
+
+    steam = Steam()
+
+    def test_review_and_tags_share_one_download(self, mock_response, mocker):
+        mocker.patch.object(Steam, "get_review_summary", return_value=None)
+        get = mocker.patch("requests.Session.get", return_value=mock_response)
+        review_dict = self.steam.get_steam_review(app_id=2379780)
+        user_tags = self.steam.get_steam_user_tags(app_id=2379780)
+        assert review_dict == {"total": 98560, "percent": 0.97}
+        assert user_tags[:3] == ["Roguelike", "Card Game", "Deckbuilding"]
+        assert get.call_count == 1
+
+    def test_cached_pages_expire(self, mock_response, mocker):
+        get = mocker.patch("requests.Session.get", return_value=mock_response)
+        self.steam.get_store_page_data(app_id=2379780)
+        self.steam.get_store_page_data(app_id=2379780)
+        assert get.call_count == 1
+        scraped, page_data = Steam.store_page_cache[2379780]
+        expired = scraped - Steam.STORE_PAGE_CACHE_SECONDS
+        Steam.store_page_cache[2379780] = (expired, page_data)
+        self.steam.get_store_page_data(app_id=2379780)
+        assert get.call_count == 2
+
+    def test_streamed_and_closed(self, mock_response, mocker):
+        get = mocker.patch("requests.Session.get", return_value=mock_response)
+        page_data = self.steam.get_store_page_data(app_id=2379780)
+        assert page_data["review"] == {"total": 98560, "percent": 0.97}
+        assert get.call_args.kwargs["stream"]
+        mock_response.close.assert_called_once()
+
+    def test_failed_response(self, mock_response, mocker):
+        mocker.patch.object(Steam, "get_review_summary", return_value=None)
+        mock_response.ok = False
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        assert self.steam.get_steam_review(app_id=2379780) is None
+        assert self.steam.get_steam_user_tags(app_id=2379780) is None
+        assert 2379780 not in Steam.store_page_cache
+
+
 class TestGetGameUrl:
     steam = Steam()
 
@@ -78,7 +195,7 @@ class TestGetGameUrl:
 class TestGetRecentlyPlayedGames:
     @pytest.fixture
     def mock_response(self, mocker):
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         mock_response = mocker.Mock()
         mock_response.json.return_value = {
             "response": {
@@ -95,8 +212,8 @@ class TestGetRecentlyPlayedGames:
     STEAM_KEY, STEAM_ID = get_steam_key_and_id()
 
     def test_success(self, mock_response, mocker):
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         result = self.steam.get_recently_played_steam_games(
             self.STEAM_KEY, self.STEAM_ID, game_count=1
@@ -108,9 +225,9 @@ class TestGetRecentlyPlayedGames:
         ]
 
     def test_request_error(self, mocker):
-        mocker.patch("utils.utils.api_sleeper", return_value=None)
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         test_exception = requests.RequestException("Test error")
-        mocker.patch("requests.get", side_effect=test_exception)
+        mocker.patch("requests.Session.get", side_effect=test_exception)
 
         result = self.steam.get_recently_played_steam_games(
             self.STEAM_KEY, 123456, game_count=1
@@ -118,41 +235,95 @@ class TestGetRecentlyPlayedGames:
         assert result is None
 
 
-class TestGetSteamUsername:
-    @pytest.fixture
-    def mock_response(self, mocker):
-        mock_response = mocker.Mock()
-        mock_response.json.return_value = {
-            "response": {
-                "players": [
-                    {
-                        "steamid": "1231654654",
-                        "personaname": "test_user",
-                    },
-                ]
-            }
-        }
-        mock_response.ok = True
-        return mock_response
+class TestGetSteamUsernames:
 
     steam = Steam()
-    STEAM_KEY, STEAM_ID = get_steam_key_and_id()
 
-    def test_success(self, mock_response, mocker):
+    @pytest.fixture
+    def session_get(self, mocker, tmp_path):
+        persona_cache = PersonaCache(tmp_path / "names.json")
+        mocker.patch.object(Steam, "persona_cache", persona_cache)
+
+        def get(url, params=None, **kwargs):
+            response = mocker.Mock(ok=True)
+            players = [
+                {"steamid": steam_id, "personaname": f"user_{steam_id}"}
+                for steam_id in params["steamids"].split(",")
+            ]
+            response.json.return_value = {"response": {"players": players}}
+            return response
+
+        return mocker.patch("requests.Session.get", side_effect=get)
+
+    def test_chunks_of_100(self, session_get):
+        steam_ids = [str(76561197960265728 + i) for i in range(250)]
+        summaries = self.steam.get_player_summaries(steam_ids, "key")
+        assert len(summaries) == 250
+        assert session_get.call_count == 3
+        sizes = sorted(
+            len(call.kwargs["params"]["steamids"].split(","))
+            for call in session_get.call_args_list
+        )
+        assert sizes == [50, 100, 100]
+
+    def test_usernames_cached(self, session_get):
+        usernames = self.steam.get_steam_usernames(["1", "2"], "key")
+        assert usernames == {"1": "user_1", "2": "user_2"}
+        usernames = self.steam.get_steam_usernames(["2", "3"], "key")
+        assert usernames == {"2": "user_2", "3": "user_3"}
+        assert session_get.call_count == 2
+        # only the uncached ID was requested the second time
+        assert session_get.call_args.kwargs["params"]["steamids"] == "3"
+
+    def test_request_error(self, mocker, tmp_path):
+        persona_cache = PersonaCache(tmp_path / "names.json")
+        mocker.patch.object(Steam, "persona_cache", persona_cache)
+        test_exception = requests.RequestException("Test error")
+        mocker.patch("requests.Session.get", side_effect=test_exception)
+        assert self.steam.get_steam_usernames(["1"], "key") == {"1": None}
 
-        mocker.patch("requests.get", return_value=mock_response)
 
-        result = self.steam.get_steam_username(self.STEAM_KEY, self.STEAM_ID)
+class TestGetPriceOverviews:
 
-        assert result == "test_user"
+    steam = Steam()
 
-    def test_request_error(self, mocker):
+    def test_batched(self, mocker):
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        mocker.patch.object(Steam, "MAX_PRICE_IDS", 2)
+        price = {"final": 999, "discount_percent": 50}
+        pages = [
+            {
+                "620": {"success": True, "data": {"price_overview": price}},
+                "440": {"success": True, "data": []},
+            },
+            {"730": {"success": False}},
+        ]
+        responses = [
+            mocker.Mock(ok=True, **{"json.return_value": page}) for page in pages
+        ]
+        session_get = mocker.patch("requests.Session.get", side_effect=responses)
+        result = self.steam.get_price_overviews([620, 440, 730])
+        assert result == {620: price, 440: None, 730: None}
+        assert session_get.call_count == 2
+        params = session_get.call_args_list[0].kwargs["params"]
+        assert params["appids"] == "620,440"
+        assert params["filters"] == "price_overview"
 
+    def test_request_error(self, mocker):
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
         test_exception = requests.RequestException("Test error")
-        mocker.patch("requests.get", side_effect=test_exception)
+        mocker.patch("requests.Session.get", side_effect=test_exception)
+        assert self.steam.get_price_overviews([620]) == {}
 
-        result = self.steam.get_steam_username(self.STEAM_KEY, 123456)
-        assert result is None
+    def test_invalid_json(self, mocker):
+        mocker.patch("utils.rate_limiter.RateLimiter.wait", return_value=0)
+        mocker.patch.object(Steam, "MAX_PRICE_IDS", 1)
+        price = {"final": 999, "discount_percent": 50}
+        throttled = mocker.Mock(ok=True, **{"json.side_effect": ValueError})
+        page = {"440": {"success": True, "data": {"price_overview": price}}}
+        ok = mocker.Mock(ok=True, **{"json.return_value": page})
+        mocker.patch("requests.Session.get", side_effect=[throttled, ok])
+        assert self.steam.get_price_overviews([620, 440]) == {440: price}
 
 
 class TestGetProfileUsername:
@@ -188,7 +359,7 @@ class TestGetSteamID:
     STEAM_KEY, STEAM_ID = get_steam_key_and_id()
 
     def test_success(self, mock_response, mocker):
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         STEAM_ID = self.steam.get_steam_id("gabelogannewell", self.STEAM_KEY)
         assert STEAM_ID == 1231654654
@@ -197,7 +368,7 @@ class TestGetSteamID:
         STEAM_ID = self.steam.get_steam_id("", self.STEAM_KEY)
 
         test_exception = requests.RequestException("Test error")
-        mocker.patch("requests.get", side_effect=test_exception)
+        mocker.patch("requests.Session.get", side_effect=test_exception)
 
         assert STEAM_ID is None
 
@@ -230,7 +401,7 @@ class TestGetSteamFriends:
     STEAM_KEY, STEAM_ID = get_steam_key_and_id()
 
     def test_success(self, mock_response, mocker):
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         result = self.steam.get_steam_friends(self.STEAM_KEY, self.STEAM_ID)
         assert result == [
@@ -249,7 +420,7 @@ class TestGetSteamFriends:
     def test_request_error(self, mocker):
 
         test_exception = requests.RequestException("Test error")
-        mocker.patch("requests.get", side_effect=test_exception)
+        mocker.patch("requests.Session.get", side_effect=test_exception)
 
         result = self.steam.get_steam_friends(self.STEAM_KEY, 123456)
         assert result is None
@@ -289,7 +460,7 @@ class TestGetSteamGamePlayerCount:
     STEAM_KEY, STEAM_ID = get_steam_key_and_id()
 
     def test_success(self, mock_response, mocker):
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
         player_count = self.steam.get_player_count(730, self.STEAM_KEY)
         assert isinstance(player_count, int)
         assert player_count == 5000
@@ -329,14 +500,44 @@ class TestGetAppList:
 
     steam = Steam()
 
-    def test_success(self, mock_response, mocker):
-        mocker.patch("requests.get", return_value=mock_response)
+    @pytest.fixture
+    def app_list_cache(self, mocker, tmp_path):
+        cache = AppListCache(tmp_path / "app_list.cache")
+        mocker.patch.object(Steam, "app_list_cache", cache)
+        return cache
+
+    def test_success(self, mock_response, mocker, app_list_cache):
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         app_list = self.steam.get_app_list()
         print(app_list)
         assert isinstance(app_list[0]["appid"], int)
         assert isinstance(app_list[0]["name"], str)
 
+    def test_uses_cache(self, mock_response, mocker, app_list_cache):
+        get = mocker.patch("requests.Session.get", return_value=mock_response)
+        self.steam.get_app_list()
+        # forgets the in memory copy so the file is read
+        app_list_cache.app_list = None
+        app_list = self.steam.get_app_list()
+        assert get.call_count == 1
+        assert app_list == [
+            {"appid": 123456, "name": "Test 1"},
+            {"appid": 654321, "name": "Test 2"},
+        ]
+
+    def test_skip_cache(self, mock_response, mocker, app_list_cache):
+        get = mocker.patch("requests.Session.get", return_value=mock_response)
+        self.steam.get_app_list()
+        self.steam.get_app_list(use_cache=False)
+        assert get.call_count == 2
+
+    def test_app_index(self, mock_response, mocker, app_list_cache):
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        app_index = self.steam.get_app_index()
+        assert app_index.get_name(654321) == "Test 2"
+        assert app_index.get_app_id("test 1") == 123456
+
 
 class TestGetAppId:
     steam = Steam()
@@ -351,6 +552,15 @@ class TestGetAppId:
         app_id = self.steam.get_app_id("Not Real", self.app_list)
         assert app_id is None
 
+    def test_case_insensitive(self):
+        app_id = self.steam.get_app_id("HADES™", self.app_list)
+        assert app_id == 12345
+
+    def test_name_index(self):
+        name_index = NameIndex.from_apps(self.app_list)
+        app_id = self.steam.get_app_id("Hades", name_index)
+        assert app_id == 12345
+
 
 class TestGetInstalledAppIds:
     steam = Steam()
@@ -392,6 +602,39 @@ class TestworkshopSize:
         ]
         assert result == answer
 
+    def test_app_list_index(self, tmp_path, mocker):
+        workshop = tmp_path / "workshop"
+        for app_id, size in ((620, 10), (730, 30), (999, 5)):
+            (workshop / str(app_id)).mkdir(parents=True)
+            (workshop / str(app_id) / "item.bin").write_bytes(b"0" * size)
+        disk_usage = DiskUsage(tmp_path / "disk_usage.cache")
+        mocker.patch.object(Steam, "disk_usage", disk_usage)
+        app_list = AppList(
+            [{"appid": 620, "name": "Portal 2"}, {"appid": 730, "name": "CS"}]
+        )
+        result = self.steam.workshop_size(workshop, app_list)
+        assert result == [
+            {"appid": 730, "name": "CS", "bytes": 30},
+            {"appid": 620, "name": "Portal 2", "bytes": 10},
+        ]
+
+
+class TestInstallSize:
+    steam = Steam()
+
+    def test_success(self, tmp_path, mocker):
+        common = tmp_path / "steamapps" / "common"
+        (common / "Portal 2").mkdir(parents=True)
+        (common / "Portal 2" / "game.bin").write_bytes(b"0" * 40)
+        installed_apps = {
+            620: InstalledApp(620, "Portal 2", common / "Portal 2", 40, 4, 0),
+            730: InstalledApp(730, "Missing", common / "Missing", 0, 4, 0),
+        }
+        mocker.patch.object(Steam, "get_installed_apps", return_value=installed_apps)
+        mocker.patch.object(Steam, "disk_usage", DiskUsage(tmp_path / "disk.cache"))
+        result = self.steam.install_size("libraryfolders.vdf")
+        assert result == [{"appid": 620, "name": "Portal 2", "bytes": 40}]
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
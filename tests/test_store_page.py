@@ -0,0 +1,103 @@
+import pytest
+
+# local imports
+from utils.store_page import (
+    StorePageParser,
+    parse_store_page,
+    parse_store_page_chunks,
+    parse_store_page_soup,
+    empty_store_page,
+)
+
+
+class TestParseStorePage:
+    with open("tests/data/store_page.html", "r", encoding="utf-8") as file:
+        html = file.read()
+
+    def test_success(self):
+        page_data = parse_store_page(self.html)
+        assert page_data["review"] == {"total": 98560, "percent": 0.97}
+        assert page_data["user_tags"] == [
+            "Roguelike",
+            "Card Game",
+            "Deckbuilding",
+            "Poker",
+            "Strategy",
+        ]
+
+    def test_perfect_review(self):
+        html = self.html.replace("- 97% of the", "- 100% of the")
+        page_data = parse_store_page(html)
+        assert page_data["review"]["percent"] == 1
+
+    def test_single_digit_review(self):
+        html = self.html.replace("- 97% of the", "- 5% of the")
+        page_data = parse_store_page(html)
+        assert page_data["review"]["percent"] == 0.05
+
+    def test_empty_page(self):
+        page_data = parse_store_page("<html></html>")
+        assert page_data == empty_store_page()
+
+    def test_matches_soup(self):
+        assert parse_store_page(self.html) == parse_store_page_soup(self.html)
+
+    def test_stops_after_blocks(self):
+        parser = StorePageParser()
+        parser.feed(self.html)
+        assert parser.done
+        parser.feed('<a class="app_tag">Late Tag</a>')
+        assert "Late Tag" not in parser.result()["user_tags"]
+
+    def test_missing_tag_block(self):
+        start = self.html.index('<div class="glance_tags_ctn')
+        end = self.html.index('<div class="game_page_autocollapse_ctn')
+        html = self.html[:start] + self.html[end:]
+        page_data = parse_store_page(html)
+        assert page_data["review"] == {"total": 98560, "percent": 0.97}
+        assert page_data["user_tags"] == []
+
+
+class TestParseStorePageChunks:
+    """
+    Checks the parse stops once the review and tag blocks were read on a
+    store page padded to the size of a real one.
+    """
+
+    with open("tests/data/store_page.html", "r", encoding="utf-8") as file:
+        html = file.read()
+
+    def create_page(self) -> str:
+        # real pages have large inline scripts before and reviews after the tags
+        script = "\t\tvar g_rgData = " + '{"key": "value"}, ' * 10_000 + ";\n"
+        review = '<div class="review_box"><div class="content">Great game</div></div>'
+        head_end = self.html.index("</script>")
+        body_end = self.html.index('<div id="footer">')
+        return (
+            self.html[:head_end]
+            + script
+            + self.html[head_end:body_end]
+            + review * 5_000
+            + self.html[body_end:]
+        )
+
+    def test_stops_after_blocks(self):
+        html = self.create_page()
+        assert len(html) > 500_000
+        chunks = [html[start : start + 1024] for start in range(0, len(html), 1024)]
+        read_chunks = []
+
+        def stream():
+            for chunk in chunks:
+                read_chunks.append(chunk)
+                yield chunk
+
+        page_data = parse_store_page_chunks(stream())
+        assert page_data == parse_store_page_soup(html)
+        # the reviews after the tag block are never read
+        assert "review_box" not in "".join(read_chunks)
+        assert len(read_chunks) < len(chunks) / 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
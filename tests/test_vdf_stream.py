@@ -0,0 +1,123 @@
+import io
+import pytest
+import vdf
+
+# local imports
+from utils.vdf_stream import (
+    CLOSE,
+    OPEN,
+    VdfTokens,
+    iter_local_config_apps,
+    iter_local_config_sections,
+)
+
+LOCAL_CONFIG = r"""// comment before the root
+"UserLocalConfigStore"
+{
+	"friends"
+	{
+		"12345"
+		{
+			"name"		"Friend {with braces}"
+			"note"		"quote \" and } brace"
+			"multi"		"first line
+second { line"
+		}
+	}
+	"Software"
+	{
+		"Valve"
+		{
+			"Steam"
+			{
+				"apps"
+				{
+					"620"
+					{
+						"LastPlayed"		"1700000000"
+						"Playtime"		"125"
+						"cloud"
+						{
+							"last_sync_state"		"synchronized"
+						}
+					}
+					"730"
+					{
+						"LastPlayed"		"1690000000"
+					}
+					"tool"
+					{
+						"LastPlayed"		"1"
+					}
+				}
+			}
+		}
+	}
+	"WebStorage"
+	{
+		"key"		"value"
+	}
+}
+"""
+
+
+@pytest.fixture
+def local_config(tmp_path):
+    path = tmp_path / "localconfig.vdf"
+    path.write_text(LOCAL_CONFIG, encoding="utf-8")
+    return path
+
+
+class TestVdfTokens:
+
+    def test_tokens(self):
+        tokens = list(VdfTokens(io.StringIO('"a"\n{\n\t"b"\t\t"{c}"\n}\n')))
+        assert tokens == ["a", OPEN, "b", "{c}", CLOSE]
+
+    def test_escapes_and_multiline(self):
+        text = '"a"\t"line \\"one\\"\nline two"\n"b"\tbare\n'
+        tokens = list(VdfTokens(io.StringIO(text)))
+        assert tokens == ["a", 'line "one"\nline two', "b", "bare"]
+
+    def test_skip_section(self):
+        tokens = VdfTokens(io.StringIO(LOCAL_CONFIG))
+        assert next(tokens) == "UserLocalConfigStore"
+        assert next(tokens) is OPEN
+        assert next(tokens) == "friends"
+        assert next(tokens) is OPEN
+        tokens.skip_section()
+        assert next(tokens) == "Software"
+
+
+class TestIterLocalConfigSections:
+
+    def test_matches_vdf(self, local_config):
+        with open(local_config, encoding="utf-8") as file:
+            data = vdf.load(file)
+        apps = data["UserLocalConfigStore"]["Software"]["Valve"]["Steam"]["apps"]
+        expected = {
+            app_id: {key: val for key, val in values.items() if isinstance(val, str)}
+            for app_id, values in apps.items()
+        }
+        assert dict(iter_local_config_sections(local_config)) == expected
+
+    def test_keys(self, local_config):
+        apps = dict(iter_local_config_sections(local_config, {"Playtime"}))
+        assert apps["620"] == {"Playtime": "125"}
+        assert apps["730"] == {}
+
+    def test_missing_apps(self, tmp_path):
+        path = tmp_path / "localconfig.vdf"
+        path.write_text('"UserLocalConfigStore"\n{\n\t"friends"\n\t{\n\t}\n}\n')
+        assert dict(iter_local_config_sections(path)) == {}
+
+
+class TestIterLocalConfigApps:
+
+    def test_success(self, local_config):
+        apps = list(iter_local_config_apps(local_config))
+        assert apps == [(620, 1700000000, 125), (730, 1690000000, None)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
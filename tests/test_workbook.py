@@ -0,0 +1,39 @@
+import openpyxl
+import pytest
+
+# local imports
+from utils.workbook import LazyWorkbook
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = tmp_path / "library.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Steam"
+    worksheet.append(["Name", "App ID"])
+    worksheet.append(["Portal 2", 620])
+    workbook.save(path)
+    return path
+
+
+class TestLazyWorkbook:
+
+    def test_not_loaded_until_used(self, workbook_path, mocker):
+        excel = mocker.patch("easierexcel.Excel")
+        workbook = LazyWorkbook(workbook_path, use_logging=False)
+        assert not workbook.loaded
+        excel.assert_not_called()
+        workbook.excel
+        assert workbook.loaded
+        excel.assert_called_once()
+
+    def test_get_sheet(self, workbook_path):
+        workbook = LazyWorkbook(workbook_path, use_logging=False)
+        sheet = workbook.get_sheet("Steam", "App ID")
+        assert sheet.get_cell(620, "Name") == "Portal 2"
+        assert workbook.get_sheet("Steam", "App ID") is sheet
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,343 @@
+# standard library
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+import json, struct, time, zlib, os
+
+# local imports
+from utils.utils import unicode_remover
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes a game `name` for case insensitive lookups.
+    """
+    return " ".join(name.casefold().split())
+
+
+def clean_name(name: str) -> str:
+    """
+    Normalizes a game `name` with unicode symbols such as trademark signs removed.
+    """
+    # plain ascii names without HTML entities have nothing to remove
+    if name.isascii() and "&" not in name:
+        return normalize_name(name)
+    return normalize_name(unicode_remover(name))
+
+
+@dataclass()
+class NameMatch:
+    app_id: int
+    match_type: str
+    candidates: list[int] = field(default_factory=list)
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self.candidates) > 1
+
+
+class NameIndex:
+    # lookups are tried in this order and the first one with a match is used
+    MATCH_TYPES = {
+        "exact": lambda name: name,
+        "casefold": normalize_name,
+        "cleaned": clean_name,
+    }
+
+    def __init__(self, entries: Iterable[tuple[str, int]]) -> None:
+        """
+        Name to app ID index with exact, case-folded and unicode cleaned lookups.
+
+        Each lookup keeps the first app ID for a name and only stores the rest
+        when a name is shared by more than one app.
+        """
+        self.ids: dict[str, dict[str, int]] = {key: {} for key in self.MATCH_TYPES}
+        self.duplicates: dict[str, dict[str, list[int]]] = {
+            key: {} for key in self.MATCH_TYPES
+        }
+        for name, app_id in entries:
+            if not isinstance(name, str):
+                continue
+            for match_type, normalize in self.MATCH_TYPES.items():
+                self.add(match_type, normalize(name), app_id)
+
+    def __repr__(self):
+        return f"NameIndex(names={len(self.ids['exact'])})"
+
+    @classmethod
+    def from_maps(
+        cls,
+        ids: dict[str, dict[str, int]],
+        duplicates: dict[str, dict[str, list[int]]],
+    ) -> "NameIndex":
+        """
+        Creates an index from lookups that were already built, such as the
+        ones saved in the app list cache, without normalizing any names.
+        """
+        index = cls(())
+        index.ids = ids
+        index.duplicates = duplicates
+        return index
+
+    @classmethod
+    def from_apps(cls, apps: Iterable[dict]) -> "NameIndex":
+        """
+        Creates an index from app list entries with `appid` and `name` keys.
+        """
+        return cls((app["name"], app["appid"]) for app in apps)
+
+    def add(self, match_type: str, key: str, app_id: int) -> None:
+        """
+        Adds `app_id` under `key` for the `match_type` lookup.
+        """
+        ids = self.ids[match_type]
+        if key not in ids:
+            ids[key] = app_id
+            return
+        if ids[key] == app_id:
+            return
+        candidates = self.duplicates[match_type].setdefault(key, [ids[key]])
+        if app_id not in candidates:
+            candidates.append(app_id)
+
+    def find(self, name: str) -> NameMatch | None:
+        """
+        Finds the app ID for `name` along with how it matched and any other
+        apps that share the name.
+        """
+        if not isinstance(name, str):
+            return None
+        for match_type, normalize in self.MATCH_TYPES.items():
+            key = normalize(name)
+            if key in self.ids[match_type]:
+                app_id = self.ids[match_type][key]
+                candidates = self.duplicates[match_type].get(key, [app_id])
+                return NameMatch(app_id, match_type, list(candidates))
+        return None
+
+    def resolve(self, name: str) -> int | None:
+        """
+        Gets the app ID for `name` or None if it is not found.
+        """
+        match = self.find(name)
+        return match.app_id if match else None
+
+    def ambiguous_names(self) -> dict[str, list[int]]:
+        """
+        Gets every exact name that is shared by more than one app.
+        """
+        return dict(self.duplicates["exact"])
+
+
+class AppList:
+
+    def __init__(
+        self,
+        apps: list[dict],
+        created: float | None = None,
+        name_index: NameIndex | None = None,
+    ) -> None:
+        """
+        Steam app list with an `appid -> name` hash index and a name index for
+        constant time lookups.
+
+        Without a `name_index` it is built on first use since only some actions
+        need it.
+        """
+        self.apps = apps
+        self.created = created or time.time()
+        self.names: dict[int, str] = {app["appid"]: app["name"] for app in apps}
+        self._name_index = name_index
+
+    @property
+    def name_index(self) -> NameIndex:
+        if self._name_index is None:
+            self._name_index = NameIndex.from_apps(self.apps)
+        return self._name_index
+
+    def __repr__(self):
+        return f"AppList(apps={len(self.apps)}, created={self.created})"
+
+    def __len__(self):
+        return len(self.apps)
+
+    def __iter__(self):
+        return iter(self.apps)
+
+    def get_name(self, app_id: int) -> str | None:
+        """
+        Gets the name of `app_id`.
+        """
+        return self.names.get(int(app_id))
+
+    def get_app_id(self, name: str) -> int | None:
+        """
+        Gets the app ID for the game `name`.
+        """
+        return self.name_index.resolve(name)
+
+
+def get_name_index(app_list: list[dict] | AppList | NameIndex) -> NameIndex:
+    """
+    Gets a name index for `app_list`, only building one if it is a plain list.
+    """
+    if isinstance(app_list, NameIndex):
+        return app_list
+    if isinstance(app_list, AppList):
+        return app_list.name_index
+    return NameIndex.from_apps(app_list)
+
+
+def get_app_names(app_list: list[dict] | AppList) -> dict[int, str]:
+    """
+    Gets an app ID to name index for `app_list`, only building one if it is
+    a plain list.
+    """
+    if isinstance(app_list, AppList):
+        return app_list.names
+    return {app["appid"]: app["name"] for app in app_list}
+
+
+class AppListCache:
+    MAGIC = b"SLTAPPS2"
+    # magic, created timestamp and app count
+    HEADER = struct.Struct("<8sdI")
+    # entry count and byte length of the joined strings of each section
+    SECTION = struct.Struct("<II")
+    # byte length of the duplicate app ID's
+    DUPLICATES = struct.Struct("<I")
+    # joins the strings of a section and is removed from them when saving
+    SEPARATOR = "\0"
+
+    def __init__(self, path: str | Path = "configs/app_list.cache", ttl_days: float = 7):
+        """
+        Persistent cache of the Steam app list and its name index in a compact
+        binary format.
+
+        The exact, case-folded and cleaned name lookups are saved next to the
+        apps so loading the cache does not normalize every name again.
+
+        The cache is used until it is `ttl_days` old.
+        """
+        self.path = Path(path)
+        self.ttl_days = ttl_days
+        self.app_list: AppList | None = None
+
+    def __repr__(self):
+        return f"AppListCache(path={str(self.path)!r}, ttl_days={self.ttl_days})"
+
+    def is_expired(self, created: float) -> bool:
+        """
+        Checks if a cache `created` at the given timestamp is past its TTL.
+        """
+        return time.time() - created > self.ttl_days * 24 * 60 * 60
+
+    def encode_section(self, app_ids: list[int], strings: Iterable[str]) -> bytes:
+        """
+        Encodes `app_ids` and their `strings` as a section of packed app ID's
+        followed by the joined strings so both decode without a loop.
+        """
+        joined = self.SEPARATOR.join(
+            string.replace(self.SEPARATOR, "") for string in strings
+        ).encode("utf-8")
+        return (
+            self.SECTION.pack(len(app_ids), len(joined))
+            + struct.pack(f"<{len(app_ids)}I", *app_ids)
+            + joined
+        )
+
+    def decode_section(
+        self, body: bytes, offset: int
+    ) -> tuple[tuple[int, ...], list[str], int]:
+        """
+        Decodes the section that starts at `offset` of `body` into its app
+        ID's, its strings and the offset after it.
+        """
+        count, joined_length = self.SECTION.unpack_from(body, offset)
+        offset += self.SECTION.size
+        app_ids = struct.unpack_from(f"<{count}I", body, offset)
+        offset += count * 4
+        joined = body[offset : offset + joined_length].decode("utf-8")
+        offset += joined_length
+        strings = joined.split(self.SEPARATOR) if count else []
+        if len(strings) != count:
+            raise ValueError("Section strings do not match their app ID's")
+        return app_ids, strings, offset
+
+    def encode(self, apps: list[dict], created: float, name_index: NameIndex) -> bytes:
+        """
+        Encodes `apps` and each lookup of their `name_index` into the binary
+        cache format.
+        """
+        app_ids = [app["appid"] for app in apps]
+        body = bytearray(self.encode_section(app_ids, (app["name"] for app in apps)))
+        for match_type in NameIndex.MATCH_TYPES:
+            ids = name_index.ids[match_type]
+            body += self.encode_section(list(ids.values()), ids)
+        duplicates = json.dumps(name_index.duplicates).encode("utf-8")
+        body += self.DUPLICATES.pack(len(duplicates))
+        body += duplicates
+        header = self.HEADER.pack(self.MAGIC, created, len(apps))
+        return header + zlib.compress(bytes(body), 6)
+
+    def decode(self, data: bytes) -> tuple[list[dict], float, NameIndex]:
+        """
+        Decodes the binary cache format into apps, their created timestamp
+        and their name index.
+        """
+        magic, created, count = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ValueError("Not an app list cache file")
+        body = zlib.decompress(data[self.HEADER.size :])
+        app_ids, names, offset = self.decode_section(body, 0)
+        if len(app_ids) != count:
+            raise ValueError("App count does not match the header")
+        apps = [
+            {"appid": app_id, "name": name} for app_id, name in zip(app_ids, names)
+        ]
+        ids = {}
+        for match_type in NameIndex.MATCH_TYPES:
+            lookup_ids, keys, offset = self.decode_section(body, offset)
+            ids[match_type] = dict(zip(keys, lookup_ids))
+        (duplicates_length,) = self.DUPLICATES.unpack_from(body, offset)
+        offset += self.DUPLICATES.size
+        duplicates = json.loads(body[offset : offset + duplicates_length])
+        return apps, created, NameIndex.from_maps(ids, duplicates)
+
+    def save(self, apps: list[dict]) -> AppList:
+        """
+        Saves `apps` and their name index to the cache file and returns them
+        as an `AppList`.
+        """
+        created = time.time()
+        name_index = NameIndex.from_apps(apps)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_bytes(self.encode(apps, created, name_index))
+        os.replace(temp_path, self.path)
+        self.app_list = AppList(apps, created, name_index)
+        return self.app_list
+
+    def load(self) -> AppList | None:
+        """
+        Loads the cached app list if it exists and has not expired.
+        """
+        if self.app_list and not self.is_expired(self.app_list.created):
+            return self.app_list
+        if not self.path.exists():
+            return None
+        try:
+            apps, created, name_index = self.decode(self.path.read_bytes())
+        except (ValueError, struct.error, zlib.error):
+            return None
+        if self.is_expired(created):
+            return None
+        self.app_list = AppList(apps, created, name_index)
+        return self.app_list
+
+    def clear(self) -> None:
+        """
+        Deletes the cache file and forgets the loaded app list.
+        """
+        self.app_list = None
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,126 @@
+# standard library
+from typing import Callable
+import threading, time
+
+
+class BackgroundSaver:
+
+    def __init__(
+        self,
+        save: Callable[[], None],
+        max_dirty: int = 20,
+        max_interval: float = 60,
+        clock=time.monotonic,
+    ) -> None:
+        """
+        Runs `save` on a background thread once `max_dirty` rows changed or
+        `max_interval` seconds passed since the last save, whichever is first.
+
+        Only one save runs at a time and a save in progress does not block the
+        thread marking rows as dirty. Use it as a context manager so any
+        remaining changes are saved on exit, including on Ctrl+C.
+        """
+        self.save = save
+        self.max_dirty = max_dirty
+        self.max_interval = max_interval
+        self.clock = clock
+        self.dirty = 0
+        self.saves = 0
+        self.last_save = clock()
+        self.error: Exception | None = None
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.save_requested = threading.Event()
+        self.stopping = False
+        self.thread: threading.Thread | None = None
+
+    def __repr__(self):
+        interval = self.max_interval
+        return f"BackgroundSaver(max_dirty={self.max_dirty}, max_interval={interval})"
+
+    def __enter__(self) -> "BackgroundSaver":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Starts the saver thread.
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="saver", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """
+        Waits for save requests and checks the elapsed time every `max_interval`.
+        """
+        while not self.stopping:
+            self.save_requested.wait(timeout=self.max_interval)
+            self.save_requested.clear()
+            if self.stopping:
+                break
+            self.run_save()
+
+    def is_due(self) -> bool:
+        return (
+            self.dirty >= self.max_dirty
+            or self.clock() - self.last_save >= self.max_interval
+        )
+
+    def mark_dirty(self, rows: int = 1) -> None:
+        """
+        Records that `rows` changed and requests a save if one is due.
+        """
+        with self.lock:
+            self.dirty += rows
+            due = self.is_due()
+        if due:
+            self.save_requested.set()
+
+    def run_save(self) -> bool:
+        """
+        Saves if any rows changed since the last save and returns True if it did.
+
+        Failed saves keep their rows dirty so the next save retries them.
+        """
+        with self.save_lock:
+            with self.lock:
+                dirty, self.dirty = self.dirty, 0
+                self.last_save = self.clock()
+            if not dirty:
+                return False
+            try:
+                self.save()
+            except Exception as error:
+                self.error = error
+                with self.lock:
+                    self.dirty += dirty
+                return False
+            self.saves += 1
+            return True
+
+    def flush(self) -> bool:
+        """
+        Waits for any save in progress and then saves the remaining changes.
+        """
+        return self.run_save()
+
+    def close(self) -> None:
+        """
+        Stops the saver thread and saves the remaining changes.
+
+        Raises the last save error if the final save did not succeed.
+        """
+        self.stopping = True
+        self.save_requested.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        if self.dirty and self.error:
+            raise self.error
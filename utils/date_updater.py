@@ -1,13 +1,17 @@
 # standard library
+from __future__ import annotations
 from pathlib import Path
+from typing import TYPE_CHECKING
 import datetime as dt
 import json
 
 # local imports
 from utils.steam import Steam
+from utils.app_list import AppList, get_name_index
 
 # my package imports
-from easierexcel import Sheet
+if TYPE_CHECKING:
+    from easierexcel import Sheet
 
 steam_class = Steam()
 
@@ -41,18 +45,21 @@ def load_purchase_data() -> list[dict]:  # pragma: no cover
     return []
 
 
-def create_game_data(purchase_data: list[dict], app_list: list[dict]) -> list[dict]:
+def create_game_data(
+    purchase_data: list[dict], app_list: list[dict] | AppList
+) -> list[dict]:
     """
     Creates a list of game data while removing entries that were purchased and then refunded
 
     `purchase_data` must be in ascending purchase_date order to work properly.
     """
     to_update = {}
+    name_index = get_name_index(app_list)
     for entry in purchase_data:
         entry_type = entry.get("type")
         games = entry.get("games", [])
         for game_name in games:
-            app_id = steam_class.get_app_id(game_name, app_list)
+            app_id = steam_class.get_app_id(game_name, name_index)
             if entry_type == "Refund":
                 to_update.pop(app_id, None)
             else:
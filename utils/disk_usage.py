@@ -0,0 +1,107 @@
+# standard library
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+import os
+
+# local imports
+from utils.json_cache import JsonCache
+
+
+class DiskUsage(JsonCache):
+    VERSION = 1
+    # the cache holds every scanned directory so it is kept compact
+    INDENT = None
+
+    def __init__(
+        self, path: str | Path = "configs/disk_usage.cache", workers: int = 8
+    ) -> None:
+        """
+        Directory size scanner built on `os.scandir` that sizes many folders
+        at once on a pool of `workers` threads.
+
+        The size of the files directly inside each directory is cached along
+        with its modified time, so directories whose entries did not change
+        only cost a single stat. Files rewritten in place without adding,
+        removing or renaming any entry are not picked up until their
+        directory changes.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        super().__init__(path)
+        self.workers = workers
+
+    def __repr__(self):
+        return f"DiskUsage(path={str(self.path)!r}, workers={self.workers})"
+
+    def decode(self, data: dict) -> dict[str, tuple[int, int, list[str]]]:
+        # directory -> (modified time, size of its files, child directories)
+        if data.get("version") != self.VERSION:
+            return {}
+        return {directory: tuple(entry) for directory, entry in data["entries"].items()}
+
+    def encode(self, entries: dict) -> dict:
+        return {"version": self.VERSION, "entries": entries}
+
+    def scan_directory(self, directory: str) -> tuple[int, int, list[str]] | None:
+        """
+        Gets the modified time, size of the files and child directories of
+        `directory`, only listing it again if it changed.
+        """
+        try:
+            modified = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        entries = self.load()
+        entry = entries.get(directory)
+        if entry and entry[0] == modified:
+            return entry
+        files_size = 0
+        child_dirs = []
+        try:
+            with os.scandir(directory) as dir_entries:
+                for dir_entry in dir_entries:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            child_dirs.append(dir_entry.name)
+                        elif dir_entry.is_file(follow_symlinks=False):
+                            files_size += dir_entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        entry = (modified, files_size, child_dirs)
+        with self.lock:
+            entries[directory] = entry
+            self.changed = True
+        return entry
+
+    def dir_size(self, directory: str | Path) -> int:
+        """
+        Gets the size of `directory` and everything within it in bytes.
+        """
+        total = 0
+        pending = [os.fspath(directory)]
+        while pending:
+            current = pending.pop()
+            entry = self.scan_directory(current)
+            if entry is None:
+                continue
+            _, files_size, child_dirs = entry
+            total += files_size
+            pending.extend(os.path.join(current, name) for name in child_dirs)
+        return total
+
+    def folder_sizes(self, folders: Iterable[str | Path]) -> dict[str, int]:
+        """
+        Gets the size of each folder in `folders` using the worker pool and
+        saves the cache afterwards.
+        """
+        folders = [os.fspath(folder) for folder in folders]
+        if not folders:
+            return {}
+        workers = min(self.workers, len(folders))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sizes = dict(zip(folders, executor.map(self.dir_size, folders)))
+        self.save()
+        return sizes
@@ -0,0 +1,52 @@
+# standard library
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, Any
+
+
+class Enricher:
+
+    def __init__(self, fetch: Callable[[int], Any], workers: int = 4) -> None:
+        """
+        Concurrent enrichment engine that runs `fetch` for many app ID's on a
+        pool of `workers` threads.
+
+        Results are yielded back to the calling thread so spreadsheet writes
+        never happen inside a worker.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.fetch = fetch
+        self.workers = workers
+
+    def __repr__(self):
+        return f"Enricher(fetch={self.fetch.__name__}, workers={self.workers})"
+
+    def run(self, app_ids: Iterable[int]) -> Iterator[tuple[int, Any, Exception | None]]:
+        """
+        Yields `(app_id, result, error)` for each app ID in completion order.
+
+        Only a small window of app ID's is queued ahead of the workers so
+        stopping early does not leave thousands of pending requests behind.
+        """
+        app_ids = iter(app_ids)
+        max_pending = self.workers * 2
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = {}
+        try:
+            for app_id in app_ids:
+                pending[executor.submit(self.fetch, app_id)] = app_id
+                if len(pending) >= max_pending:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    app_id = pending.pop(future)
+                    # refills the queue before handing the result back
+                    next_app_id = next(app_ids, None)
+                    if next_app_id is not None:
+                        pending[executor.submit(self.fetch, next_app_id)] = next_app_id
+                    error = future.exception()
+                    result = None if error else future.result()
+                    yield app_id, result, error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
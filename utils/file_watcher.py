@@ -0,0 +1,169 @@
+# standard library
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable
+import ctypes, ctypes.util, os, struct, sys
+
+# local imports
+from utils.utils import file_stamp
+
+
+class Inotify:
+    # IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE and IN_DELETE
+    MASK = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        """
+        Non-blocking inotify instance reporting the files with events in the
+        watched directories.
+
+        Raises OSError when inotify is not available.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Path] = {}
+
+    def __repr__(self):
+        return f"Inotify(watches={len(self.watches)})"
+
+    def add_watch(self, directory: Path) -> None:
+        """
+        Watches the files within `directory`.
+        """
+        path = os.fsencode(directory)
+        watch = self.libc.inotify_add_watch(self.fd, path, self.MASK)
+        if watch < 0:
+            raise OSError(ctypes.get_errno(), f"Failed to watch {directory}")
+        self.watches[watch] = Path(directory)
+
+    def read(self) -> set[Path]:
+        """
+        Gets the files with events since the last read without blocking.
+        """
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                watch, _, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                directory = self.watches.get(watch)
+                if directory is not None and name:
+                    paths.add(directory / os.fsdecode(name))
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+
+    def __init__(
+        self,
+        files: Iterable[str | Path] = (),
+        patterns: Iterable[tuple[str | Path, str]] = (),
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Reports which of the watched `files` and the files matching each
+        `(directory, glob)` in `patterns` changed since the last check.
+
+        Uses inotify on Linux so nothing is checked until a watched directory
+        had events and falls back to comparing the size and modified time of
+        every file otherwise.
+        """
+        self.files = {Path(file) for file in files}
+        self.patterns: set[tuple[Path, str]] = set()
+        self.stamps: dict[Path, str] | None = None
+        self.inotify: Inotify | None = None
+        # missing directories can't be watched so they are polled instead
+        self.unwatched = False
+        self.rescan = False
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except OSError:
+                self.inotify = None
+        for file in self.files:
+            self.watch_directory(file.parent)
+        for directory, pattern in patterns:
+            self.add_pattern(directory, pattern)
+
+    def __repr__(self):
+        backend = "inotify" if self.inotify else "polling"
+        total = len(self.files) + len(self.patterns)
+        return f"FileWatcher(watched={total}, backend={backend})"
+
+    def watch_directory(self, directory: Path) -> None:
+        if not self.inotify:
+            return
+        if directory in self.inotify.watches.values():
+            return
+        try:
+            self.inotify.add_watch(directory)
+        except OSError:
+            self.unwatched = True
+
+    def add_pattern(self, directory: str | Path, pattern: str) -> None:
+        """
+        Watches the files in `directory` matching `pattern`.
+        """
+        directory = Path(directory)
+        if (directory, pattern) in self.patterns:
+            return
+        self.patterns.add((directory, pattern))
+        self.watch_directory(directory)
+        # files matching a new pattern are reported on the next check
+        self.rescan = self.stamps is not None
+
+    def scan(self) -> dict[Path, str]:
+        """
+        Gets the stamp of every watched file that exists.
+        """
+        paths = {file for file in self.files if file.exists()}
+        for directory, pattern in self.patterns:
+            if directory.is_dir():
+                paths.update(directory.glob(pattern))
+        stamps = {}
+        for path in paths:
+            try:
+                stamps[path] = file_stamp(path)
+            except OSError:
+                continue
+        return stamps
+
+    def changes(self) -> tuple[set[Path], set[Path]]:
+        """
+        Gets the files that were added or changed and the files that were
+        removed since the last check.
+
+        Every existing file counts as changed on the first check.
+        """
+        events = self.inotify.read() if self.inotify else set()
+        watched = self.inotify and not self.unwatched
+        if watched and self.stamps is not None and not self.rescan and not events:
+            return set(), set()
+        self.rescan = False
+        stamps = self.scan()
+        previous = self.stamps or {}
+        changed = {
+            path for path, stamp in stamps.items() if previous.get(path) != stamp
+        }
+        removed = set(previous) - set(stamps)
+        self.stamps = stamps
+        return changed, removed
+
+    def close(self) -> None:
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None
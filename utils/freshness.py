@@ -0,0 +1,75 @@
+# standard library
+from pathlib import Path
+from typing import Iterable
+import time
+
+# local imports
+from utils.json_cache import JsonCache
+
+
+class FieldFreshness(JsonCache):
+    # days each column stays fresh after it was last fetched
+    DEFAULT_TTL_DAYS = {
+        "Price": 1,
+        "Discount": 1,
+        "Player Count": 1,
+        "Steam Review Percent": 7,
+        "Steam Review Total": 7,
+        "User Tags": 30,
+        "Early Access": 30,
+        "Time To Beat in Hours": 90,
+        "Developers": 180,
+        "Publishers": 180,
+        "Genre": 180,
+        "Release Year": 180,
+        "Store Link": 365,
+    }
+
+    def __init__(
+        self,
+        path: str | Path = "configs/field_timestamps.json",
+        ttl_days: dict[str, float] | None = None,
+    ) -> None:
+        """
+        Per column freshness policy with the last fetched timestamp of each
+        column for each app.
+
+        `ttl_days` is merged over `DEFAULT_TTL_DAYS`. Columns without a TTL are
+        always due.
+        """
+        super().__init__(path)
+        self.ttl_days = {**self.DEFAULT_TTL_DAYS, **(ttl_days or {})}
+
+    def is_due(self, app_id: int, column: str, now: float | None = None) -> bool:
+        """
+        Checks if `column` of `app_id` needs to be fetched again.
+        """
+        ttl_days = self.ttl_days.get(column)
+        if ttl_days is None:
+            return True
+        last_fetched = self.load().get(str(app_id), {}).get(column)
+        if last_fetched is None:
+            return True
+        now = now or time.time()
+        return now - last_fetched >= ttl_days * 24 * 60 * 60
+
+    def due_fields(self, app_id: int, columns: Iterable[str]) -> set[str]:
+        """
+        Gets the `columns` of `app_id` that need to be fetched again.
+        """
+        now = time.time()
+        return {column for column in columns if self.is_due(app_id, column, now)}
+
+    def mark_fetched(
+        self, app_id: int, columns: Iterable[str], when: float | None = None
+    ) -> None:
+        """
+        Records that `columns` of `app_id` were fetched at `when` or now.
+        """
+        timestamps = self.load()
+        when = when or time.time()
+        with self.lock:
+            app_timestamps = timestamps.setdefault(str(app_id), {})
+            for column in columns:
+                app_timestamps[column] = when
+            self.changed = True
@@ -1,14 +1,12 @@
 # standard library
 from dataclasses import dataclass, field, fields
+from typing import Iterable
 import time
 
-# third-party imports
-import requests
-from howlongtobeatpy import HowLongToBeat
-
 # local imports
 from utils.utils import *
 from utils.steam import Steam
+from utils.rate_limiter import rate_limiter
 
 
 @dataclass()
@@ -28,6 +26,8 @@ class Game(Steam):
     genre: list = field(default_factory=list)
     user_tags: list = field(default_factory=list)
     categories: list = field(default_factory=list)
+    # sources that responded, including ones that had no data for the game
+    fetched_sources: set = field(default_factory=set)
     # no init
     on_sale: bool = field(init=False)
     early_access: str = field(init=False)
@@ -71,6 +71,8 @@ class Game(Steam):
 
 
 class GetGameInfo(Steam):
+    # data that needs its own request on top of the app details
+    EXTRA_SOURCES = frozenset({"review", "user_tags", "time_to_beat", "player_count"})
 
     def parse_release_date(self, app_details: dict) -> int:
         release_date = app_details.get("release_date", {}).get("date", {})
@@ -93,12 +95,16 @@ class GetGameInfo(Steam):
         discount = float(price_data.get("discount_percent", 0.0))
         return final_price, discount
 
-    def get_time_to_beat(self, game_name: str) -> float | str:
+    def get_time_to_beat(self, game_name: str) -> float | str | None:
         """
         Uses howlongtobeatpy to get the time to beat for entered game.
+
+        Returns "-" if no match was found and None if the search failed.
         """
+        from howlongtobeatpy import HowLongToBeat
+
         beat = HowLongToBeat()
-        api_sleeper("time_to_beat")
+        rate_limiter.wait("time_to_beat")
         try:
             results = beat.search(game_name)
         except:  # pragma: no cover
@@ -109,9 +115,10 @@ class GetGameInfo(Steam):
                     break
                 except:
                     time.sleep(10)
-            return "-"
+            # None marks the failed search so it is not mistaken for no match
+            return None
         if not results:  # pragma: no cover
-            api_sleeper("time_to_beat")
+            rate_limiter.wait("time_to_beat")
             results = beat.search(game_name, similarity_case_sensitive=False)
         time_to_beat = "-"
         if results and len(results) > 0:
@@ -126,15 +133,26 @@ class GetGameInfo(Steam):
         """
         url = "https://store.steampowered.com/api/appdetails"
         params = {"appids": app_id, "l": "english"}
-        api_sleeper("steam_app_details")
-        response = requests.get(url, params=params)
+        rate_limiter.wait("steam_app_details")
+        response = self.http.get(url, params=params)
         if response.ok:
             return response.json().get(str(app_id), {}).get("data", {})
         return {}
 
-    def get_game_info(self, app_details: dict, steam_key: str) -> Game:
+    def get_game_info(
+        self,
+        app_details: dict,
+        steam_key: str,
+        sources: Iterable[str] | None = None,
+    ) -> Game:
         """
         Creates a Game object with `app_id`, `game_name` and data from `app_details`.
+
+        `sources` limits which of the `EXTRA_SOURCES` that need their own
+        requests are fetched. All of them are fetched by default.
+
+        `fetched_sources` of the Game holds "app_details" and each extra
+        source that responded, even if it had no data for the game.
         """
         if not app_details or not steam_key:
             return Game()
@@ -146,17 +164,36 @@ class GetGameInfo(Steam):
         release_year = self.parse_release_date(app_details)
         price, discount = self.get_price(app_details)
         categories = [desc["description"] for desc in app_details.get("categories", [])]
+        sources = self.EXTRA_SOURCES if sources is None else set(sources)
+        fetched_sources = {"app_details"}
         # review
-        review_dict = self.get_steam_review(app_id=app_id)
-        steam_review_percent = review_dict["percent"]
-        steam_review_total = review_dict["total"]
+        steam_review_percent, steam_review_total = None, None
+        if "review" in sources:
+            review_dict = self.get_steam_review(app_id=app_id)
+            if review_dict is not None:
+                fetched_sources.add("review")
+                steam_review_percent = review_dict["percent"]
+                steam_review_total = review_dict["total"]
         # user tags
-        user_tags = self.get_steam_user_tags(app_id=app_id)
+        user_tags = []
+        if "user_tags" in sources:
+            user_tags = self.get_steam_user_tags(app_id=app_id)
+            if user_tags is not None:
+                fetched_sources.add("user_tags")
+            user_tags = user_tags or []
         # time to beat
-        game_name_no_unicode = unicode_remover(game_name)
-        ttb = self.get_time_to_beat(game_name_no_unicode)
+        ttb = None
+        if "time_to_beat" in sources:
+            game_name_no_unicode = unicode_remover(game_name)
+            ttb = self.get_time_to_beat(game_name_no_unicode)
+            if ttb is not None:
+                fetched_sources.add("time_to_beat")
         # player count
-        player_count = self.get_player_count(app_id, steam_key) if steam_key else None
+        player_count = None
+        if "player_count" in sources and steam_key:
+            player_count = self.get_player_count(app_id, steam_key)
+            if player_count is not None:
+                fetched_sources.add("player_count")
 
         return Game(
             app_id=app_id,
@@ -173,4 +210,5 @@ class GetGameInfo(Steam):
             price=price,
             discount=discount,
             categories=categories,
+            fetched_sources=fetched_sources,
         )
@@ -1,3 +1,4 @@
+from typing import Iterable
 import re
 
 from utils.utils import *
@@ -48,9 +49,44 @@ class GameSkipper:
     ) -> None:
         """
         Game Skipping class that determines if a game should be skipped based on the games name or app ID.
+
+        The name, app ID and keyword matchers are built once here so each
+        check is a set lookup and a single regex search.
         """
         self.name_ignore_list = custom_names_to_ignore + self.MEDIA_LIST
         self.app_id_ignore_list = app_id_ignore_list
+        keywords = sorted({keyword.lower() for keyword in self.KEYWORD_IGNORE_LIST})
+        alternation = "|".join(re.escape(keyword) for keyword in keywords)
+        self.keyword_pattern = re.compile(rf"\b(?:{alternation})\b")
+
+    @staticmethod
+    def normalize_name(game_name: str) -> str:
+        """
+        Normalizes `game_name` for name ignore list checks.
+        """
+        return unicode_remover(game_name).lower()
+
+    @property
+    def name_ignore_list(self) -> list[str]:
+        return self._name_ignore_list
+
+    @name_ignore_list.setter
+    def name_ignore_list(self, names: list[str]) -> None:
+        self._name_ignore_list = list(names)
+        self.ignored_names = frozenset(
+            self.normalize_name(name) for name in names if name
+        )
+
+    @property
+    def app_id_ignore_list(self) -> list[int]:
+        return self._app_id_ignore_list
+
+    @app_id_ignore_list.setter
+    def app_id_ignore_list(self, app_ids: list[int]) -> None:
+        self._app_id_ignore_list = list(app_ids)
+        self.ignored_app_ids = frozenset(
+            int(app_id) for app_id in app_ids if str(app_id).isdigit()
+        )
 
     def skip_game(self, game_name: str = None, app_id: int = None) -> bool:
         """
@@ -67,16 +103,26 @@ class GameSkipper:
         if not any([game_name, app_id]):
             raise ValueError("No game_name or app_id was given")
         # ignore by app id
-        if app_id and int(app_id) in self.app_id_ignore_list:
+        if app_id and int(app_id) in self.ignored_app_ids:
             return True
         # ignore by name
         if game_name:
             # checks if name means it should be skipped
-            cleaned_name = unicode_remover(game_name).lower()
-            if cleaned_name and cleaned_name in map(str.lower, self.name_ignore_list):
+            if self.normalize_name(game_name) in self.ignored_names:
                 return True
             # keyword check
-            for keyword in self.KEYWORD_IGNORE_LIST:
-                if re.search(rf"\b{keyword}\b", game_name.lower()):
-                    return True
+            if self.keyword_pattern.search(game_name.lower()):
+                return True
         return False
+
+    def skip_games(self, games: Iterable[tuple[str, int]]) -> set[int]:
+        """
+        Checks many `(game_name, app_id)` pairs at once.
+
+        Returns the app ID's of the games that should be skipped.
+        """
+        return {
+            app_id
+            for game_name, app_id in games
+            if self.skip_game(game_name, app_id)
+        }
@@ -0,0 +1,109 @@
+# standard library
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+import threading
+
+# third-party imports
+from requests.adapters import HTTPAdapter
+import requests
+
+
+class HttpClient:
+    DEFAULT_HEADERS = {
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+    # max requests in flight at once for each host
+    DEFAULT_HOST_LIMITS = {
+        "store.steampowered.com": 2,
+        "api.steampowered.com": 4,
+    }
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = (5, 30),
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        headers: dict | None = None,
+        host_limits: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Pooled HTTP client that keeps one keep-alive `requests.Session` per host.
+
+        `timeout` is used for every request that does not set its own.
+
+        `pool_connections` and `pool_maxsize` size the connection pool of each
+        host session.
+
+        `host_limits` caps how many requests can be in flight at once for a
+        host when the client is shared between threads.
+        """
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.headers = {**self.DEFAULT_HEADERS, **(headers or {})}
+        self.sessions: dict[str, requests.Session] = {}
+        self.host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self.lock = threading.Lock()
+        self.set_host_limits({**self.DEFAULT_HOST_LIMITS, **(host_limits or {})})
+
+    def __repr__(self):
+        hosts = ", ".join(self.sessions.keys())
+        return f"HttpClient(timeout={self.timeout!r}, hosts=[{hosts}])"
+
+    def create_session(self) -> requests.Session:
+        """
+        Creates a session with sized connection pools and the default headers.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        Gets the session for the host of `url`, creating it if needed.
+        """
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.sessions:
+                self.sessions[host] = self.create_session()
+            return self.sessions[host]
+
+    def set_host_limits(self, host_limits: dict[str, int]) -> None:
+        """
+        Sets the max number of requests in flight at once for each host.
+        """
+        with self.lock:
+            for host, limit in host_limits.items():
+                self.host_semaphores[host] = threading.BoundedSemaphore(limit)
+
+    def host_limit(self, url: str):
+        """
+        Gets the concurrency limit for the host of `url` as a context manager.
+        """
+        host = urlsplit(url).netloc
+        return self.host_semaphores.get(host) or nullcontext()
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> requests.Response:
+        """
+        Sends a GET request to `url` through the session for its host.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.get_session(url)
+        with self.host_limit(url):
+            return session.get(url, params=params, **kwargs)
+
+    def close(self) -> None:
+        """
+        Closes all host sessions and their pooled connections.
+        """
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
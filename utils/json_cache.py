@@ -0,0 +1,68 @@
+# standard library
+from pathlib import Path
+from typing import Any
+import json, os, threading
+
+
+class JsonCache:
+    # indent of the saved file, None keeps it compact
+    INDENT: int | None = 4
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Entries kept in a JSON file that is loaded the first time they are
+        needed. A missing or corrupt file loads as no entries.
+
+        Subclasses convert between the saved JSON and their entries with
+        `decode` and `encode` and set `changed` when entries need saving.
+        """
+        self.path = Path(path)
+        self.entries: dict | None = None
+        self.changed = False
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(path={str(self.path)!r})"
+
+    def decode(self, data: Any) -> dict:
+        """
+        Converts the saved JSON `data` into entries.
+        """
+        return dict(data)
+
+    def encode(self, entries: dict) -> Any:
+        """
+        Converts `entries` into data that can be saved as JSON.
+        """
+        return entries
+
+    def load(self) -> dict:
+        """
+        Loads the saved entries the first time they are needed.
+        """
+        with self.lock:
+            if self.entries is None:
+                self.entries = {}
+                if self.path.exists():
+                    try:
+                        with open(self.path) as file:
+                            self.entries = self.decode(json.load(file))
+                    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+                        self.entries = {}
+            return self.entries
+
+    def save(self) -> None:
+        """
+        Saves the entries if any changed.
+        """
+        if not self.changed:
+            return
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = self.encode(self.entries)
+            # written to a temporary file first so a failed save keeps the old file
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w") as file:
+                json.dump(data, file, indent=self.INDENT)
+            os.replace(temp_path, self.path)
+            self.changed = False
@@ -0,0 +1,521 @@
+# standard library
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+import datetime as dt
+import json, sqlite3, threading
+
+# third-party imports
+if TYPE_CHECKING:
+    import pandas as pd
+
+# local imports
+from utils.utils import file_stamp
+
+
+def quote(column: str) -> str:
+    """
+    Quotes a column name so it can be used as an SQLite identifier.
+    """
+    return '"' + column.replace('"', '""') + '"'
+
+
+class LibraryStore:
+    TABLE = "games"
+
+    def __init__(
+        self,
+        path: str | Path,
+        columns: list[str],
+        key_column: str,
+        indexed_columns: Iterable[str] = (),
+        date_columns: Iterable[str] = (),
+    ) -> None:
+        """
+        SQLite backed library store with the same row and cell API as an
+        `easierexcel.Sheet` so it can be used in its place.
+
+        Rows are keyed by the string value of `key_column` like the sheet's
+        `row_idx`. Writes stay in an open transaction until `commit` so the
+        store and the workbook are saved together.
+
+        `date_columns` are stored as ISO strings and read back as datetimes.
+        """
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.column_name = key_column
+        self.indexed_columns = list(indexed_columns)
+        self.date_columns = set(date_columns)
+        self.lock = threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.create_tables()
+        self.row_idx = self.get_row_index()
+        # changed columns of each row that need to be written to the workbook,
+        # None means the whole row
+        self.dirty_rows: dict[str, set[str] | None] = {}
+        self.deleted_keys: set[str] = set()
+        # new row key -> row key in the workbook for rows whose key was changed
+        self.renamed_keys: dict[str, str] = {}
+        # total changes made, which saves do not reset unlike `dirty_rows`
+        self.change_count = 0
+        self.load_pending_export()
+
+    def __repr__(self):
+        return f"LibraryStore(path={str(self.path)!r}, rows={len(self.row_idx)})"
+
+    @property
+    def changes_made(self) -> bool:
+        return bool(self.dirty_rows or self.deleted_keys)
+
+    def create_tables(self) -> None:
+        """
+        Creates the games table and its indexes, adding any new columns to an
+        existing table.
+        """
+        with self.lock:
+            column_defs = ", ".join(quote(column) for column in self.columns)
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} "
+                f"(row_key TEXT PRIMARY KEY, {column_defs})"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)"
+            )
+            cursor = self.connection.execute(f"PRAGMA table_info({self.TABLE})")
+            existing_columns = {row[1] for row in cursor}
+            for column in self.columns:
+                if column not in existing_columns:
+                    self.connection.execute(
+                        f"ALTER TABLE {self.TABLE} ADD COLUMN {quote(column)}"
+                    )
+            for column in self.indexed_columns:
+                index_name = quote(f"idx_{self.TABLE}_{column}")
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {self.TABLE} ({quote(column)})"
+                )
+            self.connection.commit()
+
+    def get_row_index(self) -> dict[str, int]:
+        """
+        Creates the row index of row keys in insertion order.
+        """
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT row_key, rowid FROM {self.TABLE} ORDER BY rowid"
+            )
+            return {row_key: rowid for row_key, rowid in cursor}
+
+    def encode_value(self, value):
+        """
+        Converts `value` into a type SQLite can store.
+        """
+        if value == "":
+            return None
+        if isinstance(value, (dt.datetime, dt.date)):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, float, str, bytes)):
+            return value
+        return str(value)
+
+    def decode_value(self, column: str, value):
+        """
+        Converts a stored `value` of `column` back to its original type.
+        """
+        if column in self.date_columns and isinstance(value, str):
+            try:
+                return dt.datetime.fromisoformat(value)
+            except ValueError:
+                return value
+        return value
+
+    def decode_row(self, values: Iterable) -> dict:
+        return {
+            column: self.decode_value(column, value)
+            for column, value in zip(self.columns, values)
+        }
+
+    def get_row(self, row_value: str | int) -> dict:
+        """
+        Gets the row for `row_value` with every column set to None if it does
+        not exist.
+        """
+        columns = ", ".join(quote(column) for column in self.columns)
+        with self.lock:
+            values = self.connection.execute(
+                f"SELECT {columns} FROM {self.TABLE} WHERE row_key = ?",
+                (str(row_value),),
+            ).fetchone()
+        if values is None:
+            return {column: None for column in self.columns}
+        return self.decode_row(values)
+
+    def get_cell(self, row_value: str | int, column_value: str):
+        """
+        Gets the value of `column_value` for `row_value`.
+
+        Hyperlink formulas return their target like the sheet does.
+        """
+        if column_value not in self.columns:
+            return None
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {quote(column_value)} FROM {self.TABLE} WHERE row_key = ?",
+                (str(row_value),),
+            ).fetchone()
+        if row is None:
+            return None
+        value = row[0]
+        if isinstance(value, str) and value.startswith("=HYPERLINK"):
+            return value.split('"')[1]
+        return self.decode_value(column_value, value)
+
+    def mark_dirty(self, row_key: str, columns: Iterable[str] | None = None) -> None:
+        """
+        Marks `columns` of `row_key` as needing to be written to the workbook.
+        """
+        self.change_count += 1
+        if columns is None:
+            self.dirty_rows[row_key] = None
+        elif row_key not in self.dirty_rows:
+            self.dirty_rows[row_key] = set(columns)
+        elif self.dirty_rows[row_key] is not None:
+            self.dirty_rows[row_key].update(columns)
+
+    def update_row(
+        self,
+        row_val: str | int,
+        values: dict,
+        replace: bool = True,
+    ) -> set[str]:
+        """
+        Updates every column in `values` for `row_val` with one read and one
+        write and returns the columns that changed.
+
+        `replace` allows you to determine if cells will have their
+        existing value changed if it is not None.
+        """
+        row_key = str(row_val)
+        columns = [column for column in values if column in self.columns]
+        if row_key not in self.row_idx or not columns:
+            return set()
+        with self.lock:
+            select = ", ".join(quote(column) for column in columns)
+            cur_values = self.connection.execute(
+                f"SELECT {select} FROM {self.TABLE} WHERE row_key = ?",
+                (row_key,),
+            ).fetchone()
+            changes = {}
+            for column, cur_val in zip(columns, cur_values):
+                new_val = self.encode_value(values[column])
+                if not replace and cur_val:
+                    continue
+                if cur_val != new_val:
+                    changes[column] = new_val
+            if not changes:
+                return set()
+            assignments = ", ".join(f"{quote(column)} = ?" for column in changes)
+            self.connection.execute(
+                f"UPDATE {self.TABLE} SET {assignments} WHERE row_key = ?",
+                (*changes.values(), row_key),
+            )
+            if self.column_name in changes:
+                row_key = self.rekey_row(row_key, changes[self.column_name])
+            self.mark_dirty(row_key, changes.keys())
+        return set(changes)
+
+    def rekey_row(self, row_key: str, key_value) -> str:
+        """
+        Moves `row_key` to the key for its new `key_value` and returns the key
+        the row ends up with.
+
+        The row keeps its key if the new one is empty or used by another row.
+        """
+        if key_value is None or str(key_value) in self.row_idx:
+            return row_key
+        new_key = str(key_value)
+        self.connection.execute(
+            f"UPDATE {self.TABLE} SET row_key = ? WHERE row_key = ?",
+            (new_key, row_key),
+        )
+        self.row_idx[new_key] = self.row_idx.pop(row_key)
+        if row_key in self.dirty_rows:
+            self.dirty_rows[new_key] = self.dirty_rows.pop(row_key)
+        self.renamed_keys[new_key] = self.renamed_keys.pop(row_key, row_key)
+        return new_key
+
+    def update_cell(
+        self,
+        row_val: str | int,
+        col_val: str,
+        new_val,
+        replace: bool = True,
+    ) -> bool:
+        """
+        Updates the value of `col_val` for `row_val` to `new_val`.
+
+        Returns True if the cell was updated and False if it was not updated.
+
+        `replace` allows you to determine if a cell will have its
+        existing value changed if it is not None.
+        """
+        return bool(self.update_row(row_val, {col_val: new_val}, replace))
+
+    def add_new_line(self, cell_dict: dict) -> bool:
+        """
+        Adds `cell_dict` as a new row. The key column must be given a value.
+        """
+        key_value = cell_dict.get(self.column_name)
+        if not key_value:
+            msg = "No Column given matches then sheets column key"
+            raise ValueError(msg)
+        row_key = str(key_value)
+        columns = [column for column in self.columns if column in cell_dict]
+        values = [self.encode_value(cell_dict[column]) for column in columns]
+        column_names = ", ".join(["row_key"] + [quote(column) for column in columns])
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        with self.lock:
+            cursor = self.connection.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} ({column_names}) "
+                f"VALUES ({placeholders})",
+                [row_key, *values],
+            )
+            self.row_idx[row_key] = cursor.lastrowid
+            self.mark_dirty(row_key)
+            self.deleted_keys.discard(row_key)
+        return True
+
+    def delete_row(self, col_val: str | int):
+        """
+        Deletes the row for `col_val`.
+        """
+        row_key = str(col_val)
+        if row_key not in self.row_idx:
+            return None
+        with self.lock:
+            self.connection.execute(
+                f"DELETE FROM {self.TABLE} WHERE row_key = ?", (row_key,)
+            )
+            self.row_idx.pop(row_key)
+            self.dirty_rows.pop(row_key, None)
+            self.change_count += 1
+            self.deleted_keys.add(self.renamed_keys.pop(row_key, row_key))
+        return True
+
+    def find_rows(self, column: str, value) -> list[dict]:
+        """
+        Gets every row where `column` equals `value` using its index if it has one.
+        """
+        columns = ", ".join(quote(column) for column in self.columns)
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT {columns} FROM {self.TABLE} WHERE {quote(column)} = ? "
+                "ORDER BY rowid",
+                (self.encode_value(value),),
+            )
+            return [self.decode_row(values) for values in cursor]
+
+    def create_dataframe(
+        self, date_cols: list = None, na_vals: list = None
+    ) -> pd.DataFrame:
+        """
+        Creates a panda dataframe of every row.
+
+        `date_cols` sets the columns with dates.
+
+        `na_vals` sets what should be considered N/A values that are ignored.
+        """
+        import pandas as pd
+
+        columns = ", ".join(quote(column) for column in self.columns)
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT {columns} FROM {self.TABLE} ORDER BY rowid"
+            )
+            rows = [self.decode_row(values) for values in cursor]
+        df = pd.DataFrame.from_records(rows, columns=self.columns)
+        if na_vals:
+            df = df.replace(na_vals, float("nan"))
+        df = df.infer_objects()
+        for column in date_cols or []:
+            df[column] = pd.to_datetime(df[column])
+        return df
+
+    def get_meta(self, name: str):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value) -> None:
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                (name, value),
+            )
+
+    def get_source_stamp(self) -> str | None:
+        return self.get_meta("source_stamp")
+
+    def load_pending_export(self) -> None:
+        """
+        Loads the changes that were committed but not exported to the workbook
+        yet, such as writes committed by a background save.
+        """
+        pending = self.get_meta("pending_export")
+        if not pending:
+            return
+        pending = json.loads(pending)
+        self.dirty_rows = {
+            row_key: None if columns is None else set(columns)
+            for row_key, columns in pending["dirty_rows"].items()
+        }
+        self.deleted_keys = set(pending["deleted_keys"])
+        self.renamed_keys = pending["renamed_keys"]
+
+    def save_pending_export(self) -> None:
+        pending = {
+            "dirty_rows": {
+                row_key: None if columns is None else sorted(columns)
+                for row_key, columns in self.dirty_rows.items()
+            },
+            "deleted_keys": sorted(self.deleted_keys),
+            "renamed_keys": self.renamed_keys,
+        }
+        self.set_meta("pending_export", json.dumps(pending))
+
+    def needs_import(self, source_path: str | Path) -> bool:
+        """
+        Checks if the workbook at `source_path` was changed since it was last
+        imported or saved.
+        """
+        source_path = Path(source_path)
+        if not source_path.exists():
+            return False
+        return self.get_source_stamp() != file_stamp(source_path)
+
+    def commit(self, source_path: str | Path = None) -> None:
+        """
+        Commits pending writes and records the size and modified time of the
+        workbook at `source_path` if given.
+
+        Rows that still need to be exported are committed with them so they
+        are exported on the next save even after a restart.
+        """
+        with self.lock:
+            if source_path and Path(source_path).exists():
+                self.set_meta("source_stamp", file_stamp(source_path))
+            self.save_pending_export()
+            self.connection.commit()
+
+    def rollback(self) -> None:
+        """
+        Discards uncommitted writes.
+        """
+        with self.lock:
+            self.connection.rollback()
+            self.row_idx = self.get_row_index()
+            self.dirty_rows.clear()
+            self.deleted_keys.clear()
+            self.renamed_keys.clear()
+            self.load_pending_export()
+
+    def get_stored_rows(self, row_keys: Iterable[str]) -> dict[str, list]:
+        """
+        Gets the stored values of each row in `row_keys` without decoding them.
+        """
+        columns = ", ".join(quote(column) for column in self.columns)
+        rows = {}
+        with self.lock:
+            for row_key in row_keys:
+                values = self.connection.execute(
+                    f"SELECT {columns} FROM {self.TABLE} WHERE row_key = ?",
+                    (row_key,),
+                ).fetchone()
+                if values is not None:
+                    rows[row_key] = list(values)
+        return rows
+
+    def import_sheet(self, sheet, source_path: str | Path = None) -> int:
+        """
+        Replaces every row with the rows of `sheet` and returns the amount
+        imported.
+
+        Used when the workbook was edited outside of the tracker. Changes that
+        were not exported to the workbook yet are kept over the sheet's values
+        and stay pending so the next save still writes them.
+        """
+        with self.lock:
+            pending_rows = self.get_stored_rows(self.dirty_rows)
+            # rows deleted or renamed in the store still have their old key in
+            # the sheet until they are exported
+            skipped_keys = self.deleted_keys | set(self.renamed_keys.values())
+            rows = []
+            for row_key in sheet.row_idx.keys():
+                row_key = str(row_key)
+                if row_key in skipped_keys and row_key not in pending_rows:
+                    continue
+                row = sheet.get_row(row_key)
+                values = [self.encode_value(row.get(column)) for column in self.columns]
+                stored_values = pending_rows.pop(row_key, None)
+                if stored_values is not None:
+                    columns = self.dirty_rows[row_key] or self.columns
+                    for index, column in enumerate(self.columns):
+                        if column in columns:
+                            values[index] = stored_values[index]
+                rows.append([row_key, *values])
+            # new and renamed rows are not in the sheet yet
+            for row_key, stored_values in pending_rows.items():
+                rows.append([row_key, *stored_values])
+            column_names = ", ".join(["row_key"] + [quote(c) for c in self.columns])
+            placeholders = ", ".join("?" * (len(self.columns) + 1))
+            self.connection.execute(f"DELETE FROM {self.TABLE}")
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.TABLE} ({column_names}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+            self.row_idx = self.get_row_index()
+            self.commit(source_path)
+        return len(rows)
+
+    def export_to_sheet(self, sheet) -> int:
+        """
+        Patches `sheet` with the rows changed since the last export and returns
+        the amount of rows written.
+
+        Only changed cells are written and each new or changed row is
+        formatted once.
+        """
+        with self.lock:
+            for row_key in self.deleted_keys:
+                sheet.delete_row(row_key)
+            dirty_rows = sorted(
+                self.dirty_rows.items(), key=lambda item: self.row_idx[item[0]]
+            )
+            for row_key, columns in dirty_rows:
+                row = self.get_row(row_key)
+                sheet_key = self.renamed_keys.get(row_key, row_key)
+                if sheet_key in sheet.row_idx:
+                    for column in columns or row.keys():
+                        if column in sheet.col_idx:
+                            sheet.update_cell(sheet_key, column, row[column])
+                else:
+                    sheet.add_new_line(row)
+                    sheet_key = row_key
+                sheet.format_row(sheet_key)
+            if self.renamed_keys:
+                sheet.row_idx = sheet.get_row_index(sheet.column_name)
+            self.dirty_rows.clear()
+            self.deleted_keys.clear()
+            self.renamed_keys.clear()
+        return len(dirty_rows)
+
+    def close(self) -> None:
+        """
+        Closes the connection, discarding uncommitted writes.
+        """
+        with self.lock:
+            self.connection.close()
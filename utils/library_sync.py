@@ -0,0 +1,125 @@
+# standard library
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+# local imports
+from utils.json_cache import JsonCache
+
+
+@dataclass()
+class SnapshotDiff:
+    added: set[int] = field(default_factory=set)
+    removed: set[int] = field(default_factory=set)
+    renamed: set[int] = field(default_factory=set)
+    played: set[int] = field(default_factory=set)
+    installed: set[int] = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.changed or self.removed)
+
+    @property
+    def changed(self) -> set[int]:
+        """
+        App ID's of owned games whose rows need to be added or updated.
+        """
+        return self.added | self.renamed | self.played | self.installed
+
+
+def reconcile_app_ids(
+    owned_app_ids: Iterable[int], sheet_app_ids: Iterable[int]
+) -> tuple[set[int], set[int], set[int]]:
+    """
+    Compares the owned games with the games in the sheet using sets.
+
+    Returns the app ID's to add, to update and that were removed.
+    """
+    owned_app_ids = set(owned_app_ids)
+    sheet_app_ids = set(sheet_app_ids)
+    added = owned_app_ids - sheet_app_ids
+    updated = owned_app_ids & sheet_app_ids
+    removed = sheet_app_ids - owned_app_ids
+    return added, updated, removed
+
+
+class OwnedGamesSnapshot(JsonCache):
+    # fields from the GetOwnedGames response that are compared between syncs
+    PLAYTIME_FIELDS = ("playtime_forever", "playtime_linux_forever")
+
+    def __init__(self, path: str | Path = "configs/owned_games_snapshot.json") -> None:
+        """
+        Local snapshot of the last `GetOwnedGames` response keyed by app ID so
+        each sync only touches games that changed.
+        """
+        super().__init__(path)
+
+    def decode(self, data: dict) -> dict[int, dict]:
+        return {int(app_id): entry for app_id, entry in data.items()}
+
+    def encode(self, entries: dict[int, dict]) -> dict:
+        return {str(app_id): entry for app_id, entry in entries.items()}
+
+    def create_entries(
+        self, owned_games: list[dict], installed_app_ids: set[int] = frozenset()
+    ) -> dict[int, dict]:
+        """
+        Creates snapshot entries from `owned_games` with the name, playtime
+        fields and installed state of each game.
+        """
+        entries = {}
+        for game in owned_games:
+            app_id = int(game["appid"])
+            entry = {"name": game.get("name")}
+            for playtime_field in self.PLAYTIME_FIELDS:
+                entry[playtime_field] = game.get(playtime_field, 0)
+            entry["installed"] = app_id in installed_app_ids
+            entries[app_id] = entry
+        return entries
+
+    def update(
+        self,
+        owned_games: list[dict],
+        installed_app_ids: set[int] = frozenset(),
+        keep: set[int] = frozenset(),
+    ) -> None:
+        """
+        Replaces the snapshot with `owned_games`.
+
+        The entries of the app ID's in `keep` are left as they were in the last
+        snapshot so they show up as changed again on the next diff.
+        """
+        previous = self.load()
+        entries = self.create_entries(owned_games, installed_app_ids)
+        for app_id in keep:
+            if app_id in previous:
+                entries[app_id] = previous[app_id]
+            else:
+                entries.pop(app_id, None)
+        with self.lock:
+            self.entries = entries
+            self.changed = True
+
+    def diff(
+        self, owned_games: list[dict], installed_app_ids: set[int] = frozenset()
+    ) -> SnapshotDiff:
+        """
+        Compares `owned_games` with the last snapshot.
+        """
+        previous = self.load()
+        current = self.create_entries(owned_games, installed_app_ids)
+        diff = SnapshotDiff()
+        diff.removed = previous.keys() - current.keys()
+        for app_id, entry in current.items():
+            old_entry = previous.get(app_id)
+            if old_entry is None:
+                diff.added.add(app_id)
+                continue
+            if old_entry.get("name") != entry["name"]:
+                diff.renamed.add(app_id)
+            for playtime_field in self.PLAYTIME_FIELDS:
+                if old_entry.get(playtime_field, 0) != entry[playtime_field]:
+                    diff.played.add(app_id)
+                    break
+            if old_entry.get("installed") != entry["installed"]:
+                diff.installed.add(app_id)
+        return diff
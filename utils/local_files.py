@@ -0,0 +1,303 @@
+# standard library
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+import os, threading
+
+# third-party imports
+import vdf
+
+# local imports
+from utils.file_watcher import FileWatcher
+from utils.utils import file_stamp
+from utils.vdf_stream import iter_local_config_apps, read_section
+
+
+class ParseCache:
+
+    def __init__(self) -> None:
+        """
+        Parsed files by path, reused until the size or modified time of the
+        file changes.
+        """
+        self.entries: dict[Path, tuple[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ParseCache(entries={len(self.entries)})"
+
+    def get(self, path: str | Path, parse: Callable[[Path], Any]) -> Any:
+        """
+        Gets `path` parsed by `parse`, only parsing it again if it changed.
+        """
+        path = Path(path)
+        stamp = file_stamp(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry[0] == stamp:
+                return entry[1]
+        data = parse(path)
+        with self.lock:
+            self.entries[path] = (stamp, data)
+        return data
+
+
+# shared so every caller reuses the same parsed local Steam files
+local_file_cache = ParseCache()
+MANIFEST_PATTERN = "appmanifest_*.acf"
+
+
+def load_vdf(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as file:
+        return vdf.load(file)
+
+
+def parse_library_folders(path: Path) -> dict:
+    """
+    Parses the library folder paths and installed app ID's from a
+    libraryfolders.vdf file.
+    """
+    data = load_vdf(path)
+    library_paths = []
+    app_ids = []
+    for library in data.get("libraryfolders", {}).values():
+        if "path" in library:
+            library_paths.append(library["path"])
+        app_ids.extend(int(app_id) for app_id in library.get("apps", {}).keys())
+    return {"paths": library_paths, "app_ids": app_ids}
+
+
+def parse_last_played(path: Path) -> dict[int, int]:
+    """
+    Parses the last played time of each app from a localconfig.vdf file,
+    skipping the rest of the file.
+    """
+    return {
+        app_id: last_played
+        for app_id, last_played, _ in iter_local_config_apps(path)
+        if last_played
+    }
+
+
+def manifest_app_id(path: Path) -> int | None:
+    """
+    Gets the app ID from an appmanifest_<app_id>.acf file name.
+    """
+    app_id = path.stem.removeprefix("appmanifest_")
+    return int(app_id) if app_id.isdigit() else None
+
+
+@dataclass()
+class InstalledApp:
+    app_id: int
+    name: str
+    install_dir: Path | None
+    size_on_disk: int
+    state_flags: int
+    last_updated: int
+
+    # StateFlags bit set once every file of the app is downloaded
+    FULLY_INSTALLED = 4
+
+    @property
+    def fully_installed(self) -> bool:
+        return bool(self.state_flags & self.FULLY_INSTALLED)
+
+
+def parse_app_manifest(path: Path) -> InstalledApp | None:
+    """
+    Parses an appmanifest_<app_id>.acf file.
+    """
+    keys = {"appid", "name", "installdir", "SizeOnDisk", "StateFlags", "LastUpdated"}
+    values = read_section(path, ("AppState",), keys)
+    app_id = values.get("appid") or str(manifest_app_id(path) or "")
+    if not app_id.isdigit():
+        return None
+    install_dir = values.get("installdir")
+
+    def number(key):
+        value = values.get(key, "")
+        return int(value) if value.isdigit() else 0
+
+    return InstalledApp(
+        app_id=int(app_id),
+        name=values.get("name", ""),
+        install_dir=path.parent / "common" / install_dir if install_dir else None,
+        size_on_disk=number("SizeOnDisk"),
+        state_flags=number("StateFlags"),
+        last_updated=number("LastUpdated"),
+    )
+
+
+def scan_library(library_path: str | Path) -> dict[int, InstalledApp]:
+    """
+    Reads every app manifest in the steamapps folder of `library_path`,
+    only parsing manifests that changed since they were last read.
+    """
+    steamapps = Path(library_path) / "steamapps"
+    installed_apps = {}
+    if not steamapps.is_dir():
+        return installed_apps
+    for path in steamapps.glob(MANIFEST_PATTERN):
+        try:
+            installed_app = local_file_cache.get(path, parse_app_manifest)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if installed_app:
+            installed_apps[installed_app.app_id] = installed_app
+    return installed_apps
+
+
+def drive_id(path: str | Path):
+    """
+    Gets the device `path` is stored on, or the path itself if it is missing.
+    """
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return str(path)
+
+
+def scan_libraries(library_paths: Iterable[str | Path]) -> dict[int, InstalledApp]:
+    """
+    Reads the app manifests of every library in `library_paths` with one
+    worker per drive so libraries on different drives are read at once.
+    """
+    drives: dict[Any, list] = {}
+    for library_path in library_paths:
+        drives.setdefault(drive_id(library_path), []).append(library_path)
+    if not drives:
+        return {}
+
+    def scan_drive(libraries):
+        installed_apps = {}
+        for library_path in libraries:
+            installed_apps.update(scan_library(library_path))
+        return installed_apps
+
+    installed_apps = {}
+    with ThreadPoolExecutor(max_workers=len(drives)) as executor:
+        for drive_apps in executor.map(scan_drive, drives.values()):
+            installed_apps.update(drive_apps)
+    return installed_apps
+
+
+def get_installed_apps(library_vdf_path: str | Path) -> dict[int, InstalledApp]:
+    """
+    Gets the apps installed in every library listed in libraryfolders.vdf
+    keyed by app ID.
+    """
+    library_folders = local_file_cache.get(library_vdf_path, parse_library_folders)
+    return scan_libraries(library_folders["paths"])
+
+
+def get_installed_app_ids(library_vdf_path: str | Path) -> list[int]:
+    """
+    Gets the app ID's of the fully installed apps in every library.
+
+    Falls back to the apps listed in libraryfolders.vdf when none of the
+    app manifests could be read, such as when a library drive is missing.
+    """
+    library_folders = local_file_cache.get(library_vdf_path, parse_library_folders)
+    installed_apps = scan_libraries(library_folders["paths"])
+    if not installed_apps:
+        return list(library_folders["app_ids"])
+    return [app.app_id for app in installed_apps.values() if app.fully_installed]
+
+
+@dataclass()
+class LocalChanges:
+    installed: set[int] = field(default_factory=set)
+    uninstalled: set[int] = field(default_factory=set)
+    last_played: dict[int, int] = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.installed or self.uninstalled or self.last_played)
+
+
+class LocalSteamFiles:
+
+    def __init__(
+        self,
+        library_vdf_path: str | Path,
+        local_config_path: str | Path,
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Watches libraryfolders.vdf, localconfig.vdf and the app manifests of
+        every library folder and reports the installed and last played changes
+        since the last check.
+
+        Only the files that changed are parsed again. App manifests are read
+        as they change so installs and uninstalls show up before Steam
+        rewrites libraryfolders.vdf.
+        """
+        self.library_vdf_path = Path(library_vdf_path)
+        self.local_config_path = Path(local_config_path)
+        self.watcher = FileWatcher(
+            [self.library_vdf_path, self.local_config_path], use_inotify=use_inotify
+        )
+        self.installed: set[int] = set()
+        self.last_played: dict[int, int] = {}
+
+    def __repr__(self):
+        return f"LocalSteamFiles(library_vdf_path={str(self.library_vdf_path)!r})"
+
+    def watch_libraries(self, library_paths: list[str]) -> None:
+        for library_path in library_paths:
+            steamapps = Path(library_path) / "steamapps"
+            self.watcher.add_pattern(steamapps, MANIFEST_PATTERN)
+
+    def read_last_played(self) -> dict[int, int]:
+        return local_file_cache.get(self.local_config_path, parse_last_played)
+
+    def poll(self) -> LocalChanges:
+        """
+        Gets the changes since the last poll. The first poll reports every
+        installed game and every game with a last played time.
+        """
+        changed, removed = self.watcher.changes()
+        changes = LocalChanges()
+        if not changed and not removed:
+            return changes
+        installed = set(self.installed)
+        if self.library_vdf_path in changed:
+            library_folders = local_file_cache.get(
+                self.library_vdf_path, parse_library_folders
+            )
+            installed = set(get_installed_app_ids(self.library_vdf_path))
+            self.watch_libraries(library_folders["paths"])
+        for path in changed:
+            if path.suffix != ".acf":
+                continue
+            try:
+                installed_app = local_file_cache.get(path, parse_app_manifest)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if not installed_app:
+                continue
+            # games that are still downloading are not installed yet
+            if installed_app.fully_installed:
+                installed.add(installed_app.app_id)
+            else:
+                installed.discard(installed_app.app_id)
+        for path in removed:
+            if path.suffix == ".acf" and manifest_app_id(path):
+                installed.discard(manifest_app_id(path))
+        changes.installed = installed - self.installed
+        changes.uninstalled = self.installed - installed
+        self.installed = installed
+        if self.local_config_path in changed:
+            last_played = self.read_last_played()
+            changes.last_played = {
+                app_id: played
+                for app_id, played in last_played.items()
+                if self.last_played.get(app_id) != played
+            }
+            self.last_played = last_played
+        return changes
+
+    def close(self) -> None:
+        self.watcher.close()
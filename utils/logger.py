@@ -11,8 +11,11 @@ class Logger:
         Creates a logging instance that allows you to log in a file
         named after `log_name`.
         """
-        log_formatter = lg.Formatter(self.base_format, datefmt=self.date_format)
         logger = lg.getLogger(name)
+        # loggers are shared so a second tracker must not add another handler
+        if logger.handlers:
+            return logger
+        log_formatter = lg.Formatter(self.base_format, datefmt=self.date_format)
         # Log Level
         logger.setLevel(log_level)
         my_handler = RotatingFileHandler(
@@ -0,0 +1,67 @@
+# standard library
+from pathlib import Path
+from typing import Iterable
+import time
+
+# local imports
+from utils.json_cache import JsonCache
+
+
+class PersonaCache(JsonCache):
+
+    def __init__(
+        self, path: str | Path = "configs/persona_names.json", ttl_days: float = 7
+    ) -> None:
+        """
+        Steam persona names by Steam ID with the time each was fetched.
+
+        Names older than `ttl_days` are fetched again since users can change
+        them at any time.
+        """
+        super().__init__(path)
+        self.ttl_days = ttl_days
+
+    def __repr__(self):
+        return f"PersonaCache(path={str(self.path)!r}, ttl_days={self.ttl_days})"
+
+    def decode(self, data: dict) -> dict[str, tuple[str, float]]:
+        return {steam_id: (name, fetched) for steam_id, (name, fetched) in data.items()}
+
+    def encode(self, entries: dict[str, tuple[str, float]]) -> dict:
+        return {steam_id: list(entry) for steam_id, entry in entries.items()}
+
+    def get(self, steam_id: str | int, now: float | None = None) -> str | None:
+        """
+        Gets the cached name of `steam_id` if it has not expired.
+        """
+        entry = self.load().get(str(steam_id))
+        if entry is None:
+            return None
+        name, fetched = entry
+        now = now or time.time()
+        if now - fetched >= self.ttl_days * 24 * 60 * 60:
+            return None
+        return name
+
+    def get_many(self, steam_ids: Iterable[str | int]) -> dict[str, str]:
+        """
+        Gets the cached names of each of `steam_ids` that has not expired.
+        """
+        now = time.time()
+        names = {}
+        for steam_id in steam_ids:
+            name = self.get(steam_id, now)
+            if name is not None:
+                names[str(steam_id)] = name
+        return names
+
+    def update(self, names: dict[str, str], when: float | None = None) -> None:
+        """
+        Caches each name in `names` as fetched at `when` or now.
+        """
+        entries = self.load()
+        when = when or time.time()
+        with self.lock:
+            for steam_id, name in names.items():
+                entries[str(steam_id)] = (name, when)
+            self.changed = True
@@ -0,0 +1,128 @@
+# standard library
+import asyncio, threading, time
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic) -> None:
+        """
+        Token bucket that allows `rate` calls per second with bursts of up to
+        `burst` calls.
+
+        Tokens are reserved under a lock so threads and asyncio tasks sharing
+        the bucket each wait only for their own deficit.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.last_refill = clock()
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"TokenBucket(rate={self.rate}, burst={self.burst})"
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Takes `tokens` from the bucket and returns the seconds the caller
+        still owes before it may proceed.
+        """
+        with self.lock:
+            now = self.clock()
+            elapsed = now - self.last_refill
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Blocks the current thread for exactly the time owed and returns it.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """
+        Suspends the current task for exactly the time owed and returns it.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    # calls per second and burst size for each named api
+    DEFAULT_LIMITS = {
+        "default": {"rate": 2, "burst": 1},
+        "steam_app_details": {"rate": 1, "burst": 4},
+        "steam_review_scrape": {"rate": 2, "burst": 4},
+        "steam_review_summary": {"rate": 4, "burst": 4},
+        "steam_owned_games": {"rate": 2, "burst": 1},
+        "steam_player_count": {"rate": 10, "burst": 10},
+        "time_to_beat": {"rate": 2, "burst": 2},
+    }
+
+    def __init__(self, limits: dict[str, dict] | None = None) -> None:
+        """
+        Named token buckets for each rate limited api.
+
+        `limits` maps api names to a dict with `rate` and `burst` and is merged
+        over `DEFAULT_LIMITS`. Unknown names use the `default` limit.
+        """
+        self.limits = {**self.DEFAULT_LIMITS}
+        self.buckets: dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+        self.configure(limits or {})
+
+    def __repr__(self):
+        names = ", ".join(self.buckets.keys())
+        return f"RateLimiter(buckets=[{names}])"
+
+    def configure(self, limits: dict[str, dict]) -> None:
+        """
+        Updates the limits using the `rate_limits` section of the config.
+
+        Buckets for changed limits are recreated on their next use.
+        """
+        with self.lock:
+            for name, limit in limits.items():
+                base_limit = self.limits.get(name, self.limits["default"])
+                self.limits[name] = {**base_limit, **limit}
+                self.buckets.pop(name, None)
+
+    def get_bucket(self, name: str) -> TokenBucket:
+        """
+        Gets the bucket for `name`, creating it from its limit if needed.
+        """
+        with self.lock:
+            if name not in self.buckets:
+                limit = self.limits.get(name, self.limits["default"])
+                self.buckets[name] = TokenBucket(limit["rate"], limit["burst"])
+            return self.buckets[name]
+
+    def wait(self, name: str) -> float:
+        """
+        Waits until a call to the `name` api is allowed.
+        """
+        return self.get_bucket(name).acquire()
+
+    async def wait_async(self, name: str) -> float:
+        """
+        Waits until a call to the `name` api is allowed without blocking
+        the event loop.
+        """
+        return await self.get_bucket(name).acquire_async()
+
+
+# shared by every module so each api has one bucket per process
+rate_limiter = RateLimiter()
@@ -0,0 +1,128 @@
+# standard library
+from dataclasses import dataclass
+from typing import Callable
+import threading, time
+
+
+@dataclass()
+class Job:
+    name: str
+    func: Callable[[], object]
+    interval: float
+    next_run: float
+    runs: int = 0
+    error: Exception | None = None
+
+
+class Scheduler:
+
+    def __init__(
+        self,
+        last_runs: dict[str, float] | None = None,
+        on_run: Callable[[str], None] | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+        clock=time.time,
+    ) -> None:
+        """
+        Runs named jobs every `interval` seconds, one at a time.
+
+        `last_runs` maps job names to the time they last finished and is
+        updated after each successful run so it can be saved, letting a job
+        resume its schedule after a restart. `on_run` is called after each
+        successful run and `on_error` with any error a job raised.
+        """
+        self.last_runs = last_runs if last_runs is not None else {}
+        self.on_run = on_run
+        self.on_error = on_error
+        self.clock = clock
+        self.jobs: dict[str, Job] = {}
+        self.stop_event = threading.Event()
+
+    def __repr__(self):
+        names = ", ".join(self.jobs.keys())
+        return f"Scheduler(jobs=[{names}])"
+
+    def add(self, name: str, func: Callable[[], object], interval: float) -> Job:
+        """
+        Schedules `func` to run every `interval` seconds.
+
+        Jobs that never ran or are overdue run on the next check.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        last_run = self.last_runs.get(name)
+        next_run = self.clock() if last_run is None else last_run + interval
+        job = Job(name, func, interval, next_run)
+        self.jobs[name] = job
+        return job
+
+    def due_jobs(self, now: float | None = None) -> list[Job]:
+        """
+        Gets the jobs that are due, oldest first.
+        """
+        now = self.clock() if now is None else now
+        due = [job for job in self.jobs.values() if job.next_run <= now]
+        return sorted(due, key=lambda job: job.next_run)
+
+    def run_job(self, job: Job) -> bool:
+        """
+        Runs `job` and schedules its next run. Returns True if it succeeded.
+
+        Failed jobs are retried on their next run instead of being removed.
+        """
+        try:
+            job.func()
+        except Exception as error:
+            job.error = error
+            job.next_run = self.clock() + job.interval
+            if self.on_error:
+                self.on_error(job.name, error)
+            return False
+        finished = self.clock()
+        job.runs += 1
+        job.error = None
+        job.next_run = finished + job.interval
+        self.last_runs[job.name] = finished
+        if self.on_run:
+            self.on_run(job.name)
+        return True
+
+    def run_pending(self) -> list[str]:
+        """
+        Runs all due jobs and returns the names of the ones that ran.
+        """
+        ran = []
+        for job in self.due_jobs():
+            if self.stop_event.is_set():
+                break
+            self.run_job(job)
+            ran.append(job.name)
+        return ran
+
+    def seconds_until_next(self) -> float:
+        """
+        Gets the seconds until the next job is due.
+        """
+        if not self.jobs:
+            return float("inf")
+        next_run = min(job.next_run for job in self.jobs.values())
+        return max(0.0, next_run - self.clock())
+
+    def run_forever(
+        self, max_wait: float = 60, idle: Callable[[], object] | None = None
+    ) -> None:
+        """
+        Runs due jobs until `stop` is called, waiting at most `max_wait`
+        seconds between checks. `idle` is called after each check.
+        """
+        while not self.stop_event.is_set():
+            self.run_pending()
+            if idle:
+                idle()
+            self.stop_event.wait(min(max_wait, self.seconds_until_next()))
+
+    def stop(self) -> None:
+        """
+        Stops `run_forever` after the job in progress finishes.
+        """
+        self.stop_event.set()
@@ -1,12 +1,36 @@
 # standard library
-import re, os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+import os, threading, time
 
 # third-party imports
-from bs4 import BeautifulSoup
-import requests, vdf
+import requests
 
 # local imports
 from utils.utils import *
+from utils.http_client import HttpClient
+from utils.rate_limiter import rate_limiter
+from utils.app_list import (
+    AppList,
+    AppListCache,
+    NameIndex,
+    get_app_names,
+    get_name_index,
+)
+from utils.disk_usage import DiskUsage
+from utils.persona_cache import PersonaCache
+from utils.local_files import (
+    InstalledApp,
+    get_installed_app_ids,
+    get_installed_apps,
+    local_file_cache,
+    parse_last_played,
+)
+from utils.store_page import (
+    CHUNK_SIZE,
+    parse_store_page_chunks,
+    review_percent,
+)
 from utils.logger import Logger
 
 Log = Logger()
@@ -14,35 +38,90 @@ error_log = Log.create_log(name="base_error", log_path="logs/error.log")
 
 
 class Steam:
+    # shared by every Steam subclass so all requests reuse the same connections
+    http = HttpClient()
+    # recently scraped store pages by app_id with the time they were scraped
+    STORE_PAGE_CACHE_SIZE = 32
+    STORE_PAGE_CACHE_SECONDS = 10 * 60
+    store_page_cache: dict[int, tuple[float, dict]] = {}
+    store_page_lock = threading.Lock()
+    # app list downloads are reused between runs
+    app_list_cache = AppListCache()
+    # folder sizes are only scanned again for directories that changed
+    disk_usage = DiskUsage()
+    # persona names by Steam ID so friends list changes need few requests
+    persona_cache = PersonaCache()
+    # max Steam ID's GetPlayerSummaries accepts in one request
+    MAX_SUMMARY_IDS = 100
+    # app ID's sent per price only app details request
+    MAX_PRICE_IDS = 100
 
-    @retry()
-    def get_steam_username(self, steam_id: int, steam_key: int) -> str:
+    def get_player_summaries_chunk(
+        self, steam_ids: list[str], steam_key: str
+    ) -> list[dict]:
         """
-        Gets a username based on the given `steam_id`.
+        Gets the player summaries of up to `MAX_SUMMARY_IDS` Steam ID's in a
+        single request.
         """
-        main_url = "https://api.steampowered.com/"
-        api_action = "ISteamUser/GetPlayerSummaries/v0002/"
-        url = main_url + api_action
-        params = {"key": steam_key, "steamids": steam_id}
+        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/"
+        params = {"key": steam_key, "steamids": ",".join(steam_ids)}
         try:
-            response = requests.get(url, params)
-            if response.ok:
-                data = response.json()
-                if (
-                    "response" in data
-                    and "players" in data["response"]
-                    and "personaname" in data["response"]["players"][0]
-                ):
-                    return data["response"]["players"][0]["personaname"]
-                else:
-                    return None
-            else:
-                return None
+            response = self.http.get(url, params)
         except requests.RequestException as e:
-            msg = f"Error occurred: {e}"
-            if "Test error" in str(e):
-                return None
-            error_log.warning(msg)
+            error_log.warning(f"Error occurred: {e}")
+            return []
+        if not response.ok:
+            return []
+        return response.json().get("response", {}).get("players", [])
+
+    def get_player_summaries(
+        self, steam_ids: Iterable[str | int], steam_key: str
+    ) -> dict[str, dict]:
+        """
+        Gets the player summaries of any number of `steam_ids` keyed by Steam ID.
+
+        Steam ID's are sent `MAX_SUMMARY_IDS` at a time with the requests sent
+        concurrently.
+        """
+        steam_ids = list(dict.fromkeys(str(steam_id) for steam_id in steam_ids))
+        chunks = [
+            steam_ids[i : i + self.MAX_SUMMARY_IDS]
+            for i in range(0, len(steam_ids), self.MAX_SUMMARY_IDS)
+        ]
+        if not chunks:
+            return {}
+        summaries = {}
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+            results = executor.map(
+                lambda chunk: self.get_player_summaries_chunk(chunk, steam_key),
+                chunks,
+            )
+            for players in results:
+                for player in players:
+                    summaries[str(player["steamid"])] = player
+        return summaries
+
+    def get_steam_usernames(
+        self, steam_ids: Iterable[str | int], steam_key: str
+    ) -> dict[str, str | None]:
+        """
+        Gets the username of each of `steam_ids`, only requesting the ones that
+        are not cached or whose cached name expired.
+        """
+        steam_ids = [str(steam_id) for steam_id in steam_ids]
+        usernames = self.persona_cache.get_many(steam_ids)
+        missing = [steam_id for steam_id in steam_ids if steam_id not in usernames]
+        if missing:
+            summaries = self.get_player_summaries(missing, steam_key)
+            fetched = {
+                steam_id: summary["personaname"]
+                for steam_id, summary in summaries.items()
+                if "personaname" in summary
+            }
+            self.persona_cache.update(fetched)
+            self.persona_cache.save()
+            usernames.update(fetched)
+        return {steam_id: usernames.get(steam_id) for steam_id in steam_ids}
 
     @retry()
     def get_steam_id(self, vanity_url, steam_key):
@@ -52,7 +131,7 @@ class Steam:
         url = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/"
         query = {"key": steam_key, "vanityurl": vanity_url}
         try:
-            response = requests.get(url, query)
+            response = self.http.get(url, query)
             if response.ok:
                 data = response.json()
                 if "response" in data and "steamid" in data["response"]:
@@ -81,7 +160,7 @@ class Steam:
             "relationship": "all",
         }
         try:
-            response = requests.get(url, params)
+            response = self.http.get(url, params)
             if response.ok:
                 data = response.json()
                 if "friendslist" in data and "friends" in data["friendslist"]:
@@ -109,58 +188,105 @@ class Steam:
         return additions, removals
 
     @retry()
-    def get_steam_review(self, app_id: int) -> dict:
+    def get_store_page_data(self, app_id: int) -> dict | None:
+        """
+        Downloads and parses the steam store page for `app_id` once and
+        returns every scraped field, or None if the page could not be
+        downloaded.
+
+        Pages are cached for `STORE_PAGE_CACHE_SECONDS` so each scraped field
+        of one update does not cause another download while later updates
+        still get new data. The page is streamed and closed once the scraped
+        blocks were read so the rest of it is not downloaded.
         """
-        Scrapes the games review percent and total reviews from
-        the steam store page using `app_id`.
+        app_id = int(app_id)
+        with self.store_page_lock:
+            entry = self.store_page_cache.get(app_id)
+            if entry:
+                scraped, page_data = entry
+                if time.monotonic() - scraped < self.STORE_PAGE_CACHE_SECONDS:
+                    return page_data
+                del self.store_page_cache[app_id]
+        rate_limiter.wait("steam_review_scrape")
+        response = self.http.get(self.get_game_url(app_id), stream=True)
+        try:
+            if not response.ok:
+                return None
+            response.encoding = response.encoding or "utf-8"
+            chunks = response.iter_content(CHUNK_SIZE, decode_unicode=True)
+            page_data = parse_store_page_chunks(chunks)
+        finally:
+            response.close()
+        with self.store_page_lock:
+            self.store_page_cache[app_id] = (time.monotonic(), page_data)
+            while len(self.store_page_cache) > self.STORE_PAGE_CACHE_SIZE:
+                oldest_app_id = next(iter(self.store_page_cache))
+                self.store_page_cache.pop(oldest_app_id)
+        return page_data
+
+    def get_review_summary(self, app_id: int) -> dict | None:
+        """
+        Gets the games review percent and total reviews from the review summary
+        api using `app_id`, which avoids downloading the store page.
+
+        Returns None if the summary could not be retrieved.
         """
-        api_sleeper("steam_review_scrape")
-        game_url = self.get_game_url(app_id)
-        response = requests.get(game_url)
-        result_dict = {"total": None, "percent": None}
+        url = f"https://store.steampowered.com/appreviews/{int(app_id)}"
+        params = {
+            "json": 1,
+            "num_per_page": 0,
+            "language": "all",
+            # the store page score only counts reviews from Steam purchases
+            "purchase_type": "steam",
+        }
+        rate_limiter.wait("steam_review_summary")
+        try:
+            response = self.http.get(url, params)
+        except requests.RequestException as e:
+            error_log.warning(f"Error occurred: {e}")
+            return None
         if not response.ok:
-            return result_dict
-        soup = BeautifulSoup(response.text, "html.parser")
-        hidden_review_class = "nonresponsive_hidden responsive_reviewdesc"
-        results = soup.find_all(class_=hidden_review_class)
-        if len(results) == 1:
-            text = results[0].text.strip()
-        elif len(results) > 1:
-            text = results[1].text.strip()
-        else:
-            return result_dict
-        parsed_data = text[2:26].split(r"% of the ")
-        # get percent
-        review_percent = parsed_data[0]
-        if review_percent.isnumeric():
-            if review_percent == "100":
-                result_dict["percent"] = 1
-            else:
-                result_dict["percent"] = float(f".{review_percent}")
-        # get total
-        if len(parsed_data) > 1:
-            cleaned_num = parsed_data[1].replace(",", "")
-            result_dict["total"] = int(re.search(r"\d+", cleaned_num).group())
-        return result_dict
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        if not data.get("success") or "query_summary" not in data:
+            return None
+        summary = data["query_summary"]
+        total = summary.get("total_reviews")
+        positive = summary.get("total_positive")
+        if not total or positive is None:
+            return {"total": None, "percent": None}
+        # rounded to the whole percent shown on the store page
+        whole_percent = round(positive * 100 / total)
+        return {"total": total, "percent": review_percent(whole_percent)}
 
-    @retry()
-    def get_steam_user_tags(self, app_id: int):
+    def get_steam_review(self, app_id: int) -> dict | None:
         """
-        Gets a games user tags from Steam.
+        Gets the games review percent and total reviews using `app_id`.
+
+        The store page is only scraped if the review summary api fails.
+        Returns None if neither could be retrieved.
         """
-        api_sleeper("steam_review_scrape")
-        response = requests.get(self.get_game_url(app_id))
-        if response.ok:
-            soup = BeautifulSoup(response.text, "html.parser")
-            hidden_review_class = "app_tag"
-            results = soup.find_all(class_=hidden_review_class)
-            tags = []
-            IGNORE_TAGS = ("+",)
-            for tag in results:
-                string = tag.text.strip()
-                if string not in IGNORE_TAGS:
-                    tags.append(string)
-            return tags
+        review = self.get_review_summary(app_id)
+        if review is not None:
+            return review
+        page_data = self.get_store_page_data(app_id)
+        if page_data is None:
+            return None
+        return page_data["review"]
+
+    def get_steam_user_tags(self, app_id: int) -> list[str] | None:
+        """
+        Gets a games user tags from the steam store page using `app_id`.
+
+        Returns None if the store page could not be retrieved.
+        """
+        page_data = self.get_store_page_data(app_id)
+        if page_data is None:
+            return None
+        return page_data["user_tags"]
 
     @retry()
     def get_owned_steam_games(self, steam_key: str, steam_id: int) -> list | None:
@@ -170,7 +296,7 @@ class Steam:
         base_url = "http://api.steampowered.com/"
         api_action = "IPlayerService/GetOwnedGames/v0001/"
         url = base_url + api_action
-        api_sleeper("steam_owned_games")
+        rate_limiter.wait("steam_owned_games")
         params = {
             "key": steam_key,
             "steamid": steam_id,
@@ -180,7 +306,7 @@ class Steam:
             "include_appinfo": 1,
         }
         try:
-            response = requests.get(url, params)
+            response = self.http.get(url, params)
             if response.ok:
                 data = response.json()
                 if "response" in data and "games" in data["response"]:
@@ -205,14 +331,14 @@ class Steam:
         base_url = "http://api.steampowered.com/"
         api_action = "IPlayerService/GetRecentlyPlayedGames/v1/"
         url = base_url + api_action
-        api_sleeper("steam_owned_games")
+        rate_limiter.wait("steam_owned_games")
         params = {
             "key": steam_key,
             "steamid": steam_id,
             "count": game_count,
         }
         try:
-            response = requests.get(url, params)
+            response = self.http.get(url, params)
             if response.ok:
                 data = response.json()
                 if "response" in data and "games" in data["response"]:
@@ -242,39 +368,106 @@ class Steam:
         Gets game details.
         """
         url = "https://store.steampowered.com/api/appdetails"
-        api_sleeper("steam_app_details")
+        rate_limiter.wait("steam_app_details")
         params = {"appids": app_id, "l": "english"}
-        response = requests.get(url, params)
+        response = self.http.get(url, params)
         if response.ok:
             return response.json()
         return None
 
+    def get_price_overviews(
+        self, app_ids: Iterable[int]
+    ) -> dict[int, dict | None]:
+        """
+        Gets only the `price_overview` of each of `app_ids` from the app details
+        api, `MAX_PRICE_IDS` app ID's per request.
+
+        Free or unavailable games have None instead of a price overview.
+        """
+        url = "https://store.steampowered.com/api/appdetails"
+        app_ids = list(dict.fromkeys(int(app_id) for app_id in app_ids))
+        price_overviews = {}
+        for i in range(0, len(app_ids), self.MAX_PRICE_IDS):
+            chunk = app_ids[i : i + self.MAX_PRICE_IDS]
+            params = {
+                "appids": ",".join(map(str, chunk)),
+                "filters": "price_overview",
+                "l": "english",
+            }
+            rate_limiter.wait("steam_app_details")
+            try:
+                response = self.http.get(url, params)
+            except requests.RequestException as e:
+                error_log.warning(f"Error occurred: {e}")
+                continue
+            if not response.ok:
+                continue
+            try:
+                data = response.json() or {}
+            except ValueError:
+                # throttled requests can return an empty or html body
+                error_log.warning(f"Invalid price data for {len(chunk)} apps")
+                continue
+            for app_id in chunk:
+                app_data = data.get(str(app_id)) or {}
+                details = app_data.get("data") if app_data.get("success") else None
+                # games without a price have an empty list instead of a dict
+                if isinstance(details, dict):
+                    price_overviews[app_id] = details.get("price_overview")
+                else:
+                    price_overviews[app_id] = None
+        return price_overviews
+
     # TODO check if this breaks retry
     @staticmethod
     @retry()
-    def get_app_list() -> list[dict]:
+    def download_app_list() -> list[dict]:
         """
-        Gets the full Steam app list as a dict.
+        Downloads the full Steam app list as a dict.
         """
         main_url = "https://api.steampowered.com/"
         api_action = "ISteamApps/GetAppList/v0002/"
         url = main_url + api_action
         query = {"l": "english"}
-        response = requests.get(url, query)
+        response = Steam.http.get(url, query)
         if response.ok:
             app_list = response.json()["applist"]["apps"]
             return app_list
         return None
 
+    @classmethod
+    def get_app_index(cls, use_cache: bool = True) -> AppList | None:
+        """
+        Gets the full Steam app list with its name indexes.
+
+        The local cache is used until it expires unless `use_cache` is False.
+        """
+        if use_cache:
+            app_list = cls.app_list_cache.load()
+            if app_list:
+                return app_list
+        apps = cls.download_app_list()
+        if not apps:
+            return None
+        return cls.app_list_cache.save(apps)
+
+    @classmethod
+    def get_app_list(cls, use_cache: bool = True) -> list[dict]:
+        """
+        Gets the full Steam app list as a dict.
+        """
+        app_list = cls.get_app_index(use_cache)
+        return app_list.apps if app_list else None
+
     @staticmethod
-    def get_app_id(game: str, app_list: list[dict]) -> int | None:
+    def get_app_id(game: str, app_list: list[dict] | AppList | NameIndex) -> int | None:
         """
         Gets the games app ID from the `app_list`.
+
+        Pass an `AppList` or `NameIndex` when looking up many games so the
+        index is only built once.
         """
-        for item in app_list:
-            if item["name"] == game:
-                return item["appid"]
-        return None
+        return get_name_index(app_list).resolve(game)
 
     # TODO check if this breaks retry
     @staticmethod
@@ -284,7 +477,8 @@ class Steam:
         Gets a games current player count by `app_id` using the Steam API via the `steam_key`.
         """
         url = f"http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}&key={steam_key}"
-        response = requests.get(url)
+        rate_limiter.wait("steam_player_count")
+        response = Steam.http.get(url)
         if response.ok:
             data = response.json()
             current_players = data.get("response", {}).get("player_count", "N/A")
@@ -295,53 +489,79 @@ class Steam:
     def get_installed_app_ids(library_vdf_path: str = None) -> list:
         """
         Returns a list of all app_ids among all libraries from the steam library
-        VDF file in `library_vdf_path`.
+        VDF file in `library_vdf_path` using the app manifests of each library.
+
+        Files are only parsed again once they change.
         """
         if not library_vdf_path:
             return []
-        with open(library_vdf_path, "r", encoding="utf-8") as file:
-            data = vdf.load(file)
-        if "libraryfolders" not in data:
-            return []
-        installed_app_ids = []
-        for library in data["libraryfolders"].values():
-            for app_id in library["apps"].keys():
-                installed_app_ids.append(int(app_id))
-        return installed_app_ids
+        return get_installed_app_ids(library_vdf_path)
+
+    @staticmethod
+    def get_installed_apps(library_vdf_path: str = None) -> dict[int, InstalledApp]:
+        """
+        Gets the size, state and install folder of every installed app by
+        reading the app manifests of each library in `library_vdf_path`.
+        """
+        if not library_vdf_path:
+            return {}
+        return get_installed_apps(library_vdf_path)
 
     @staticmethod
-    def get_local_config_data(local_config_path: str = None) -> list:
-        """1
-        Gets the local config data for games from the Steam install data.
+    def get_last_played_times(local_config_path: str = None) -> dict[int, int]:
+        """
+        Gets the last played time of each game by app ID from the Steam
+        install data.
+
+        The file is only parsed again once it changes.
         """
         if not local_config_path:
             return {}
-        with open(local_config_path, "r", encoding="utf-8") as file:
-            data = vdf.load(file)
-        return (
-            data.get("UserLocalConfigStore", {})
-            .get("Software", {})
-            .get("valve", {})
-            .get("Steam", {})
-            .get("apps", {})
-        )
-
-    def workshop_size(self, workshop_path, app_list):
+        return local_file_cache.get(local_config_path, parse_last_played)
+
+    def workshop_size(
+        self, workshop_path, app_list: list[dict] | AppList
+    ) -> list[dict]:
         """
         Gets data about the size of the steam workshop files for each
         game folder within `workshop_path`.
+
+        Folders are sized in parallel and names are looked up by app ID.
         """
-        app_ids = os.listdir(workshop_path)
-        # TODO find out why some app_ids are not found sometimes
-        found_entries = filter(lambda entry: str(entry["appid"]) in app_ids, app_list)
+        folders = {
+            int(name): os.path.join(workshop_path, name)
+            for name in os.listdir(workshop_path)
+            if name.isdigit()
+        }
+        names = get_app_names(app_list)
+        sizes = self.disk_usage.folder_sizes(folders.values())
         entry_list = []
-        for entry in found_entries:
-            path = os.path.join(workshop_path, str(entry["appid"]))
-            dir_size = get_dir_size(path)
-            entry["bytes"] = dir_size
-            if dir_size:
-                entry_list.append(entry)
-
+        for app_id, path in folders.items():
+            # TODO find out why some app_ids are not found sometimes
+            if app_id not in names or not sizes[path]:
+                continue
+            entry = {"appid": app_id, "name": names[app_id], "bytes": sizes[path]}
+            entry_list.append(entry)
         entry_list.sort(key=lambda entry: entry["bytes"], reverse=True)
+        return entry_list
 
+    def install_size(self, library_vdf_path: str) -> list[dict]:
+        """
+        Gets the size of the steamapps/common install folder of each installed
+        game across every library.
+        """
+        installed_apps = self.get_installed_apps(library_vdf_path)
+        folders = {
+            app_id: installed_app.install_dir
+            for app_id, installed_app in installed_apps.items()
+            if installed_app.install_dir and installed_app.install_dir.is_dir()
+        }
+        sizes = self.disk_usage.folder_sizes(folders.values())
+        entry_list = []
+        for app_id, path in folders.items():
+            size = sizes[os.fspath(path)]
+            if size:
+                name = installed_apps[app_id].name
+                entry_list.append({"appid": app_id, "name": name, "bytes": size})
+        entry_list.sort(key=lambda entry: entry["bytes"], reverse=True)
         return entry_list
@@ -0,0 +1,208 @@
+# standard library
+from __future__ import annotations
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Iterable
+import re
+
+# third-party imports
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+REVIEW_CLASS = "nonresponsive_hidden responsive_reviewdesc"
+TAG_CLASS = "app_tag"
+IGNORE_TAGS = ("+",)
+# blocks holding every review summary and every user tag
+REVIEW_BLOCK_ID = "userReviews"
+TAG_BLOCK_CLASS = "popular_tags"
+CHUNK_SIZE = 16 * 1024
+
+
+def empty_store_page() -> dict:
+    """
+    Returns the store page data used when nothing could be scraped.
+    """
+    return {"review": {"total": None, "percent": None}, "user_tags": []}
+
+
+def review_percent(whole_percent: int) -> float | int:
+    """
+    Converts a whole review percent such as 97 into the fraction stored in
+    the sheet, with 1 for 100%.
+    """
+    if whole_percent == 100:
+        return 1
+    return whole_percent / 100
+
+
+def parse_review_texts(texts: list[str]) -> dict:
+    """
+    Gets the review percent and total reviews from the text of each review
+    summary, using all reviews over recent reviews if both exist.
+    """
+    result_dict = {"total": None, "percent": None}
+    if len(texts) == 1:
+        text = texts[0].strip()
+    elif len(texts) > 1:
+        text = texts[1].strip()
+    else:
+        return result_dict
+    parsed_data = text[2:26].split(r"% of the ")
+    # get percent
+    whole_percent = parsed_data[0]
+    if whole_percent.isnumeric():
+        result_dict["percent"] = review_percent(int(whole_percent))
+    # get total
+    if len(parsed_data) > 1:
+        cleaned_num = parsed_data[1].replace(",", "")
+        result_dict["total"] = int(re.search(r"\d+", cleaned_num).group())
+    return result_dict
+
+
+def parse_tag_texts(texts: list[str]) -> list[str]:
+    """
+    Gets the user tags from the text of each tag link.
+    """
+    tags = []
+    for text in texts:
+        string = text.strip()
+        if string not in IGNORE_TAGS:
+            tags.append(string)
+    return tags
+
+
+def parse_review(soup: BeautifulSoup) -> dict:
+    """
+    Gets the review percent and total reviews from a parsed store page.
+    """
+    results = soup.find_all(class_=REVIEW_CLASS)
+    return parse_review_texts([result.text for result in results])
+
+
+def parse_user_tags(soup: BeautifulSoup) -> list[str]:
+    """
+    Gets the user tags from a parsed store page.
+    """
+    results = soup.find_all(class_=TAG_CLASS)
+    return parse_tag_texts([result.text for result in results])
+
+
+class StorePageParser(HTMLParser):
+
+    def __init__(self) -> None:
+        """
+        Streaming store page parser that only keeps the text of review
+        summaries and user tags instead of building a tree of the page.
+
+        `done` is set once both the review and tag blocks have closed so the
+        rest of the page does not need to be fed.
+        """
+        super().__init__()
+        self.review_texts: list[str] = []
+        self.tag_texts: list[str] = []
+        # open element being read as (tag name, depth, texts to add to, parts)
+        self.target: tuple[str, int, list[str], list[str]] | None = None
+        # open review and tag blocks by tag name and depth
+        self.blocks: dict[str, list] = {}
+        self.closed_blocks: set[str] = set()
+        self.done = False
+
+    def __repr__(self):
+        return (
+            f"StorePageParser(reviews={len(self.review_texts)}, "
+            f"tags={len(self.tag_texts)}, done={self.done})"
+        )
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if self.done:
+            return
+        for block in self.blocks.values():
+            if block[0] == tag:
+                block[1] += 1
+        if self.target:
+            name, depth, texts, parts = self.target
+            if name == tag:
+                self.target = (name, depth + 1, texts, parts)
+            return
+        attrs = dict(attrs)
+        classes = attrs.get("class") or ""
+        if attrs.get("id") == REVIEW_BLOCK_ID:
+            self.blocks.setdefault("review", [tag, 1])
+        elif TAG_BLOCK_CLASS in classes.split():
+            self.blocks.setdefault("tags", [tag, 1])
+        if classes == REVIEW_CLASS:
+            self.target = (tag, 1, self.review_texts, [])
+        elif TAG_CLASS in classes.split():
+            self.target = (tag, 1, self.tag_texts, [])
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.done:
+            return
+        if self.target and self.target[0] == tag:
+            name, depth, texts, parts = self.target
+            if depth > 1:
+                self.target = (name, depth - 1, texts, parts)
+            else:
+                texts.append("".join(parts))
+                self.target = None
+        for block_name, block in list(self.blocks.items()):
+            if block[0] != tag:
+                continue
+            block[1] -= 1
+            if not block[1]:
+                del self.blocks[block_name]
+                self.closed_blocks.add(block_name)
+        self.done = self.closed_blocks == {"review", "tags"}
+
+    def handle_data(self, data: str) -> None:
+        if self.target and not self.done:
+            self.target[3].append(data)
+
+    def result(self) -> dict:
+        return {
+            "review": parse_review_texts(self.review_texts),
+            "user_tags": parse_tag_texts(self.tag_texts),
+        }
+
+
+def parse_store_page_chunks(chunks: Iterable[str]) -> dict:
+    """
+    Parses the store page from `chunks` of its html, stopping as soon as the
+    review and tag blocks have been read, and returns every scraped field.
+
+    The remaining chunks are not read so a streamed page can be closed
+    before the rest of it is downloaded.
+    """
+    parser = StorePageParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.result()
+
+
+def parse_store_page(html: str) -> dict:
+    """
+    Parses the store page `html` in chunks, stopping as soon as the review
+    and tag blocks have been read, and returns every scraped field.
+    """
+    chunks = (
+        html[start : start + CHUNK_SIZE] for start in range(0, len(html), CHUNK_SIZE)
+    )
+    return parse_store_page_chunks(chunks)
+
+
+def parse_store_page_soup(html: str) -> dict:
+    """
+    Parses the whole store page `html` into a tree and returns every scraped
+    field. Slower than `parse_store_page` but kept to check it against.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "review": parse_review(soup),
+        "user_tags": parse_user_tags(soup),
+    }
@@ -84,18 +84,6 @@ def create_hyperlink(url: str, label: str) -> str:
     return f'=HYPERLINK("{url}","{label}")'
 
 
-def api_sleeper(api, sleep_length=0.5, api_calls={}) -> None:
-    """
-    Delays delays for a set period of time if the `api` was run too recently.
-    Delay length is set by `sleep_length`.
-    """
-    cur_datetime = dt.datetime.now()
-    if api in api_calls.keys():
-        if api_calls[api] + dt.timedelta(seconds=sleep_length) > cur_datetime:
-            time.sleep(sleep_length)
-    api_calls[api] = cur_datetime
-
-
 def get_hours_played(minutes_played: float) -> float:
     """
     Converts `minutes_played` to a hours played in decimal form.
@@ -356,6 +344,15 @@ def save_json(new_data: dict, filename: str):
             raise PermissionError("Data did not save error")  # pragma: no cover
 
 
+def file_stamp(path: str | Path) -> str:
+    """
+    Creates a stamp of the size and modified time of the file at `path` that
+    changes whenever the file does.
+    """
+    stat = Path(path).stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
 def update_last_run(data: dict, config_path: str, name: str):  # pragma: no cover
     """
     Updates json by `name` with the current date.
@@ -364,6 +361,17 @@ def update_last_run(data: dict, config_path: str, name: str):  # pragma: no cove
     save_json(data, config_path)
 
 
+def write_last_run(config_path: str, name: str, last_run: float) -> None:
+    """
+    Saves only the `last_run` time of `name` to the config at `config_path`,
+    keeping any other changes made to the file since it was loaded.
+    """
+    with open(config_path) as file:
+        data = json.load(file)
+    data.setdefault("last_runs", {})[name] = last_run
+    save_json(data, config_path)
+
+
 def recently_executed(data: dict, name: str, n_days: int):
     """
     Check if a specific task named `name` was executed within the `n_days`.
@@ -0,0 +1,198 @@
+# standard library
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+import re
+
+# markers for braces so they can't be confused with quoted "{" strings
+OPEN = object()
+CLOSE = object()
+
+# quoted string, open brace, close brace, comment or unquoted string
+TOKEN_PATTERN = re.compile(
+    r'\s*(?:"([^"\\]*(?:\\.[^"\\]*)*)"|(\{)|(\})|(//.*)|([^\s{}"]+))'
+)
+WHITESPACE_PATTERN = re.compile(r"\s*")
+ESCAPES = {"n": "\n", "t": "\t", "v": "\v", "b": "\b", "r": "\r", "f": "\f"}
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+LOCAL_CONFIG_APPS_PATH = (
+    "UserLocalConfigStore",
+    "Software",
+    "valve",
+    "Steam",
+    "apps",
+)
+
+
+def unescape(value: str) -> str:
+    return ESCAPE_PATTERN.sub(lambda match: ESCAPES.get(match[1], match[1]), value)
+
+
+class VdfTokens:
+
+    def __init__(self, file: TextIO) -> None:
+        """
+        Tokenizes a VDF file line by line, yielding keys and values as strings
+        and braces as `OPEN` and `CLOSE`.
+
+        Skipped sections are scanned by line so lines that can't change the
+        brace depth are never tokenized.
+        """
+        self.file = file
+        self.line = ""
+        self.pos = 0
+
+    def __iter__(self) -> "VdfTokens":
+        return self
+
+    def __next__(self):
+        while True:
+            match = TOKEN_PATTERN.match(self.line, self.pos)
+            if match:
+                self.pos = match.end()
+                quoted, opened, closed, _, bare = match.groups()
+                if quoted is not None:
+                    return unescape(quoted) if "\\" in quoted else quoted
+                if opened:
+                    return OPEN
+                if closed:
+                    return CLOSE
+                if bare is not None:
+                    return bare
+                continue
+            rest = self.line[self.pos :]
+            line = self.file.readline()
+            if not line:
+                raise StopIteration
+            # a quoted string continues on the next line
+            self.line = line if rest.isspace() or not rest else rest + line
+            self.pos = 0
+
+    def at_line_end(self) -> bool:
+        return WHITESPACE_PATTERN.match(self.line, self.pos).end() == len(self.line)
+
+    def skip_section(self) -> None:
+        """
+        Skips the rest of the section that was just opened.
+        """
+        depth = 1
+        while True:
+            if self.at_line_end():
+                line = self.file.readline()
+                if not line:
+                    return
+                # lines without braces or multi line strings keep the same depth
+                if "{" not in line and "}" not in line and "\\" not in line:
+                    if not line.count('"') % 2:
+                        continue
+                self.line, self.pos = line, 0
+            token = next(self, None)
+            if token is None:
+                return
+            if token is OPEN:
+                depth += 1
+            elif token is CLOSE:
+                depth -= 1
+                if not depth:
+                    return
+
+
+def find_section(tokens: VdfTokens, path: Iterable[str]) -> bool:
+    """
+    Skips ahead until inside the section at `path` and returns True if it
+    was found. Sections off the path are skipped without being read.
+
+    Keys are compared case insensitively since Steam is not consistent.
+    """
+    path = [key.casefold() for key in path]
+    matched = 0
+    for key in tokens:
+        if key is CLOSE or key is OPEN:
+            return False
+        value = next(tokens, None)
+        if value is not OPEN:
+            continue
+        if key.casefold() == path[matched]:
+            matched += 1
+            if matched == len(path):
+                return True
+        else:
+            tokens.skip_section()
+    return False
+
+
+def read_values(tokens: VdfTokens, keys: set[str] | None = None) -> dict[str, str]:
+    """
+    Reads the values of the section that was just opened, skipping any
+    nested sections and keys not in `keys`.
+    """
+    values = {}
+    for key in tokens:
+        if key is CLOSE:
+            break
+        value = next(tokens, None)
+        if value is OPEN:
+            tokens.skip_section()
+        elif keys is None or key in keys:
+            values[key] = value
+    return values
+
+
+def iter_sections(
+    tokens: VdfTokens, keys: set[str] | None = None
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """
+    Yields the name and values of each section within the section that was
+    just opened.
+    """
+    for key in tokens:
+        if key is CLOSE:
+            return
+        value = next(tokens, None)
+        if value is OPEN:
+            yield key, read_values(tokens, keys)
+
+
+def read_section(
+    path: str | Path, section_path: Iterable[str], keys: set[str] | None = None
+) -> dict[str, str]:
+    """
+    Reads the values of the section at `section_path` in the VDF file at
+    `path`, skipping everything else.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tokens = VdfTokens(file)
+        if not find_section(tokens, section_path):
+            return {}
+        return read_values(tokens, keys)
+
+
+def iter_local_config_sections(
+    path: str | Path, keys: set[str] | None = None
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """
+    Yields the name and values of each app section of a localconfig.vdf file
+    while it is read, without building the rest of the file, which mostly
+    holds friend and chat data.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tokens = VdfTokens(file)
+        if find_section(tokens, LOCAL_CONFIG_APPS_PATH):
+            yield from iter_sections(tokens, keys)
+
+
+def to_int(value: str | None) -> int | None:
+    return int(value) if value and value.isdigit() else None
+
+
+def iter_local_config_apps(
+    path: str | Path,
+) -> Iterator[tuple[int, int | None, int | None]]:
+    """
+    Yields the app ID, LastPlayed and Playtime of each app in a
+    localconfig.vdf file.
+    """
+    keys = {"LastPlayed", "Playtime"}
+    for app_id, values in iter_local_config_sections(path, keys):
+        if app_id.isdigit():
+            last_played, playtime = values.get("LastPlayed"), values.get("Playtime")
+            yield int(app_id), to_int(last_played), to_int(playtime)
@@ -0,0 +1,61 @@
+# standard library
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING
+import threading
+
+# my package imports
+if TYPE_CHECKING:
+    from easierexcel import Excel, Sheet
+
+
+class LazyWorkbook:
+
+    def __init__(
+        self, filename: str | Path, use_logging: bool = True, options: dict = None
+    ) -> None:
+        """
+        Opens the excel file and its sheets the first time they are used.
+
+        Parsing the workbook is the slowest part of startup so actions that
+        only read from the library store never load it.
+        """
+        self.filename = filename
+        self.use_logging = use_logging
+        self.options = options
+        self._excel: Excel | None = None
+        self.sheets: dict[str, Sheet] = {}
+        self.lock = threading.RLock()
+
+    def __repr__(self):
+        return f"LazyWorkbook(filename={str(self.filename)!r}, loaded={self.loaded})"
+
+    @property
+    def loaded(self) -> bool:
+        return self._excel is not None
+
+    @property
+    def excel(self) -> Excel:
+        with self.lock:
+            if self._excel is None:
+                from easierexcel import Excel
+
+                self._excel = Excel(self.filename, use_logging=self.use_logging)
+            return self._excel
+
+    def get_sheet(self, sheet_name: str, column_name: str) -> Sheet:
+        """
+        Gets the `sheet_name` sheet keyed by `column_name`, loading the
+        workbook if needed.
+        """
+        with self.lock:
+            if sheet_name not in self.sheets:
+                from easierexcel import Sheet
+
+                self.sheets[sheet_name] = Sheet(
+                    excel_object=self.excel,
+                    sheet_name=sheet_name,
+                    column_name=column_name,
+                    options=self.options,
+                )
+            return self.sheets[sheet_name]